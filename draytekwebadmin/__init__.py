@@ -1,6 +1,8 @@
 """Draytek Web Admin - Web API Package."""
 
 from draytekwebadmin.draytek import DrayTekWebAdmin
+from draytekwebadmin.asyncadmin import AsyncDrayTekWebAdmin
+from draytekwebadmin.driver import TooliumSessionPool
 from draytekwebadmin.snmp import SNMPIPv4, SNMPIPv6, SNMPTrapIPv4, SNMPTrapIPv6, SNMPv3
 from draytekwebadmin.management import (
     Management,
@@ -16,9 +18,18 @@ from draytekwebadmin.management import (
     LAN_Access,
 )
 from draytekwebadmin.firmware import Firmware
+from draytekwebadmin.fleet import FleetExecutor
+from draytekwebadmin.rollout import RolloutScheduler
+from draytekwebadmin.cache import SettingsCache
+from draytekwebadmin.sessionstore import SessionStore
+from draytekwebadmin.tracing import WebDriverTracer
+from draytekwebadmin.timing import TimingRecorder
+from draytekwebadmin.journal import JobJournal
 
 __all__ = [
     "DrayTekWebAdmin",
+    "AsyncDrayTekWebAdmin",
+    "TooliumSessionPool",
     "SNMPIPv4",
     "SNMPIPv6",
     "SNMPTrapIPv4",
@@ -36,4 +47,11 @@ __all__ = [
     "IPv6Management",
     "LAN_Access",
     "Firmware",
+    "FleetExecutor",
+    "RolloutScheduler",
+    "SettingsCache",
+    "SessionStore",
+    "WebDriverTracer",
+    "TimingRecorder",
+    "JobJournal",
 ]
@@ -0,0 +1,149 @@
+"""Draytek Web Admin - asyncio API."""
+
+import asyncio
+from functools import partial
+
+from draytekwebadmin.draytek import DrayTekWebAdmin
+
+
+class AsyncDrayTekWebAdmin:
+    """DrayTek web based administration console, with awaitable operations.
+
+    Each operation runs the blocking DrayTekWebAdmin call in an executor, so a single event loop
+    can drive many routers. Operations on one router are run one at a time, in the order awaited.
+    """
+
+    def __init__(self, *args, executor=None, semaphore=None, **kwargs):
+        """Create a web session to the web administration console.
+
+        Takes the same arguments as DrayTekWebAdmin, plus:
+
+        :param executor: concurrent.futures Executor to run operations in (Default: event loop default executor)
+        :param semaphore: asyncio.Semaphore limiting concurrent operations, e.g. shared by routers at one site
+        """
+        self.admin = DrayTekWebAdmin(*args, **kwargs)
+        self.executor = executor
+        self.semaphore = semaphore
+        self._lock = None
+
+    @property
+    def hostname(self):
+        """str: Router hostname."""
+        return self.admin.hostname
+
+    @property
+    def reboot_required(self):
+        """bool: True if changes applied require a reboot."""
+        return self.admin.reboot_required
+
+    @property
+    def routerinfo(self):
+        """RouterInfo: Router details collected when the session started."""
+        return self.admin.routerinfo
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close_session(failed=exc_type is not None)
+
+    async def _run(self, method, *args, **kwargs):
+        """Run a DrayTekWebAdmin method in the executor.
+
+        :param method: bound DrayTekWebAdmin method
+        :returns: method result
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.semaphore is None:
+                return await self._execute(method, *args, **kwargs)
+            async with self.semaphore:
+                return await self._execute(method, *args, **kwargs)
+
+    async def _execute(self, method, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(method, *args, **kwargs)
+        )
+
+    async def start_session(self):
+        """Start session and login. See DrayTekWebAdmin.start_session."""
+        return await self._run(self.admin.start_session)
+
+    async def close_session(self, failed=False):
+        """Close session. See DrayTekWebAdmin.close_session.
+
+        :param failed: True if the session encountered an error, so a pooled browser is not reused
+        """
+        return await self._run(self.admin.close_session, failed=failed)
+
+    async def preflight(self, timeout=3):
+        """Check the router can be reached, without starting a browser. See DrayTekWebAdmin.preflight.
+
+        :param timeout: seconds to wait for the connection and TLS handshake
+        :returns: Preflight: reachable, latency in seconds and any error
+        """
+        return await self._run(self.admin.preflight, timeout)
+
+    async def read_settings(self, settings):
+        """Read Router Settings for a specified type. See DrayTekWebAdmin.read_settings.
+
+        :param settings: Object of the type of settings requested
+        :returns: object: of Type requested with the current settings
+        """
+        return await self._run(self.admin.read_settings, settings)
+
+    async def read_all_settings(self, settings=None):
+        """Read Router Settings for several types. See DrayTekWebAdmin.read_all_settings.
+
+        :param settings: list of the types of settings requested (Default: all supported types)
+        :returns: dictionary of {type: object with the current settings}
+        """
+        return await self._run(self.admin.read_all_settings, settings)
+
+    async def write_settings(self, settings):
+        """Apply Router Settings for a specified type. See DrayTekWebAdmin.write_settings.
+
+        :param settings: Object containing the settings to apply
+        :returns: True if changes resulted in a reboot being required
+        """
+        return await self._run(self.admin.write_settings, settings)
+
+    async def write_settings_batch(self, settings):
+        """Apply Router Settings for several types. See DrayTekWebAdmin.write_settings_batch.
+
+        :param settings: list of objects containing the settings to apply
+        :returns: True if any of the changes resulted in a reboot being required
+        """
+        return await self._run(self.admin.write_settings_batch, settings)
+
+    async def reboot(self):
+        """Reboot Router. See DrayTekWebAdmin.reboot."""
+        return await self._run(self.admin.reboot)
+
+    async def upgrade_preview(self, firmware):
+        """Preview firmware upgrade. See DrayTekWebAdmin.upgrade_preview.
+
+        :param firmware: Firmware object containing full file path for new firmware
+        :returns: Firmware object: Properties set for based on the previewing the firmware
+        """
+        return await self._run(self.admin.upgrade_preview, firmware)
+
+    async def upgrade(self, firmware, approve=None):
+        """Upgrade firmware. See DrayTekWebAdmin.upgrade.
+
+        :param firmware: Firmware object containing full file path for new firmware
+        :param approve: function taking the previewed Firmware object, returning True to install it
+                        (Default: install if the router or modem firmware differs from the current version)
+        :returns: (bool) True if firmware is being updated and router rebooted
+        """
+        return await self._run(self.admin.upgrade, firmware, approve)
+
+    async def wait_until_available(self, timeout=600, **kwargs):
+        """Wait for the router to return after a reboot or upgrade. See DrayTekWebAdmin.wait_until_available.
+
+        :param timeout: seconds to wait for the router
+        :returns: Recovery: downtime, firmware version and whether it matches the upgrade
+        """
+        return await self._run(self.admin.wait_until_available, timeout, **kwargs)
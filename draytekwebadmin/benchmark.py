@@ -0,0 +1,456 @@
+"""Draytek Web Admin - Benchmarks."""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import threading
+from collections import Counter, namedtuple
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from tabulate import tabulate
+
+from draytekwebadmin.draytek import SETTINGS_PAGES, SETTINGS_TYPES, DrayTekWebAdmin
+from draytekwebadmin.firmware import Firmware
+from draytekwebadmin.simulator import RouterSimulator
+from draytekwebadmin.tracing import WebDriverTracer
+
+LOGGER = logging.getLogger("root")
+
+OPERATIONS = [
+    "start_session",
+    "read_settings",
+    "write_settings",
+    "upgrade_preview",
+    "reboot",
+]
+DEFAULT_ITERATIONS = 5
+# Fraction a statistic may grow by over the baseline before it is a regression
+DEFAULT_THRESHOLD = 0.2
+# Timing differences smaller than this (seconds) are timer noise, not regressions
+MIN_REGRESSION = 0.005
+# Statistics compared with the baseline, and whether they are times
+STATISTICS = {"p50": True, "p95": True, "commands": False}
+
+# p50, p95: median and 95th percentile seconds taken
+# commands: mean WebDriver commands sent per run
+# requests: mean HTTP requests answered by the simulator per run
+# samples: seconds taken by each run
+Measurement = namedtuple(
+    "Measurement", ["p50", "p95", "commands", "requests", "samples"]
+)
+# operation: operation name e.g. read_settings.SNMPIPv4
+# statistic: statistic which regressed e.g. p95
+Regression = namedtuple("Regression", ["operation", "statistic", "baseline", "result"])
+
+
+def percentile(samples, percent):
+    """Return a percentile of samples, by the nearest rank method.
+
+    :param samples: list of numbers
+    :param percent: percentile wanted, 0 to 100
+    :returns: sample at the percentile, or None if there are no samples
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(ceil(len(ordered) * percent / 100), 1) - 1]
+
+
+class CommandCounter:
+    """Count the WebDriver commands sent by every driver, while in use as a context manager."""
+
+    def __init__(self):
+        """Create a new CommandCounter."""
+        self.commands = Counter()
+        self._lock = threading.Lock()
+        self._execute = None
+
+    @property
+    def total(self):
+        """int: Number of commands sent."""
+        return sum(self.commands.values())
+
+    def __enter__(self):
+        self._execute = WebDriver.execute
+        counter = self
+
+        def execute(driver, driver_command, params=None):
+            with counter._lock:
+                counter.commands[driver_command] += 1
+            return counter._execute(driver, driver_command, params)
+
+        WebDriver.execute = execute
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        WebDriver.execute = self._execute
+
+
+class Benchmark:
+    """Time DrayTekWebAdmin operations against a RouterSimulator.
+
+    Each operation is run a number of times. The seconds taken, WebDriver commands sent and
+    HTTP requests served are recorded. Settings are written back as they were read, so the
+    write timings cover reading the page and comparing the values, the usual case in a fleet
+    run where most routers are already configured.
+    """
+
+    def __init__(
+        self,
+        simulator,
+        iterations=DEFAULT_ITERATIONS,
+        operations=None,
+        settings=None,
+        firmware=None,
+        **kwargs,
+    ):
+        """Create a new Benchmark.
+
+        :param simulator: RouterSimulator, started
+        :param iterations: Number of times each operation is timed (Default: 5)
+        :param operations: list of operations to time (Default: all of OPERATIONS)
+        :param settings: list of the types of settings read and written (Default: all supported types)
+        :param firmware: Firmware object to preview, required for upgrade_preview
+        :param kwargs: further DrayTekWebAdmin arguments e.g. backend, browser, headless
+        """
+        self.simulator = simulator
+        self.iterations = iterations
+        self.operations = OPERATIONS if operations is None else operations
+        self.settings = (
+            [SETTINGS_TYPES[name] for name in SETTINGS_PAGES]
+            if settings is None
+            else settings
+        )
+        self.firmware = firmware
+        self.connection_options = kwargs
+
+    def __setattr__(self, name, value):
+        if name == "iterations":
+            value = int(value)
+            if value < 1:
+                raise ValueError(f"Iterations must be at least 1: {value}")
+        elif name == "operations":
+            value = list(value)
+            unknown = [operation for operation in value if operation not in OPERATIONS]
+            if unknown:
+                raise ValueError(f"Unknown operations: {unknown}")
+        super(Benchmark, self).__setattr__(name, value)
+
+    def connection(self):
+        """Create a DrayTekWebAdmin connection to the simulator.
+
+        :returns: DrayTekWebAdmin
+        """
+        return DrayTekWebAdmin(
+            hostname=self.simulator.host,
+            port=self.simulator.port,
+            username=self.simulator.username,
+            password=self.simulator.password,
+            use_https=bool(self.simulator.certfile),
+            **self.connection_options,
+        )
+
+    def measure(self, operation, setup=None, teardown=None):
+        """Time an operation.
+
+        :param operation: callable taking the setup result
+        :param setup: callable run, untimed, before each run (Default: None)
+        :param teardown: callable taking the setup result, run untimed after each run (Default: None)
+        :returns: Measurement
+        """
+        samples = []
+        commands = 0
+        requests = 0
+        for _ in range(self.iterations):
+            context = setup() if setup else None
+            try:
+                with CommandCounter() as counter:
+                    served = sum(self.simulator.requests.values())
+                    started = perf_counter()
+                    operation(context)
+                    samples.append(perf_counter() - started)
+                commands += counter.total
+                requests += sum(self.simulator.requests.values()) - served
+            finally:
+                if teardown:
+                    teardown(context)
+        return Measurement(
+            percentile(samples, 50),
+            percentile(samples, 95),
+            commands / self.iterations,
+            requests / self.iterations,
+            samples,
+        )
+
+    def _logged_in(self):
+        """Return a new connection, once the simulator is serving, with a session started."""
+        if not self.simulator.wait_until_serving():
+            raise RuntimeError("Simulator did not return after reboot")
+        connection = self.connection()
+        connection.start_session()
+        return connection
+
+    def run(self):
+        """Time the operations chosen.
+
+        :returns: dictionary of {operation name: Measurement}, read_settings and write_settings
+                  named by settings type e.g. read_settings.SNMPIPv4
+        """
+        results = {}
+        if "start_session" in self.operations:
+            results["start_session"] = self.measure(
+                lambda connection: connection.start_session(),
+                setup=self.connection,
+                teardown=lambda connection: connection.close_session(),
+            )
+        if "read_settings" in self.operations or "write_settings" in self.operations:
+            connection = self.connection()
+            try:
+                for settings_type in self.settings:
+                    name = settings_type.__name__
+                    # Untimed first read, starting the session and reaching the page
+                    current = connection.read_settings(settings_type)
+                    if "read_settings" in self.operations:
+                        results[f"read_settings.{name}"] = self.measure(
+                            lambda _: connection.read_settings(settings_type)
+                        )
+                    if "write_settings" in self.operations:
+                        results[f"write_settings.{name}"] = self.measure(
+                            lambda _: connection.write_settings(current)
+                        )
+            finally:
+                connection.close_session()
+        if "upgrade_preview" in self.operations:
+            if self.firmware is None:
+                raise ValueError("upgrade_preview requires a firmware file")
+            connection = self._logged_in()
+            try:
+                results["upgrade_preview"] = self.measure(
+                    lambda _: connection.upgrade_preview(self.firmware)
+                )
+            finally:
+                connection.close_session()
+        if "reboot" in self.operations:
+            results["reboot"] = self.measure(
+                lambda connection: connection.reboot(),
+                setup=self._logged_in,
+                teardown=lambda connection: connection.close_session(),
+            )
+            self.simulator.wait_until_serving()
+        return results
+
+
+def save_results(path, results, **metadata):
+    """Write benchmark results to a JSON file, for comparison with a later run.
+
+    :param path: JSON file to write
+    :param results: dictionary of {operation name: Measurement}
+    :param metadata: details of the run recorded with the results e.g. backend, commit
+    """
+    data = dict(metadata)
+    data["operations"] = {
+        operation: measurement._asdict() for operation, measurement in results.items()
+    }
+    Path(path).write_text(json.dumps(data, indent=2))
+
+
+def load_results(path):
+    """Read benchmark results written by save_results.
+
+    :param path: JSON file to read
+    :returns: dictionary of {operation name: Measurement}
+    """
+    data = json.loads(Path(path).read_text())
+    return {
+        operation: Measurement(**measurement)
+        for operation, measurement in data["operations"].items()
+    }
+
+
+def compare(
+    baseline, results, threshold=DEFAULT_THRESHOLD, min_regression=MIN_REGRESSION
+):
+    """Find the statistics which grew by more than the threshold over the baseline.
+
+    Operations missing from either result are not compared.
+
+    :param baseline: dictionary of {operation name: Measurement} e.g. from the previous commit
+    :param results: dictionary of {operation name: Measurement}
+    :param threshold: Fraction a statistic may grow by (Default: 0.2)
+    :param min_regression: Seconds a time may grow by regardless of the threshold, as timer noise (Default: 0.005)
+    :returns: list of Regression
+    """
+    regressions = []
+    for operation, result in results.items():
+        if operation not in baseline:
+            continue
+        for statistic, timed in STATISTICS.items():
+            before = getattr(baseline[operation], statistic)
+            after = getattr(result, statistic)
+            if before is None or after is None:
+                continue
+            allowed = before * (1 + threshold)
+            if timed:
+                allowed = max(allowed, before + min_regression)
+            if after > allowed:
+                regressions.append(Regression(operation, statistic, before, after))
+    return regressions
+
+
+def _get_parser():
+    """Parse command line arguments.
+
+    :returns: argparse object
+    """
+    parser = argparse.ArgumentParser(
+        description="Time DrayTekWebAdmin operations against a simulated router"
+    )
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=DEFAULT_ITERATIONS,
+        help=f"Times each operation is run (default: {DEFAULT_ITERATIONS})",
+    )
+    parser.add_argument(
+        "--operations",
+        type=lambda value: value.split(","),
+        default=OPERATIONS,
+        help=f"Comma separated operations to time (default: {','.join(OPERATIONS)})",
+    )
+    parser.add_argument(
+        "--settings",
+        type=lambda value: [SETTINGS_TYPES[name] for name in value.split(",")],
+        help="Comma separated settings types read and written e.g. SNMPIPv4,Management (default: all)",
+    )
+    parser.add_argument(
+        "--firmware",
+        type=str,
+        help="Firmware file to preview (default: a generated file)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["selenium", "http"],
+        default="selenium",
+        help="Read and write settings with a browser or HTTP requests (default: selenium)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds the simulator delays each request by (default: 0)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help="Write the results to a JSON file e.g. -o benchmark.json",
+    )
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        type=str,
+        help="Compare with results written by an earlier run, failing on a regression",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Fraction a statistic may grow by over the baseline (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "-c", "--config", type=str, help="Location of configuration file directory"
+    )
+    parser.add_argument(
+        "--browser",
+        type=str,
+        help="Browser name [chrome|firefox] overrides configuration file",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Run session headless (without GUI). Overrides configuration file",
+    )
+    parser.add_argument(
+        "--trace",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Show the N page object methods sending the slowest WebDriver commands (default: 0, none)",
+    )
+    return parser
+
+
+def main(argv=None):
+    """Run the benchmarks, returning 1 if any regressed against the baseline."""
+    args = _get_parser().parse_args(argv)
+    logging.basicConfig(format="[%(levelname)s] %(message)s")
+    with tempfile.TemporaryDirectory() as directory, RouterSimulator(
+        latency=args.latency, reboot_seconds=0.1
+    ) as simulator:
+        firmware_path = args.firmware
+        if firmware_path is None:
+            firmware_path = Path(directory, "v2862_benchmark.all")
+            firmware_path.write_bytes(b"Vigor2862\x00v4.4.2\x00" + bytes(1024 * 1024))
+        tracer = WebDriverTracer() if args.trace else None
+        benchmark = Benchmark(
+            simulator,
+            iterations=args.iterations,
+            operations=args.operations,
+            settings=args.settings,
+            firmware=Firmware(filepath=firmware_path),
+            backend=args.backend,
+            config_dir=args.config,
+            browser=args.browser,
+            headless=args.headless or None,
+            tracer=tracer,
+        )
+        results = benchmark.run()
+    print(
+        tabulate(
+            [
+                (operation, result.p50, result.p95, result.commands, result.requests)
+                for operation, result in results.items()
+            ],
+            headers=["operation", "p50 (s)", "p95 (s)", "commands", "requests"],
+            floatfmt=".4f",
+        )
+    )
+    if tracer is not None:
+        print(
+            tabulate(
+                [
+                    (trace.operation, trace.count, trace.seconds)
+                    for trace in tracer.operations()[: args.trace]
+                ],
+                headers=["traced method", "commands", "seconds"],
+                floatfmt=".4f",
+            )
+        )
+    if args.output:
+        save_results(
+            args.output,
+            results,
+            backend=args.backend,
+            iterations=args.iterations,
+            latency=args.latency,
+        )
+    if args.baseline:
+        regressions = compare(load_results(args.baseline), results, args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.operation} {regression.statistic}: "
+                f"{regression.baseline:.4f} -> {regression.result:.4f}"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Draytek Web Admin - Settings Cache."""
+
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from time import time
+
+LOGGER = logging.getLogger("root")
+
+DEFAULT_TTL = 3600
+
+
+class SettingsCache:
+    """On disk cache of router settings last read, keyed by hostname, settings type and firmware version.
+
+    Entries expire after the TTL, and are removed when settings are written or the router is rebooted.
+    A cache file may be shared by concurrent sessions and processes.
+    """
+
+    def __init__(self, path="draytekwebadmin-cache.sqlite", ttl=DEFAULT_TTL):
+        """Open (creating if needed) a settings cache.
+
+        :param path: SQLite database file (Default: draytekwebadmin-cache.sqlite in the current directory)
+        :param ttl: Seconds a cached entry is used for (Default: 3600)
+        """
+        self.path = str(path)
+        self.ttl = ttl
+        with closing(self._connect()) as database, database:
+            database.execute(
+                "CREATE TABLE IF NOT EXISTS settings ("
+                "hostname TEXT, settings_type TEXT, firmware TEXT, stored REAL, state TEXT, "
+                "PRIMARY KEY (hostname, settings_type))"
+            )
+
+    def __setattr__(self, name, value):
+        if name == "ttl":
+            value = float(value)
+            if value < 0:
+                raise ValueError(f"TTL must not be negative: {value}")
+        super(SettingsCache, self).__setattr__(name, value)
+
+    def _connect(self):
+        """Open a connection to the cache database. Connections aren't shared between threads.
+
+        :returns: sqlite3 connection
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, hostname, firmware, settings_type):
+        """Return cached settings, if present, not expired and read from the same firmware version.
+
+        :param hostname: Router hostname
+        :param firmware: Router firmware version
+        :param settings_type: Type of settings object e.g. SNMPIPv4
+        :returns: settings object of settings_type, or None if not cached
+        """
+        with closing(self._connect()) as database:
+            row = database.execute(
+                "SELECT state FROM settings "
+                "WHERE hostname = ? AND settings_type = ? AND firmware = ? AND stored >= ?",
+                (hostname, settings_type.__name__, firmware, time() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        LOGGER.debug(f"Using cached {settings_type.__name__} settings for {hostname}")
+        settings = settings_type()
+        for name, value in json.loads(row[0]).items():
+            setattr(settings, name, value)
+        return settings
+
+    def put(self, hostname, firmware, settings):
+        """Store settings read from a router.
+
+        :param hostname: Router hostname
+        :param firmware: Router firmware version
+        :param settings: settings object
+        """
+        with closing(self._connect()) as database, database:
+            database.execute(
+                "INSERT OR REPLACE INTO settings VALUES (?, ?, ?, ?, ?)",
+                (
+                    hostname,
+                    type(settings).__name__,
+                    firmware,
+                    time(),
+                    json.dumps(vars(settings)),
+                ),
+            )
+
+    def invalidate(self, hostname, settings_types=None):
+        """Remove cached settings for a router.
+
+        :param hostname: Router hostname
+        :param settings_types: list of types of settings to remove (Default: all types)
+        """
+        with closing(self._connect()) as database, database:
+            if settings_types is None:
+                database.execute("DELETE FROM settings WHERE hostname = ?", (hostname,))
+            else:
+                database.executemany(
+                    "DELETE FROM settings WHERE hostname = ? AND settings_type = ?",
+                    [(hostname, settings.__name__) for settings in settings_types],
+                )
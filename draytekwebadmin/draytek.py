@@ -1,8 +1,32 @@
 """Draytek Web Admin - Web API Library."""
 
 import logging
+from collections import namedtuple
+from time import monotonic
 
 from draytekwebadmin.driver import TooliumSession
+from draytekwebadmin.httpsession import HTTPBackendError, HTTPSession
+from draytekwebadmin.management import (
+    AccessList,
+    AP_Management,
+    BruteForceProtection,
+    CVM_AccessControl,
+    DeviceManagement,
+    Encryption,
+    InternetAccessControl,
+    IPv6Management,
+    LAN_Access,
+    Management,
+    ManagementPort,
+)
+from draytekwebadmin.snmp import SNMPIPv4, SNMPIPv6, SNMPTrapIPv4, SNMPTrapIPv6, SNMPv3
+from draytekwebadmin.reachability import (
+    Recovery,
+    http_ok,
+    poll,
+    preflight,
+    tcp_reachable,
+)
 from draytekwebadmin.pages import (
     LoginPage,
     SNMPpage,
@@ -11,9 +35,11 @@ from draytekwebadmin.pages import (
     FirmwareUpgradePage,
     DashboardPage,
 )
+from draytekwebadmin.pages.basepageobject import navigation_state
 from draytekwebadmin.utils import (
     bool_or_none,
     int_or_none,
+    nullcontext,
     port_or_none,
     valid_hostname,
     valid_ipv4_address,
@@ -23,6 +49,182 @@ from draytekwebadmin.utils import (
 LOGGER = logging.getLogger("root")
 LOGGER.setLevel(logging.ERROR)
 
+# Page object, tab (page element name) and page object methods used to read, write and fill each settings type.
+# from_form and fields are the page object classmethods that map settings to and from the form fields.
+SettingsPage = namedtuple(
+    "SettingsPage", ["page", "tab", "read", "write", "fill", "from_form", "fields"]
+)
+SETTINGS_PAGES = {
+    "SNMPIPv4": SettingsPage(
+        SNMPpage,
+        None,
+        "read_snmp_ipv4_settings",
+        "write_snmp_ipv4_settings",
+        "fill_snmp_ipv4_settings",
+        "snmp_ipv4_settings_from_form",
+        "snmp_ipv4_settings_fields",
+    ),
+    "SNMPIPv6": SettingsPage(
+        SNMPpage,
+        None,
+        "read_snmp_ipv6_settings",
+        "write_snmp_ipv6_settings",
+        "fill_snmp_ipv6_settings",
+        "snmp_ipv6_settings_from_form",
+        "snmp_ipv6_settings_fields",
+    ),
+    "SNMPTrapIPv4": SettingsPage(
+        SNMPpage,
+        None,
+        "read_snmp_ipv4_trap_setting",
+        "write_snmp_ipv4_trap_settings",
+        "fill_snmp_ipv4_trap_settings",
+        "snmp_ipv4_trap_settings_from_form",
+        "snmp_ipv4_trap_settings_fields",
+    ),
+    "SNMPTrapIPv6": SettingsPage(
+        SNMPpage,
+        None,
+        "read_snmp_ipv6_trap_setting",
+        "write_snmp_ipv6_trap_settings",
+        "fill_snmp_ipv6_trap_settings",
+        "snmp_ipv6_trap_settings_from_form",
+        "snmp_ipv6_trap_settings_fields",
+    ),
+    "SNMPv3": SettingsPage(
+        SNMPpage,
+        None,
+        "read_snmp_v3_settings",
+        "write_snmp_v3_settings",
+        "fill_snmp_v3_settings",
+        "snmp_v3_settings_from_form",
+        "snmp_v3_settings_fields",
+    ),
+    "Management": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_management_settings",
+        "write_management_settings",
+        "fill_management_settings",
+        "management_settings_from_form",
+        "management_settings_fields",
+    ),
+    "InternetAccessControl": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_internet_access_control_settings",
+        "write_internet_access_control_settings",
+        "fill_internet_access_control_settings",
+        "internet_access_control_settings_from_form",
+        "internet_access_control_settings_fields",
+    ),
+    "AccessList": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_access_list_settings",
+        "write_access_list_settings",
+        "fill_access_list_settings",
+        "access_list_settings_from_form",
+        "access_list_settings_fields",
+    ),
+    "ManagementPort": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_management_port_settings",
+        "write_management_port_settings",
+        "fill_management_port_settings",
+        "management_port_settings_from_form",
+        "management_port_settings_fields",
+    ),
+    "BruteForceProtection": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_brute_force_protection_settings",
+        "write_brute_force_protection_settings",
+        "fill_brute_force_protection_settings",
+        "brute_force_protection_settings_from_form",
+        "brute_force_protection_settings_fields",
+    ),
+    "Encryption": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_encryption_settings",
+        "write_encryption_settings",
+        "fill_encryption_settings",
+        "encryption_settings_from_form",
+        "encryption_settings_fields",
+    ),
+    "CVM_AccessControl": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_cvm_access_control_settings",
+        "write_cvm_access_control_settings",
+        "fill_cvm_access_control_settings",
+        "cvm_access_control_settings_from_form",
+        "cvm_access_control_settings_fields",
+    ),
+    "AP_Management": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_ap_management_settings",
+        "write_ap_management_settings",
+        "fill_ap_management_settings",
+        "ap_management_settings_from_form",
+        "ap_management_settings_fields",
+    ),
+    "DeviceManagement": SettingsPage(
+        ManagementPage,
+        "ipv4_management_setup_tab",
+        "read_device_management_settings",
+        "write_device_management_settings",
+        "fill_device_management_settings",
+        "device_management_settings_from_form",
+        "device_management_settings_fields",
+    ),
+    "IPv6Management": SettingsPage(
+        ManagementPage,
+        "ipv6_management_setup_tab",
+        "read_ipv6_management_settings",
+        "write_ipv6_management_settings",
+        "fill_ipv6_management_settings",
+        "ipv6_management_settings_from_form",
+        "ipv6_management_settings_fields",
+    ),
+    "LAN_Access": SettingsPage(
+        ManagementPage,
+        "lan_access_setup_tab",
+        "read_lan_access_settings",
+        "write_lan_access_settings",
+        "fill_lan_access_settings",
+        "lan_access_settings_from_form",
+        "lan_access_settings_fields",
+    ),
+}
+# Selenium drives a browser for every operation.
+# HTTP posts the settings forms directly, falling back to Selenium for pages which need a browser.
+BACKENDS = ["selenium", "http"]
+SETTINGS_TYPES = {
+    settings.__name__: settings
+    for settings in [
+        SNMPIPv4,
+        SNMPIPv6,
+        SNMPTrapIPv4,
+        SNMPTrapIPv6,
+        SNMPv3,
+        Management,
+        InternetAccessControl,
+        AccessList,
+        ManagementPort,
+        BruteForceProtection,
+        Encryption,
+        CVM_AccessControl,
+        AP_Management,
+        DeviceManagement,
+        IPv6Management,
+        LAN_Access,
+    ]
+}
+
 
 class DrayTekWebAdmin:
     """DrayTek web based administration console."""
@@ -40,6 +242,12 @@ class DrayTekWebAdmin:
         search_driver=None,
         implicit_wait_time=None,
         explicit_wait_time=None,
+        session_pool=None,
+        backend="selenium",
+        settings_cache=None,
+        session_store=None,
+        tracer=None,
+        timing=None,
     ):
         """Create a web session to the web administration console.
 
@@ -54,6 +262,12 @@ class DrayTekWebAdmin:
         :param search_driver: Attempt to locate driver executables in local directories. Overrides configuration file.
         :param implicit_wait_time: Web driver implicit wait time (seconds). Overrides configuration file.
         :param explicit_wait_time: Web driver explicit wait time (seconds). Overrides configuration file.
+        :param session_pool: TooliumSessionPool to borrow a warm browser session from, instead of launching one.
+        :param backend: Read and write settings using a browser or plain HTTP requests [selenium, http] (Default: selenium)
+        :param settings_cache: SettingsCache of settings last read, used instead of reading them again
+        :param session_store: SessionStore of logged in sessions, restored instead of logging in again
+        :param tracer: WebDriverTracer counting and timing the WebDriver commands sent by the browser session
+        :param timing: TimingRecorder collecting the time taken by each step, for a fleet timing report
         """
         self.hostname = hostname
         self.port = port
@@ -66,11 +280,22 @@ class DrayTekWebAdmin:
         self.search_driver = search_driver
         self.implicit_wait_time = implicit_wait_time
         self.explicit_wait_time = explicit_wait_time
+        self.session_pool = session_pool
+        self.backend = backend
+        self.settings_cache = settings_cache
+        self.session_store = session_store
+        self.tracer = tracer
+        self.timing = timing
         self.loggedin = False
         self.reboot_required = False
         self.routerinfo = None
+        self.firmware = None
+        self._restarted = None
+        self._expected_firmware = None
+        self._auto_logout = None
         self._url = None
         self._session = None
+        self._http_session = None
 
     def __setattr__(self, name, value):
         if name == "hostname":
@@ -92,6 +317,8 @@ class DrayTekWebAdmin:
             value = port_or_none(value)
         elif name in ["implicit_wait_time", "explicit_wait_time"]:
             value = int_or_none(value)
+        elif name == "backend" and value not in BACKENDS:
+            raise ValueError(f"Unsupported backend: {value}")
         super(DrayTekWebAdmin, self).__setattr__(name, value)
 
     @property
@@ -101,26 +328,76 @@ class DrayTekWebAdmin:
         :returns: toolium session
         """
         if self._session is None:
-            try:
-                LOGGER.info("Creating and opening session")
-                self._session = TooliumSession()
-                self._session.setUp(
-                    config_dir=self.config_dir,
-                    browser=self.browser,
-                    search_driver=self.search_driver,
-                    headless=self.headless,
-                    implicit_wait=self.implicit_wait_time,
-                    explicit_wait=self.explicit_wait_time,
+            # Don't start a browser for a router which can't be reached
+            reachability = self.preflight()
+            if not reachability.reachable:
+                raise RuntimeError(
+                    f"Unable to reach DrayTek Web Administration Console: {reachability.error}"
                 )
-                self._session.driver.get(self.url)
+            try:
+                with self._timed("session"):
+                    if self.session_pool is not None:
+                        LOGGER.info("Borrowing session from pool")
+                        self._session = self.session_pool.checkout()
+                    else:
+                        LOGGER.info("Creating and opening session")
+                        self._session = TooliumSession()
+                        self._session.setUp(
+                            config_dir=self.config_dir,
+                            browser=self.browser,
+                            search_driver=self.search_driver,
+                            headless=self.headless,
+                            implicit_wait=self.implicit_wait_time,
+                            explicit_wait=self.explicit_wait_time,
+                        )
+                    if self.tracer is not None:
+                        self.tracer.attach(self._session.driver)
+                    self._session.driver.get(self.url)
+                state = navigation_state(self._session.driver_wrapper)
+                state.invalidate()
+                state.timer = self.timing.timer(self.hostname) if self.timing else None
                 LOGGER.info(f"Connected to: {self.url} - {self._session.driver.title}")
             except Exception:
-                self.close_session()
+                self.close_session(failed=True)
                 raise RuntimeError(
                     "Unable to navigate to DrayTek Web Administration Console"
                 )
         return self._session
 
+    def _timed(self, phase, detail=None):
+        """Time a step for the timing report, if there is a timing recorder.
+
+        :param phase: step timed, one of timing.PHASES
+        :param detail: what the step was for (Default: None)
+        :returns: context manager
+        """
+        if self.timing is None:
+            return nullcontext()
+        return self.timing.time(self.hostname, phase, detail)
+
+    def preflight(self, timeout=3):
+        """Check the Web Administration Console port can be connected to, without starting a browser.
+
+        :param timeout: seconds to wait for the connection and TLS handshake
+        :returns: Preflight: reachable, latency in seconds and any error
+        """
+        result = preflight(self.hostname, self.port, self.use_https, timeout=timeout)
+        if result.reachable:
+            LOGGER.debug(f"Reached {self.hostname} in {result.latency * 1000:.0f}ms")
+        else:
+            LOGGER.warning(f"Unable to reach {self.hostname}: {result.error}")
+        return result
+
+    @property
+    def http_session(self):
+        """Return HTTP session instance, creating if needed.
+
+        :returns: HTTPSession
+        """
+        if self._http_session is None:
+            self._http_session = HTTPSession(self.url, self.username, self.password)
+        return self._http_session
+
     @property
     def url(self):
         """Construct the url for the Web Administration Console.
@@ -144,19 +421,111 @@ class DrayTekWebAdmin:
         Collects basic RouterInfo
         """
         if not self.loggedin:
-            self.login()
-            self.routerinfo = DashboardPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).routerinfo()
+            if not self._restore_session():
+                with self._timed("login"):
+                    self.login()
+                with self._timed("routerinfo"):
+                    self.routerinfo = DashboardPage(
+                        driver_wrapper=self.session.driver_wrapper
+                    ).routerinfo()
+                self._store_session()
+            if self.timing is not None:
+                self.timing.annotate(
+                    self.hostname,
+                    model=self.routerinfo.model,
+                    firmware=self.routerinfo.firmware,
+                    router_name=self.routerinfo.router_name,
+                )
             LOGGER.info(
                 f"Connected to: {self.hostname} - {self.routerinfo.router_name} - "
                 f"{self.routerinfo.model} - {self.routerinfo.firmware}"
             )
 
-    def close_session(self):
-        """Close selenium webdriver session."""
+    def close_session(self, failed=False):
+        """Close selenium webdriver session, or return it to the session pool.
+
+        :param failed: True if the session encountered an error, so a pooled browser is not reused
+        """
         if self._session:
-            self._session.tearDown()
+            if not failed:
+                # Record the session as just used, so its idle time starts now
+                self._store_session()
+            if self.tracer is not None and self._session.driver is not None:
+                self.tracer.detach(self._session.driver)
+            if self._session.driver_wrapper is not None:
+                navigation_state(self._session.driver_wrapper).timer = None
+            if self.session_pool is not None:
+                self.session_pool.checkin(self._session, failed=failed)
+            else:
+                self._session.tearDown()
+        self._session = None
+        if self._http_session:
+            self._http_session.close()
+        self._http_session = None
+        self.loggedin = False
+
+    def _restore_session(self):
+        """Log in by restoring the cookies of a stored session, unless the router has since logged it out.
+
+        :returns: True if logged in
+        """
+        if self.session_store is None:
+            return False
+        stored = self.session_store.get(self.url, self.username)
+        if stored is None:
+            return False
+        driver = self.session.driver
+        with self._timed("login", "restore"):
+            for cookie in stored.cookies:
+                driver.add_cookie(cookie)
+            driver.get(self.url)
+            navigation_state(self.session.driver_wrapper).invalidate()
+            logged_in = LoginPage(
+                driver_wrapper=self.session.driver_wrapper
+            ).logged_in()
+        if not logged_in:
+            # Auto-logout, a reboot or another login ended the session on the router
+            LOGGER.info("Stored session has been logged out.")
+            self.session_store.invalidate(self.url, self.username)
+            driver.delete_all_cookies()
+            return False
+        self.loggedin = True
+        self.routerinfo = stored.routerinfo
+        LOGGER.info("Restored stored session.")
+        return True
+
+    def _store_session(self):
+        """Save the browser cookies of a logged in session to the session store, if there is one."""
+        if self.session_store is None or not self.loggedin or self._session is None:
+            return
+        try:
+            self.session_store.put(
+                self.url,
+                self.username,
+                self._session.driver.get_cookies(),
+                self.routerinfo,
+                self._auto_logout,
+            )
+        except Exception as exception:
+            LOGGER.warning(f"Unable to store session: {exception}")
+
+    def _forget_stored_session(self):
+        """Remove the stored session and stop it being stored again, after the router restarts."""
+        if self.session_store is not None:
+            self.session_store.invalidate(self.url)
+        self.loggedin = False
+
+    def _note_auto_logout(self, settings):
+        """Remember if the web console logs idle sessions out, from Management settings read or written.
+
+        :param settings: settings objects
+        """
+        for setting in settings:
+            if (
+                isinstance(setting, Management)
+                and setting.disable_auto_logout is not None
+            ):
+                self._auto_logout = not setting.disable_auto_logout
 
     def login(self):
         """Login to the DrayTek Web Administration Console. If login successful then loggedin property set to True."""
@@ -180,74 +549,77 @@ class DrayTekWebAdmin:
         :param settings: Object of the type of settings requested
         :returns: object: of Type requested with the current settings
         """
-        name = settings.__name__
-        self.start_session()
-        LOGGER.info(f"Reading {name} Settings.")
-        if name == "SNMPIPv4":
-            return SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_snmp_ipv4_settings()
-        if name == "SNMPIPv6":
-            return SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_snmp_ipv6_settings()
-        if name == "SNMPTrapIPv4":
-            return SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_snmp_ipv4_trap_setting()
-        if name == "SNMPTrapIPv6":
-            return SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_snmp_ipv6_trap_setting()
-        if name == "SNMPv3":
-            return SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_snmp_v3_settings()
-        if name == "Management":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_management_settings()
-        if name == "InternetAccessControl":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_internet_access_control_settings()
-        if name == "AccessList":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_access_list_settings()
-        if name == "ManagementPort":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_management_port_settings()
-        if name == "Encryption":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_encryption_settings()
-        if name == "BruteForceProtection":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_brute_force_protection_settings()
-        if name == "CVM_AccessControl":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_cvm_access_control_settings()
-        if name == "AP_Management":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_ap_management_settings()
-        if name == "DeviceManagement":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_device_management_settings()
-        if name == "IPv6Management":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_ipv6_management_settings()
-        if name == "LAN_Access":
-            return ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).read_lan_access_settings()
-        raise TypeError(f"Unexpected object type: {name}")
+        if settings.__name__ not in SETTINGS_PAGES:
+            raise TypeError(f"Unexpected object type: {settings.__name__}")
+        return self.read_all_settings([settings])[settings]
+
+    def read_all_settings(self, settings=None):
+        """Read Router Settings for several types, opening each page and tab only once.
+
+        :param settings: list of the types of settings requested (Default: all supported types)
+        :returns: dictionary of {type: object with the current settings}
+        """
+        if settings is None:
+            settings = [SETTINGS_TYPES[name] for name in SETTINGS_PAGES]
+        for setting in settings:
+            if setting.__name__ not in SETTINGS_PAGES:
+                raise TypeError(f"Unexpected object type: {setting.__name__}")
+        results = {}
+        if self.settings_cache is not None:
+            firmware = self._cache_firmware()
+            for setting in settings:
+                cached = self.settings_cache.get(self.hostname, firmware, setting)
+                if cached is not None:
+                    results[setting] = cached
+            settings = [setting for setting in settings if setting not in results]
+            if not settings:
+                return results
+        read = {}
+        if self.backend == "http":
+            read, settings = self._http_read_settings(settings)
+        if settings:
+            self.start_session()
+
+        # Group by page, in tab order, so one page object reads all the settings on it
+        groups = {}
+        for setting in settings:
+            page = SETTINGS_PAGES[setting.__name__]
+            groups.setdefault(page.page, []).append(setting)
+        try:
+            for page_type, page_settings in groups.items():
+                page = page_type(driver_wrapper=self.session.driver_wrapper)
+                page_settings.sort(
+                    key=lambda setting: SETTINGS_PAGES[setting.__name__].tab or ""
+                )
+                for setting in page_settings:
+                    LOGGER.info(f"Reading {setting.__name__} Settings.")
+                    with self._timed("read", setting.__name__):
+                        read[setting] = getattr(
+                            page, SETTINGS_PAGES[setting.__name__].read
+                        )()
+        except Exception:
+            self._forget_navigation()
+            raise
+        if self.settings_cache is not None:
+            for setting in read.values():
+                self.settings_cache.put(self.hostname, firmware, setting)
+        results.update(read)
+        self._note_auto_logout(results.values())
+        return results
+
+    def _forget_navigation(self):
+        """Forget which page the browser is showing, after an error left it part way through an operation."""
+        if self._session is not None:
+            navigation_state(self._session.driver_wrapper).invalidate()
+
+    def _cache_firmware(self):
+        """Firmware version to key cached settings with, read from the dashboard unless using HTTP only.
+
+        :returns: firmware version, or empty string if not known
+        """
+        if self.routerinfo is None and self.backend != "http":
+            self.start_session()
+        return self.routerinfo.firmware if self.routerinfo else ""
 
     def write_settings(self, settings):
         """Apply Router Settings for a specified type. Update property if changes require a device reboot.
@@ -255,89 +627,195 @@ class DrayTekWebAdmin:
         :param settings: Object containing the settings to apply
         :returns: True if changes resulted in a reboot being required
         """
-        reboot_req = False
         name = type(settings).__name__
+        if name not in SETTINGS_PAGES:
+            raise TypeError(f"Unexpected object type: {name}")
+        if self.settings_cache is not None:
+            self.settings_cache.invalidate(self.hostname, [type(settings)])
+        self._note_auto_logout([settings])
+        if self.backend == "http":
+            reboot_req, remaining = self._http_write_settings([settings])
+            if not remaining:
+                if reboot_req:
+                    self.reboot_required = True
+                return reboot_req
 
         self.start_session()
         LOGGER.info(f"Applying new {name} Settings.")
+        page = SETTINGS_PAGES[name]
+        try:
+            with self._timed("write", name):
+                reboot_req = getattr(
+                    page.page(driver_wrapper=self.session.driver_wrapper), page.write
+                )(settings)
+        except Exception:
+            self._forget_navigation()
+            raise
 
-        if name == "SNMPIPv4":
-            reboot_req = SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_snmp_ipv4_settings(settings)
-        elif name == "SNMPIPv6":
-            reboot_req = SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_snmp_ipv6_settings(settings)
-        elif name == "SNMPTrapIPv4":
-            reboot_req = SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_snmp_ipv4_trap_settings(settings)
-        elif name == "SNMPTrapIPv6":
-            reboot_req = SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_snmp_ipv6_trap_settings(settings)
-        elif name == "SNMPv3":
-            reboot_req = SNMPpage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_snmp_v3_settings(settings)
-        elif name == "Management":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_management_settings(settings)
-        elif name == "InternetAccessControl":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_internet_access_control_settings(settings)
-        elif name == "AccessList":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_access_list_settings(settings)
-        elif name == "ManagementPort":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_management_port_settings(settings)
-        elif name == "BruteForceProtection":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_brute_force_protection_settings(settings)
-        elif name == "Encryption":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_encryption_settings(settings)
-        elif name == "CVM_AccessControl":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_cvm_access_control_settings(settings)
-        elif name == "AP_Management":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_ap_management_settings(settings)
-        elif name == "DeviceManagement":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_device_management_settings(settings)
-        elif name == "IPv6Management":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_ipv6_management_settings(settings)
-        elif name == "LAN_Access":
-            reboot_req = ManagementPage(
-                driver_wrapper=self.session.driver_wrapper
-            ).write_lan_access_settings(settings)
-        else:
-            raise TypeError(f"Unexpected object type: {name}")
+        if reboot_req:
+            self.reboot_required = True
+        return reboot_req
+
+    def write_settings_batch(self, settings):
+        """Apply Router Settings for several types, submitting each page and tab only once.
+
+        Settings on the same page and tab are populated in the order given, then applied with a single OK.
+
+        :param settings: list of objects containing the settings to apply
+        :returns: True if any of the changes resulted in a reboot being required
+        """
+        for setting in settings:
+            if type(setting).__name__ not in SETTINGS_PAGES:
+                raise TypeError(f"Unexpected object type: {type(setting).__name__}")
+        if self.settings_cache is not None:
+            self.settings_cache.invalidate(
+                self.hostname, [type(setting) for setting in settings]
+            )
+        self._note_auto_logout(settings)
+        reboot_req = False
+        if self.backend == "http":
+            reboot_req, settings = self._http_write_settings(settings)
+        if settings:
+            self.start_session()
+        try:
+            for (page_type, _tab), page_settings in self._settings_groups(
+                settings
+            ).items():
+                with self._timed("write", self._settings_names(page_settings)):
+                    if self._write_page_settings(page_type, page_settings):
+                        reboot_req = True
+        except Exception:
+            self._forget_navigation()
+            raise
 
         if reboot_req:
             self.reboot_required = True
         return reboot_req
 
+    def _write_page_settings(self, page_type, page_settings):
+        """Populate the settings on one page and tab, then apply them with a single OK if any changed.
+
+        :param page_type: page object type
+        :param page_settings: list of objects containing the settings to apply
+        :returns: True if the changes resulted in a reboot being required
+        """
+        page = page_type(driver_wrapper=self.session.driver_wrapper)
+        for setting in page_settings:
+            name = type(setting).__name__
+            LOGGER.info(f"Populating new {name} Settings.")
+            filled = getattr(page, SETTINGS_PAGES[name].fill)(setting)
+            if filled.disabled or filled.missing:
+                LOGGER.warning(
+                    f"{name} Settings not applied. Disabled: {filled.disabled} Not found: {filled.missing}"
+                )
+        if not page.changed:
+            LOGGER.info("Settings unchanged, not submitted.")
+            return False
+        LOGGER.info(f"Applying {len(page_settings)} Settings with one submit.")
+        return page.submit()
+
+    @staticmethod
+    def _settings_names(settings):
+        """Name settings objects or types for the timing report.
+
+        :param settings: list of settings objects or types
+        :returns: comma separated type names (str)
+        """
+        return ",".join(
+            (setting if isinstance(setting, type) else type(setting)).__name__
+            for setting in settings
+        )
+
+    @staticmethod
+    def _settings_groups(settings):
+        """Group settings objects or types by the page and tab they are on, keeping the order given.
+
+        :param settings: list of settings objects or types
+        :returns: dictionary of {(page object type, tab): [settings]}
+        """
+        groups = {}
+        for setting in settings:
+            setting_type = setting if isinstance(setting, type) else type(setting)
+            page = SETTINGS_PAGES[setting_type.__name__]
+            groups.setdefault((page.page, page.tab), []).append(setting)
+        return groups
+
+    def _http_read_settings(self, settings):
+        """Read settings with the HTTP backend, loading each page and tab once.
+
+        :param settings: list of the types of settings requested
+        :returns: tuple of dictionary of {type: object with the current settings}
+                  and list of the types which need to be read with a browser
+        """
+        results = {}
+        remaining = []
+        for (page_type, tab), page_settings in self._settings_groups(settings).items():
+            try:
+                with self._timed("read", self._settings_names(page_settings)):
+                    form = self.http_session.read_form(
+                        page_type.menu_item, getattr(page_type, tab) if tab else None
+                    )
+                    page_results = {}
+                    for setting in page_settings:
+                        LOGGER.info(f"Reading {setting.__name__} Settings over HTTP.")
+                        page_results[setting] = getattr(
+                            page_type, SETTINGS_PAGES[setting.__name__].from_form
+                        )(form)
+                    if form.missing:
+                        raise HTTPBackendError(f"Fields not found: {form.missing}")
+                results.update(page_results)
+            except HTTPBackendError as error:
+                LOGGER.warning(f"Reading {page_type.menu_item} using browser: {error}")
+                remaining.extend(page_settings)
+        return results, remaining
+
+    def _http_write_settings(self, settings):
+        """Apply settings with the HTTP backend, posting each page and tab once.
+
+        :param settings: list of objects containing the settings to apply
+        :returns: tuple of True if changes resulted in a reboot being required
+                  and list of the settings which need to be applied with a browser
+        """
+        reboot_req = False
+        remaining = []
+        for (page_type, tab), page_settings in self._settings_groups(settings).items():
+            fields = {}
+            for setting in page_settings:
+                LOGGER.info(
+                    f"Applying new {type(setting).__name__} Settings over HTTP."
+                )
+                fields.update(
+                    getattr(page_type, SETTINGS_PAGES[type(setting).__name__].fields)(
+                        setting
+                    )
+                )
+            try:
+                with self._timed("write", self._settings_names(page_settings)):
+                    written = self.http_session.write(
+                        page_type.menu_item,
+                        fields,
+                        page_type.ok_button,
+                        getattr(page_type, tab) if tab else None,
+                    )
+                if written:
+                    reboot_req = True
+            except HTTPBackendError as error:
+                LOGGER.warning(f"Applying {page_type.menu_item} using browser: {error}")
+                remaining.extend(page_settings)
+        return reboot_req, remaining
+
     def reboot(self):
         """Reboot Router - System Maintenance >> Reboot System."""
         self.start_session()
         LOGGER.info("Rebooting Router.")
-        RebootSystemPage(driver_wrapper=self.session.driver_wrapper).reboot()
+        with self._timed("reboot"):
+            RebootSystemPage(driver_wrapper=self.session.driver_wrapper).reboot()
         self.reboot_required = False
+        self._restarted = monotonic()
+        if self.settings_cache is not None:
+            self.settings_cache.invalidate(self.hostname)
+        self._forget_stored_session()
+        self._expected_firmware = None
 
     def upgrade_preview(self, firmware):
         """Preview firmware upgrade - System Maintenance >> Firmware Upgrade.
@@ -346,30 +824,147 @@ class DrayTekWebAdmin:
         :returns: Firmware object: Properties set for based on the previewing the firmware
         """
         if firmware.filepath is None:
-            return ValueError("Firmware filepath not set")
+            raise ValueError("Firmware filepath not set")
         self.start_session()
         LOGGER.info("Opening firmware page for preview")
-        new_firmware = FirmwareUpgradePage(
-            driver_wrapper=self.session.driver_wrapper
-        ).new_firmware_preview(firmware)
+        with self._timed("upgrade_preview"):
+            new_firmware = FirmwareUpgradePage(
+                driver_wrapper=self.session.driver_wrapper
+            ).new_firmware_preview(firmware)
         # Patch in the current firmware version which oddly isn't shown on the preview page
         new_firmware.firmware_current = self.routerinfo.firmware
         return new_firmware
 
-    def upgrade(self, firmware):
+    def upgrade(self, firmware, approve=None):
         """Upgrade firmware - System Maintenance >> Firmware Upgrade.
 
+        The firmware is previewed and, if approved, installed from the same page without reopening it.
+        The previewed firmware, with the upload bytes and seconds, is kept in the firmware attribute.
+
         :param firmware: Firmware object containing full file path for new firmware
+        :param approve: function taking the previewed Firmware object, returning True to install it
+                        (Default: install if the router or modem firmware differs from the current version)
         :returns: (bool) True if firmware is being updated and router rebooted
         """
         if firmware.filepath is None:
-            return ValueError("Firmware filepath not set")
+            raise ValueError("Firmware filepath not set")
+        approve = approve or self._upgrade_wanted
+
+        def approve_preview(preview):
+            # Patch in the current firmware version which oddly isn't shown on the preview page
+            preview.firmware_current = self.routerinfo.firmware
+            return approve(preview)
+
         self.start_session()
         LOGGER.info("Opening firmware page for upgrade")
-        upgrading = FirmwareUpgradePage(
-            driver_wrapper=self.session.driver_wrapper
-        ).new_firmware_install(firmware)
+        with self._timed("upgrade"):
+            self.firmware, upgrading = FirmwareUpgradePage(
+                driver_wrapper=self.session.driver_wrapper
+            ).new_firmware_preview_install(firmware, approve_preview)
+        if self.timing is not None and self.firmware.transfer_seconds is not None:
+            # The upload is timed by the page object, within the upgrade step
+            self.timing.record(
+                self.hostname,
+                "upgrade_transfer",
+                self.firmware.transfer_seconds,
+                nested=True,
+            )
+        LOGGER.info(
+            f"Firmware upload {self.firmware.transfer_bytes} bytes in {self.firmware.transfer_seconds:.1f}s"
+        )
         if upgrading:
             LOGGER.info("Upgraded firmware and rebooted")
+            if self.settings_cache is not None:
+                self.settings_cache.invalidate(self.hostname)
+            self._forget_stored_session()
+            self._restarted = monotonic()
+            self._expected_firmware = self.firmware.firmware_target
             return True
         return False
+
+    @staticmethod
+    def _upgrade_wanted(firmware):
+        """Decide whether to install previewed firmware.
+
+        :param firmware: Firmware object populated from the preview
+        :returns: True if the router or modem firmware differs from the current version
+        """
+        return (
+            firmware.router_firmware_upgradable()
+            or firmware.modem_firmware_upgradable()
+        )
+
+    def wait_until_available(
+        self, timeout=600, poll_interval=1, max_poll_interval=30, down_timeout=60
+    ):
+        """Wait for the router to return after a reboot or upgrade, then login again.
+
+        Polls with exponential backoff, first for a TCP connection to the web port, then for the login page
+        to load, then for the dashboard to be read after logging in.
+
+        :param timeout: seconds to wait for the router
+        :param poll_interval: seconds between the first checks at each step
+        :param max_poll_interval: largest number of seconds between checks
+        :param down_timeout: seconds to wait for the router to stop responding after a restart was requested
+        :returns: Recovery: downtime, firmware version and whether it matches the upgrade
+        """
+        deadline = monotonic() + timeout
+        restarted, expected_firmware = self._restarted, self._expected_firmware
+        with self._timed("reboot_wait"):
+            if restarted is not None:
+                # The router keeps answering for a short time after the restart button is clicked
+                poll(
+                    lambda: not tcp_reachable(self.hostname, self.port),
+                    min(deadline, restarted + down_timeout),
+                    poll_interval,
+                    poll_interval,
+                )
+            steps = [
+                ("connection", lambda: tcp_reachable(self.hostname, self.port)),
+                ("login page", lambda: http_ok(self.url)),
+                ("dashboard", self._reconnect),
+            ]
+            for step, check in steps:
+                if not poll(check, deadline, poll_interval, max_poll_interval):
+                    raise TimeoutError(
+                        f"Router {self.hostname} not available after {timeout}s, waiting for {step}"
+                    )
+        self._restarted = None
+        self._expected_firmware = None
+        recovery = Recovery(
+            downtime=None if restarted is None else monotonic() - restarted,
+            firmware=self.routerinfo.firmware,
+            firmware_confirmed=(
+                None
+                if expected_firmware is None
+                else self.routerinfo.firmware == expected_firmware
+            ),
+        )
+        if recovery.downtime is not None:
+            LOGGER.info(
+                f"Router {self.hostname} available after {recovery.downtime:.0f}s"
+            )
+        if recovery.firmware_confirmed is False:
+            LOGGER.warning(
+                f"Router {self.hostname} firmware {recovery.firmware}, expected {expected_firmware}"
+            )
+        return recovery
+
+    def _reconnect(self):
+        """Login again and read the dashboard, after the router has restarted.
+
+        :returns: True if successful
+        """
+        self.loggedin = False
+        if self._http_session:
+            self._http_session.close()
+        self._http_session = None
+        try:
+            if self._session is not None:
+                self._session.driver.get(self.url)
+                navigation_state(self._session.driver_wrapper).invalidate()
+            self.start_session()
+            return True
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.debug(f"Router {self.hostname} not ready: {exception}")
+            return False
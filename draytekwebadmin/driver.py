@@ -1,14 +1,46 @@
 """Draytek Web Admin - Toolium Session."""
-from os import getcwd, environ
+
+from os import getcwd
 from pathlib import Path
+from threading import Condition, Lock
+from time import monotonic
 import logging
 
 
 from toolium import test_cases
+from toolium.config_files import ConfigFiles
+from toolium.driver_wrapper import DriverWrapper
+from toolium.driver_wrappers_pool import DriverWrappersPool
+from draytekwebadmin.pages.basepageobject import navigation_state
 from draytekwebadmin.utils import bool_or_none, int_or_none
 
 LOGGER = logging.getLogger("root")
 
+# Toolium keeps configuration directories and the driver wrapper list at class level.
+# Serialise the short configuration step so concurrent sessions don't read each others directories.
+_POOL_LOCK = Lock()
+
+
+class SessionDriverWrapper(DriverWrapper):
+    """Toolium DriverWrapper with configuration overrides private to a single session."""
+
+    def __init__(self, overrides=None):
+        """Create a new SessionDriverWrapper.
+
+        :param overrides: dictionary of {(section, option): value} applied over the configuration files
+        """
+        super(SessionDriverWrapper, self).__init__()
+        self.overrides = overrides or {}
+        # Always load our own copy of the properties, rather than inheriting those of another session
+        self.config_properties_filenames = None
+
+    def finalize_properties_configuration(self):
+        """Apply session overrides to the configuration loaded from file."""
+        for (section, option), value in self.overrides.items():
+            if not self.config.has_section(section):
+                self.config.add_section(section)
+            self.config.set(section, option, value)
+
 
 class TooliumSession(test_cases.SeleniumTestCase):
     """Toolium Session."""
@@ -24,6 +56,9 @@ class TooliumSession(test_cases.SeleniumTestCase):
     ):
         """Override setUp function to enable config file directory to be configured.
 
+        Settings are applied to a driver wrapper owned by this session, so sessions with
+        different settings can run concurrently within one process.
+
         :param config_dir: path to config file location
         :param browser: browser name [chrome|firefox] overriding configuration file setting
         :param search_browser_driver: Attempt to locate browser driver in current working directory
@@ -31,23 +66,55 @@ class TooliumSession(test_cases.SeleniumTestCase):
         :param implicit_wait: wait time in seconds, overriding configuration file setting
         :param explicit_wait: wait time in seconds, overriding configuration file setting
         """
+        self.config_files = ConfigFiles()
         self.config_files.set_config_properties_filenames(
             "properties.cfg", "local-properties.cfg"
         )
         configuration_dir = self._locate_config_dir(config_dir)
         if configuration_dir:
             self.config_files.set_config_directory(str(configuration_dir))
+        else:
+            self.config_files.set_config_directory(
+                DriverWrappersPool.get_default_config_directory()
+            )
+
+        overrides = {}
         if browser:
-            self._override_browser_type(browser)
+            overrides.update(self._override_browser_type(browser))
         if search_driver:
-            self._locate_browser_driver()
+            overrides.update(self._locate_browser_driver())
         if headless:
-            self._override_headless(headless)
+            overrides.update(self._override_headless(headless))
         if implicit_wait:
-            self._override_implicit_wait(implicit_wait)
+            overrides.update(self._override_implicit_wait(implicit_wait))
         if explicit_wait:
-            self._override_explcit_wait(explicit_wait)
-        super(TooliumSession, self).setUp()
+            overrides.update(self._override_explcit_wait(explicit_wait))
+
+        with _POOL_LOCK:
+            self.driver_wrapper = SessionDriverWrapper(overrides)
+            self.driver_wrapper.configure(
+                DriverWrappersPool.initialize_config_files(self.config_files)
+            )
+        self.driver_wrapper.connect()
+        self.driver = self.driver_wrapper.driver
+        self.utils = self.driver_wrapper.utils
+        self.config = self.driver_wrapper.config
+        self.logger = LOGGER
+
+    def tearDown(self):
+        """Stop this session's driver, leaving other sessions untouched."""
+        if self.driver_wrapper is None:
+            return
+        try:
+            if self.driver_wrapper.driver:
+                self.driver_wrapper.stop()
+        finally:
+            with _POOL_LOCK:
+                if self.driver_wrapper in DriverWrappersPool.driver_wrappers:
+                    DriverWrappersPool.driver_wrappers.remove(self.driver_wrapper)
+            self.driver_wrapper.driver = None
+            self.driver_wrapper = None
+            self.driver = None
 
     def _locate_config_dir(self, config_dir=None):
         """Attempt to locate configuration files for Toolium.
@@ -80,63 +147,241 @@ class TooliumSession(test_cases.SeleniumTestCase):
         """Override configuration file setting for browser type.
 
         :param browser: browser name [chrome|firefox]
+        :return: dictionary of configuration overrides
         """
         browser = str(browser).lower()
         if browser in ["chrome", "firefox"]:
-            environ["Driver_type"] = browser
+            return {("Driver", "type"): browser}
+        return {}
 
     @staticmethod
     def _locate_browser_driver():
-        """Search local directory for browser drivers. Override configuration file."""
-        # Search for Chrome Driver (chromedriver.exe)
-        chrome_driver = Path(getcwd(), "chromedriver.exe")
-        if chrome_driver.exists():
-            environ["Driver_chrome_driver_path"] = str(chrome_driver)
-        else:
-            chrome_driver = Path(getcwd(), "conf", "chromedriver.exe")
-            if chrome_driver.exists():
-                environ["Driver_chrome_driver_path"] = str(chrome_driver)
-            else:
-                chrome_driver = Path(getcwd(), "driver", "chromedriver.exe")
-                if chrome_driver.exists():
-                    environ["Driver_chrome_driver_path"] = str(chrome_driver)
-
-        # Search for Firefox Driver (geckodriver.exe)
-        firefox_driver = Path(getcwd(), "geckodriver.exe")
-        if firefox_driver.exists():
-            environ["Driver_gecko_driver_path"] = str(firefox_driver)
-        else:
-            firefox_driver = Path(getcwd(), "conf", "geckodriver.exe")
-            if firefox_driver.exists():
-                environ["Driver_gecko_driver_path"] = str(firefox_driver)
-            else:
-                firefox_driver = Path(getcwd(), "driver", "geckodriver.exe")
-                if firefox_driver.exists():
-                    environ["Driver_gecko_driver_path"] = str(firefox_driver)
+        """Search local directory for browser drivers. Override configuration file.
+
+        :return: dictionary of configuration overrides
+        """
+        overrides = {}
+        for option, executable in [
+            ("chrome_driver_path", "chromedriver.exe"),
+            ("gecko_driver_path", "geckodriver.exe"),
+        ]:
+            for driver in [
+                Path(getcwd(), executable),
+                Path(getcwd(), "conf", executable),
+                Path(getcwd(), "driver", executable),
+            ]:
+                if driver.exists():
+                    overrides[("Driver", option)] = str(driver)
+                    break
+        return overrides
 
     @staticmethod
     def _override_headless(headless):
         """Override configuration file setting for headless session state.
 
         :param headless: Boolean flag to run the session headless
+        :return: dictionary of configuration overrides
         """
         if bool_or_none(headless):
-            environ["Driver_headless"] = str(bool_or_none(headless))
+            return {("Driver", "headless"): str(bool_or_none(headless))}
+        return {}
 
     @staticmethod
     def _override_implicit_wait(wait):
         """Override configuration file setting for Implicitly Wait.
 
         :param wait: time in seconds
+        :return: dictionary of configuration overrides
         """
         if int_or_none(wait):
-            environ["Driver_implicitly_wait"] = str(wait)
+            return {("Driver", "implicitly_wait"): str(wait)}
+        return {}
 
     @staticmethod
     def _override_explcit_wait(wait):
         """Override configuration file setting for Explicitly Wait.
 
         :param wait: time in seconds
+        :return: dictionary of configuration overrides
         """
         if int_or_none(wait):
-            environ["Driver_explicitly_wait"] = str(wait)
+            return {("Driver", "explicitly_wait"): str(wait)}
+        return {}
+
+
+class TooliumSessionPool:
+    """Pool of warm TooliumSessions, reused across routers instead of launching a browser per router."""
+
+    def __init__(
+        self,
+        max_size=4,
+        max_uses=25,
+        session_factory=None,
+        config_dir=None,
+        browser=None,
+        search_driver=None,
+        headless=None,
+        implicit_wait=None,
+        explicit_wait=None,
+    ):
+        """Create a new TooliumSessionPool.
+
+        :param max_size: Maximum number of browser sessions open at the same time (Default: 4)
+        :param max_uses: Number of routers a browser is used for before it is recycled (Default: 25)
+        :param session_factory: Callable returning a new, set up, session. Defaults to TooliumSession.
+        :param config_dir: Path to toolium configuration files
+        :param browser: browser name [chrome|firefox] overriding configuration file setting
+        :param search_driver: Attempt to locate browser driver in current working directory
+        :param headless: Boolean flag to run the session headless, overriding configuration file setting
+        :param implicit_wait: wait time in seconds, overriding configuration file setting
+        :param explicit_wait: wait time in seconds, overriding configuration file setting
+        """
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.session_settings = {
+            "config_dir": config_dir,
+            "browser": browser,
+            "search_driver": search_driver,
+            "headless": headless,
+            "implicit_wait": implicit_wait,
+            "explicit_wait": explicit_wait,
+        }
+        self._session_factory = session_factory or self._new_session
+        self._condition = Condition()
+        self._idle = []
+        self._uses = {}
+        self._in_use = 0
+        self._created = 0
+        self._recycled = 0
+        self._checkouts = 0
+        self._checkout_latency_total = 0.0
+        self._checkout_latency_max = 0.0
+
+    def _new_session(self):
+        """Launch a new browser session using the pool settings.
+
+        :returns: TooliumSession
+        """
+        session = TooliumSession()
+        session.setUp(**self.session_settings)
+        return session
+
+    @property
+    def size(self):
+        """int: Number of browser sessions currently open (idle and in use)."""
+        with self._condition:
+            return len(self._idle) + self._in_use
+
+    def checkout(self, timeout=None):
+        """Take a warm session from the pool, launching a new browser if the pool isn't full.
+
+        :param timeout: seconds to wait for a session to be returned when the pool is full (Default: wait forever)
+        :returns: TooliumSession
+        """
+        started = monotonic()
+        with self._condition:
+            while not self._idle and self._in_use >= self.max_size:
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("No browser session available from pool")
+            session = self._idle.pop() if self._idle else None
+            self._in_use += 1
+        if session is None:
+            try:
+                session = self._session_factory()
+            except Exception:
+                with self._condition:
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._created += 1
+                self._uses[id(session)] = 0
+        latency = monotonic() - started
+        with self._condition:
+            self._checkouts += 1
+            self._checkout_latency_total += latency
+            self._checkout_latency_max = max(self._checkout_latency_max, latency)
+        LOGGER.debug(f"Browser session checked out in {latency:.3f}s")
+        return session
+
+    def checkin(self, session, failed=False):
+        """Return a session to the pool. Cleared for the next router, or recycled if worn out or failed.
+
+        :param session: session previously returned by checkout
+        :param failed: True if the session encountered an error and must not be reused
+        """
+        with self._condition:
+            uses = self._uses.get(id(session), 0) + 1
+            self._uses[id(session)] = uses
+        recycle = failed or uses >= self.max_uses
+        if not recycle:
+            try:
+                self._reset_session(session)
+            except Exception as exception:  # pylint: disable=broad-except
+                LOGGER.warning(f"Unable to reset browser session: {exception}")
+                recycle = True
+        if recycle:
+            self._discard(session)
+        with self._condition:
+            self._in_use -= 1
+            if recycle:
+                self._recycled += 1
+            else:
+                self._idle.append(session)
+            self._condition.notify()
+
+    @staticmethod
+    def _reset_session(session):
+        """Remove cookies, storage and page state left behind by the previous router.
+
+        :param session: session to reset
+        """
+        driver = session.driver
+        driver.switch_to.default_content()
+        driver.execute_script(
+            "try {window.localStorage.clear(); window.sessionStorage.clear();} catch (e) {}"
+        )
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        navigation_state(session.driver_wrapper).invalidate()
+
+    def _discard(self, session):
+        """Close a session's browser, ignoring errors from an already broken session.
+
+        :param session: session to close
+        """
+        with self._condition:
+            self._uses.pop(id(session), None)
+        try:
+            session.tearDown()
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.debug(f"Error closing browser session: {exception}")
+
+    def close(self):
+        """Close all idle browser sessions."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+    def metrics(self):
+        """Return pool usage metrics.
+
+        :returns: dictionary of pool size, idle and in use sessions, browsers created and recycled,
+                  checkouts and checkout latency (average and maximum seconds)
+        """
+        with self._condition:
+            return {
+                "size": len(self._idle) + self._in_use,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "created": self._created,
+                "recycled": self._recycled,
+                "checkouts": self._checkouts,
+                "checkout_latency_avg": (
+                    self._checkout_latency_total / self._checkouts
+                    if self._checkouts
+                    else 0.0
+                ),
+                "checkout_latency_max": self._checkout_latency_max,
+            }
@@ -2,8 +2,53 @@
 
 # pylint: disable=attribute-defined-outside-init
 
+import hashlib
+import re
 from pathlib import Path
 
+# Firmware images start with a header naming the model and version. The layout isn't documented, so
+# the first part of the file is searched for the strings rather than read from fixed offsets.
+HEADER_SCAN_BYTES = 256 * 1024
+HEADER_MODEL_PATTERN = re.compile(rb"Vigor ?\d{4}[A-Za-z0-9]*")
+HEADER_VERSION_PATTERN = re.compile(
+    rb"(?<![\d.])\d{1,2}\.\d{1,2}\.\d{1,2}(?:\.\d{1,2})?(?:_[A-Za-z0-9]+)?"
+)
+
+# Parsed headers by sha256 of the file, and file hashes by (path, size, modified time)
+_HEADER_CACHE = {}
+_HASH_CACHE = {}
+
+
+def parse_firmware_header(data):
+    """Search the start of a firmware image for the model and version.
+
+    :param data: bytes from the start of the firmware file
+    :returns: (model, version), either None if not found
+    """
+    model = HEADER_MODEL_PATTERN.search(data)
+    version = HEADER_VERSION_PATTERN.search(data)
+    return (
+        model.group().decode("ascii") if model else None,
+        version.group().decode("ascii") if version else None,
+    )
+
+
+def file_sha256(filepath):
+    """Calculate sha256 of a file, reusing the result while the file is unchanged.
+
+    :param filepath: Path to file
+    :returns: hex digest
+    """
+    stat = Path(filepath).stat()
+    key = (str(filepath), stat.st_size, stat.st_mtime_ns)
+    if key not in _HASH_CACHE:
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+        _HASH_CACHE[key] = digest.hexdigest()
+    return _HASH_CACHE[key]
+
 
 class Firmware:
     """Firmware object."""
@@ -16,6 +61,8 @@ class Firmware:
         firmware_target=None,
         modem_firmware_current=None,
         modem_firmware_target=None,
+        transfer_bytes=None,
+        transfer_seconds=None,
     ):
         """Create a new Firmware object."""
         self.filepath = filepath
@@ -24,6 +71,8 @@ class Firmware:
         self.firmware_target = firmware_target
         self.modem_firmware_current = modem_firmware_current
         self.modem_firmware_target = modem_firmware_target
+        self.transfer_bytes = transfer_bytes
+        self.transfer_seconds = transfer_seconds
 
     @property
     def filepath(self):
@@ -41,6 +90,31 @@ class Firmware:
         else:
             self._filepath = None
 
+    @classmethod
+    def from_header(cls, filepath):
+        """Read firmware model and version from the file, without uploading it to a router.
+
+        :param filepath: Full path to firmware file
+        :returns: Firmware object with filepath, model and firmware_target set from the file header.
+                  model and firmware_target are None if not found.
+        """
+        firmware = cls(filepath=filepath)
+        sha256 = file_sha256(firmware.filepath)
+        if sha256 not in _HEADER_CACHE:
+            with open(firmware.filepath, "rb") as file:
+                _HEADER_CACHE[sha256] = parse_firmware_header(
+                    file.read(HEADER_SCAN_BYTES)
+                )
+        firmware.model, firmware.firmware_target = _HEADER_CACHE[sha256]
+        return firmware
+
+    @property
+    def size(self):
+        """int: Size of the firmware file in bytes, or None if no file set."""
+        if self.filepath is None:
+            return None
+        return self.filepath.stat().st_size
+
     def router_firmware_upgradable(self):
         """bool: True if firmware_current is not the same as firmware_target."""
         if self.firmware_current != self.firmware_target:
@@ -52,3 +126,21 @@ class Firmware:
         if self.modem_firmware_current != self.modem_firmware_target:
             return True
         return False
+
+    def up_to_date(self, modem=True):
+        """Check the router is known to run this firmware, so it needn't be previewed or uploaded.
+
+        The modem version isn't read from the file header, so a router with modem firmware is only
+        up to date if both modem versions are known and the same.
+
+        :param modem: False if the router model has no modem firmware (Default: True)
+        :returns: True if the router and any modem firmware are current
+        """
+        if self.router_firmware_upgradable():
+            return False
+        if not modem:
+            return True
+        return (
+            self.modem_firmware_target is not None
+            and not self.modem_firmware_upgradable()
+        )
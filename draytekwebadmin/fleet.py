@@ -0,0 +1,64 @@
+"""Draytek Web Admin - Fleet Executor."""
+
+# pylint: disable=broad-except
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+LOGGER = logging.getLogger("root")
+
+DEFAULT_CONCURRENCY = 4
+
+
+class FleetExecutor:
+    """Run a task against many routers using a bounded pool of concurrent sessions."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY):
+        """Create a new FleetExecutor.
+
+        :param concurrency: Maximum number of routers processed at the same time (Default: 4)
+        """
+        self.concurrency = concurrency
+
+    def __setattr__(self, name, value):
+        if name == "concurrency":
+            value = int(value)
+            if value < 1:
+                raise ValueError(f"Concurrency must be at least 1: {value}")
+        super(FleetExecutor, self).__setattr__(name, value)
+
+    def run(self, routers, task, *args, **kwargs):
+        """Run task for every router, returning the results in the same order as the input.
+
+        A task raising an exception does not stop the rest of the fleet, the exception
+        is logged and returned in place of the result for that router.
+
+        :param routers: list of routers e.g. rows read from a CSV file
+        :param task: callable invoked as task(router, *args, **kwargs)
+        :returns: list of task results (or exceptions), one per router in input order
+        """
+        routers = list(routers)
+        if not routers:
+            return []
+        workers = min(self.concurrency, len(routers))
+        LOGGER.info(f"Processing {len(routers)} routers, {workers} at a time")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._run_task, task, router, *args, **kwargs)
+                for router in routers
+            ]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _run_task(task, router, *args, **kwargs):
+        """Run a single task, capturing any exception as the result.
+
+        :param task: callable to run
+        :param router: router passed to the task
+        :returns: task result or the exception raised
+        """
+        try:
+            return task(router, *args, **kwargs)
+        except Exception as exception:
+            LOGGER.critical(f"Fleet task failed: {exception}")
+            return exception
@@ -0,0 +1,484 @@
+"""Draytek Web Admin - HTTP Session (browser free backend)."""
+
+import logging
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.common.by import By
+
+from draytekwebadmin.pages import BasePageObject, LoginPage, MenuNavigator
+from draytekwebadmin.pages.basepageobject import FormFill
+
+LOGGER = logging.getLogger("root")
+
+DEFAULT_TIMEOUT = 30
+
+# Tags without a closing tag, which never hold text
+VOID_TAGS = [
+    "area",
+    "br",
+    "col",
+    "embed",
+    "frame",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "param",
+    "source",
+]
+# Form controls which are never submitted with the form data
+UNSUBMITTED_TYPES = ["submit", "button", "image", "reset", "file"]
+
+
+class HTTPBackendError(RuntimeError):
+    """Raised when an operation can't be performed without a browser, e.g. the page is built by JavaScript."""
+
+
+class HTMLPage(HTMLParser):
+    """Parse the form fields, links, frames and element text of a DrayTek web admin page."""
+
+    def __init__(self, url, html):
+        """Parse a page.
+
+        :param url: URL the page was loaded from, used to resolve relative links
+        :param html: page content
+        """
+        super(HTMLPage, self).__init__()
+        self.url = url
+        self.forms = []
+        self.fields = []
+        self.links = []
+        self.frames = {}
+        self.texts = {}
+        self._open = []
+        self._select = None
+        self._option = None
+        self._link = None
+        self._textarea = None
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        """Record forms, fields, links and frames as they are found."""
+        attrs = {name: (value if value is not None else "") for name, value in attrs}
+        if tag not in VOID_TAGS:
+            self._open.append([tag, attrs.get("id"), []])
+        if tag == "form":
+            self.forms.append(
+                {
+                    "action": attrs.get("action", ""),
+                    "method": attrs.get("method", "get").lower(),
+                }
+            )
+        elif tag in ["input", "button"]:
+            field_type = attrs.get("type", "text" if tag == "input" else "submit")
+            self._add_field(
+                attrs,
+                type=field_type.lower(),
+                value=attrs.get(
+                    "value", "on" if field_type in ["checkbox", "radio"] else ""
+                ),
+                checked="checked" in attrs,
+            )
+        elif tag == "select":
+            self._select = self._add_field(attrs, type="select-one", options=[])
+        elif tag == "option" and self._select is not None:
+            self._option = {
+                "value": attrs.get("value"),
+                "text": [],
+                "selected": "selected" in attrs,
+            }
+            self._select["options"].append(self._option)
+        elif tag == "textarea":
+            self._textarea = self._add_field(attrs, type="textarea", text=[])
+        elif tag == "a":
+            self._link = {
+                "id": attrs.get("id", ""),
+                "href": attrs.get("href", ""),
+                "text": [],
+            }
+            self.links.append(self._link)
+        elif tag in ["frame", "iframe"] and attrs.get("name"):
+            self.frames[attrs["name"]] = urljoin(self.url, attrs.get("src", ""))
+
+    def handle_endtag(self, tag):
+        """Finish any field, option, link or element being read."""
+        if tag == "select" and self._select is not None:
+            self._finish_select()
+        elif tag == "option":
+            self._option = None
+        elif tag == "textarea" and self._textarea is not None:
+            self._textarea["value"] = "".join(self._textarea.pop("text"))
+            self._textarea = None
+        elif tag == "a":
+            self._link = None
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                for _, element_id, text in self._open[index:]:
+                    if element_id:
+                        self.texts[element_id] = " ".join("".join(text).split())
+                del self._open[index:]
+                break
+
+    def handle_data(self, data):
+        """Collect text for options, text areas, links and elements with an id."""
+        for element in self._open:
+            element[2].append(data)
+        for target in [self._option, self._textarea, self._link]:
+            if target is not None:
+                target["text"].append(data)
+
+    def close(self):
+        """Finish parsing, closing any elements left open by the page."""
+        super(HTMLPage, self).close()
+        if self._select is not None:
+            self._finish_select()
+        for _, element_id, text in self._open:
+            if element_id:
+                self.texts[element_id] = " ".join("".join(text).split())
+        self._open = []
+
+    def _add_field(self, attrs, **field):
+        """Add a form field, in the same form as BasePageObject.snapshot_form.
+
+        :param attrs: field attributes
+        :returns: field dictionary
+        """
+        field.setdefault("value", "")
+        field.setdefault("checked", False)
+        field.update(
+            {
+                "name": attrs.get("name", ""),
+                "id": attrs.get("id", ""),
+                "class": attrs.get("class", "").split(),
+                "enabled": "disabled" not in attrs,
+                "option": None,
+                "form": len(self.forms) - 1,
+            }
+        )
+        self.fields.append(field)
+        return field
+
+    def _finish_select(self):
+        """Work out the selected option, as a browser would."""
+        options = self._select["options"]
+        for option in options:
+            option["text"] = " ".join("".join(option["text"]).split())
+            if option["value"] is None:
+                option["value"] = option["text"]
+        selected = [option for option in options if option["selected"]] or options[:1]
+        for option in options:
+            option["selected"] = option in selected[:1]
+        if selected:
+            self._select["value"] = selected[0]["value"]
+            self._select["option"] = selected[0]["text"]
+        self._select = None
+        self._option = None
+
+    def form(self):
+        """Return the page form fields, keyed as BasePageObject.snapshot_form.
+
+        :returns: dictionary of {key: field}
+        """
+        return BasePageObject.index_form(self.fields)
+
+    def link(self, text=None, element_id=None):
+        """Return the absolute URL of a link, found by its text or id.
+
+        :param text: link text
+        :param element_id: link id
+        :returns: URL (str) or None if not found, or the link only runs JavaScript
+        """
+        for link in self.links:
+            if (
+                text is not None and " ".join("".join(link["text"]).split()) == text
+            ) or (element_id is not None and link["id"] == element_id):
+                href = link["href"].strip()
+                if (
+                    href
+                    and not href.startswith("#")
+                    and not href.lower().startswith("javascript:")
+                ):
+                    return urljoin(self.url, href)
+        return None
+
+
+class StaticForm(dict):
+    """Form snapshot which records the fields looked up but not found in the page HTML."""
+
+    def __init__(self, *args, **kwargs):
+        super(StaticForm, self).__init__(*args, **kwargs)
+        self.missing = []
+
+    def get(self, key, default=None):
+        """Return field for key, recording the key if it isn't found."""
+        if key not in self:
+            self.missing.append(key)
+        return super(StaticForm, self).get(key, default)
+
+
+class HTTPSession:
+    """Web admin session using plain HTTP requests, posting the settings forms without a browser.
+
+    Pages built or changed by JavaScript can't be handled, HTTPBackendError is raised
+    so the caller can fall back to a browser session.
+    """
+
+    def __init__(
+        self,
+        url,
+        username,
+        password,
+        timeout=DEFAULT_TIMEOUT,
+        verify=False,
+        pool_size=4,
+    ):
+        """Create a new HTTPSession.
+
+        :param url: Web admin console URL e.g. https://192.168.1.1:443
+        :param username: Web admin account username
+        :param password: Password for admin account
+        :param timeout: seconds to wait for each request (Default: 30)
+        :param verify: Verify the router TLS certificate (Default: False, routers normally use self signed certificates)
+        :param pool_size: Number of connections kept open to the router (Default: 4)
+        """
+        self.url = url
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.verify = verify
+        self.loggedin = False
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        if not verify:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self._menu = None
+
+    def close(self):
+        """Close the connections to the router."""
+        self.http.close()
+        self.loggedin = False
+        self._menu = None
+
+    def _request(self, method, url, **kwargs):
+        """Send a request, returning the parsed page.
+
+        :param method: HTTP method
+        :param url: URL to request
+        :returns: HTMLPage
+        """
+        try:
+            response = self.http.request(
+                method, url, timeout=self.timeout, verify=self.verify, **kwargs
+            )
+            response.raise_for_status()
+        except requests.RequestException as exception:
+            raise HTTPBackendError(
+                f"Request to {url} failed: {exception}"
+            ) from exception
+        return HTMLPage(response.url, response.text)
+
+    def login(self):
+        """Login to the web admin console. Raises RuntimeError if the router rejects the login details."""
+        page = self._request("get", urljoin(self.url, "/"))
+        form = page.form()
+        username = form.get(BasePageObject.form_key(LoginPage.username))
+        password = form.get(BasePageObject.form_key(LoginPage.password))
+        if username is None or password is None:
+            raise HTTPBackendError("Login form not found")
+        username["value"] = self.username
+        password["value"] = self.password
+        page = self._submit(page, LoginPage.login_button)
+        message = page.texts.get(LoginPage.login_error_message.locator[1])
+        if message:
+            LOGGER.error(f"Login Failed - Error: {message}")
+            raise RuntimeError(message)
+        if BasePageObject.form_key(LoginPage.password) in page.form():
+            # Login page shown again without an error, e.g. login details are encoded by JavaScript
+            raise HTTPBackendError("Login not accepted")
+        self.loggedin = True
+        LOGGER.info("Successful Login.")
+
+    def _menu_page(self):
+        """Return the menu frame, locating it through the frames of the home page.
+
+        :returns: HTMLPage
+        """
+        if self._menu is None:
+            if not self.loggedin:
+                self.login()
+            # The menu frame is within the home page frameset, or a frameset nested within it
+            pages = [self._request("get", urljoin(self.url, "/"))]
+            for _ in range(2):
+                for page in pages:
+                    if MenuNavigator.frame_menu in page.frames:
+                        self._menu = self._request(
+                            "get", page.frames[MenuNavigator.frame_menu]
+                        )
+                        return self._menu
+                pages = [
+                    self._request("get", url)
+                    for page in pages
+                    for url in page.frames.values()
+                ]
+            raise HTTPBackendError("Menu frame not found")
+        return self._menu
+
+    def open_page(self, menu_item, tab=None):
+        """Load a System Maintenance page.
+
+        :param menu_item: menu link text e.g. "SNMP"
+        :param tab: Link page element for the tab to open
+        :returns: HTMLPage
+        """
+        url = self._menu_page().link(text=menu_item)
+        if url is None:
+            raise HTTPBackendError(f"Menu item not found: {menu_item}")
+        page = self._request("get", url)
+        if tab is not None:
+            # Tabs switched by JavaScript share the page, otherwise the tab is a page of its own
+            tab_url = page.link(element_id=tab.locator[1])
+            if tab_url is not None:
+                page = self._request("get", tab_url)
+        return page
+
+    def read_form(self, menu_item, tab=None):
+        """Read the form fields of a page.
+
+        :param menu_item: menu link text e.g. "SNMP"
+        :param tab: Link page element for the tab to open
+        :returns: StaticForm of {key: field}, as BasePageObject.snapshot_form
+        """
+        return StaticForm(self.open_page(menu_item, tab).form())
+
+    def write(self, menu_item, fields, ok_button, tab=None):
+        """Apply settings to a page with a single form post.
+
+        :param menu_item: menu link text e.g. "SNMP"
+        :param fields: dictionary of {Page Element: value} to apply
+        :param ok_button: page element for the button submitting the form
+        :param tab: Link page element for the tab to open
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        page = self.open_page(menu_item, tab)
+        filled = self.fill_form(page, fields)
+        if filled.disabled or filled.missing:
+            raise HTTPBackendError(
+                f"Fields can't be set without a browser. Disabled: {filled.disabled} Not found: {filled.missing}"
+            )
+        if not filled.applied:
+            LOGGER.info(f"{menu_item} settings unchanged, not submitted")
+            return False
+        form = page.form()
+        submitter = self._submitter(page, ok_button)
+        if any(form[key]["form"] != submitter["form"] for key in filled.applied):
+            raise HTTPBackendError("Fields are not all within the submitted form")
+        result = self._submit(page, ok_button)
+        return MenuNavigator.reboot_radio.locator[1] in {
+            field["name"] for field in result.fields
+        }
+
+    @staticmethod
+    def fill_form(page, fields):
+        """Set field values which differ in a parsed page, as BasePageObject.fill_form does in the browser.
+
+        :param page: HTMLPage
+        :param fields: dictionary of {Page Element: value}
+        :returns: FormFill of the form keys applied, disabled or missing
+        """
+        form = page.form()
+        filled = FormFill([], [], [])
+        for element, value in BasePageObject.changed_fields(form, fields).items():
+            kind = type(element).__name__
+            if kind not in ["InputText", "Checkbox", "InputRadio", "Select"]:
+                raise TypeError(f"fill_form: Unhandled element type: {kind}")
+            if value is None or (kind == "InputRadio" and not value):
+                continue
+            key = BasePageObject.form_key(element)
+            field = form.get(key)
+            if field is None:
+                filled.missing.append(key)
+                continue
+            if not field["enabled"]:
+                filled.disabled.append(key)
+                continue
+            if kind == "Checkbox":
+                field["checked"] = bool(value)
+            elif kind == "InputRadio":
+                for other in page.fields:
+                    if (
+                        other["name"] == field["name"]
+                        and other["form"] == field["form"]
+                    ):
+                        other["checked"] = other is field
+            elif kind == "Select":
+                option = next(
+                    (
+                        option
+                        for option in field["options"]
+                        if option["text"] == str(value)
+                    ),
+                    None,
+                )
+                if option is None:
+                    filled.missing.append(key)
+                    continue
+                field["value"] = option["value"]
+                field["option"] = option["text"]
+            else:
+                field["value"] = str(value)
+            filled.applied.append(key)
+        return filled
+
+    @staticmethod
+    def _submitter(page, button):
+        """Find the field for a submit button.
+
+        :param page: HTMLPage
+        :param button: page element for the button, located by name or class name
+        :returns: field dictionary
+        """
+        by, locator = button.locator
+        for field in page.fields:
+            if field["type"] in UNSUBMITTED_TYPES and field["enabled"]:
+                if (by == By.NAME and field["name"] == locator) or (
+                    by == By.CLASS_NAME and locator in field["class"]
+                ):
+                    if 0 <= field["form"] < len(page.forms):
+                        return field
+        raise HTTPBackendError(f"Submit button not found: {locator}")
+
+    def _submit(self, page, button):
+        """Submit the form containing a button, with the values a browser would send.
+
+        :param page: HTMLPage
+        :param button: page element for the button submitting the form
+        :returns: HTMLPage returned
+        """
+        submitter = self._submitter(page, button)
+        data = []
+        for field in page.fields:
+            if (
+                field["form"] != submitter["form"]
+                or not field["name"]
+                or not field["enabled"]
+                or field["type"] in UNSUBMITTED_TYPES
+            ):
+                continue
+            if field["type"] in ["checkbox", "radio"] and not field["checked"]:
+                continue
+            data.append((field["name"], field["value"]))
+        if submitter["name"]:
+            data.append((submitter["name"], submitter["value"]))
+        form = page.forms[submitter["form"]]
+        url = urljoin(page.url, form["action"]) if form["action"] else page.url
+        if form["method"] == "post":
+            return self._request("post", url, data=data)
+        return self._request("get", url, params=data)
@@ -0,0 +1,154 @@
+"""Draytek Web Admin - Job Journal."""
+
+import logging
+import sqlite3
+from collections import namedtuple
+from contextlib import closing
+from time import time
+
+LOGGER = logging.getLogger("root")
+
+# States a router passes through in a fleet job, in order. A router is finished once done is recorded,
+# routers which failed or were interrupted at any other state are worked on again when the job is resumed.
+STATES = [
+    "pending",
+    "connected",
+    "read",
+    "written",
+    "rebooted",
+    "verified",
+    "done",
+    "failed",
+]
+
+# router: key of the router in the job e.g. 192.168.1.1:443
+# state: one of STATES
+# status: status message e.g. Updated, or error for failed, or None
+# recorded: time the state was reached (seconds since the epoch)
+JournalEntry = namedtuple("JournalEntry", ["router", "state", "status", "recorded"])
+
+
+class JobJournal:
+    """Durable journal of the progress of a fleet job, one entry appended per router state reached.
+
+    Each entry is committed to disk before the next step starts, so a job interrupted by a crash or reboot
+    can be run again and only works on the routers not yet done. Entries are keyed by job, so one file
+    can hold several jobs, e.g. a job per input file. A journal file may be shared by concurrent sessions.
+    """
+
+    def __init__(self, path="draytekwebadmin-journal.sqlite", job="default"):
+        """Open (creating if needed) a job journal.
+
+        :param path: SQLite database file (Default: draytekwebadmin-journal.sqlite in the current directory)
+        :param job: Name of the job, resumed if already in the journal (Default: default)
+        """
+        self.path = str(path)
+        self.job = job
+        with closing(self._connect()) as database, database:
+            database.execute(
+                "CREATE TABLE IF NOT EXISTS journal ("
+                "job TEXT, router TEXT, state TEXT, status TEXT, recorded REAL)"
+            )
+            database.execute(
+                "CREATE INDEX IF NOT EXISTS journal_router ON journal (job, router)"
+            )
+
+    def _connect(self):
+        """Open a connection to the journal database. Connections aren't shared between threads.
+
+        :returns: sqlite3 connection
+        """
+        database = sqlite3.connect(self.path, timeout=30)
+        # Sync each entry to disk as it is committed, so it survives the machine restarting
+        database.execute("PRAGMA synchronous = FULL")
+        return database
+
+    def record(self, router, state, status=None):
+        """Record that a router has reached a state.
+
+        :param router: key of the router in the job
+        :param state: one of STATES
+        :param status: status message, or error if failed (Default: None)
+        """
+        if state not in STATES:
+            raise ValueError(f"Unknown state: {state}")
+        with closing(self._connect()) as database, database:
+            database.execute(
+                "INSERT INTO journal VALUES (?, ?, ?, ?, ?)",
+                (self.job, router, state, status, time()),
+            )
+        LOGGER.debug(f"Journal {self.job}: {router} {state}")
+
+    def start(self, routers):
+        """Start or resume the job, recording routers not yet in the journal as pending.
+
+        :param routers: keys of the routers in the job
+        :returns: list of the keys of the routers which are not done, in the order given
+        """
+        latest = self._latest()
+        with closing(self._connect()) as database, database:
+            database.executemany(
+                "INSERT INTO journal VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.job, router, "pending", None, time())
+                    for router in dict.fromkeys(routers)
+                    if router not in latest
+                ],
+            )
+        unfinished = [
+            router
+            for router in routers
+            if router not in latest or latest[router].state != "done"
+        ]
+        if len(unfinished) < len(routers):
+            LOGGER.info(
+                f"Resuming job {self.job}: {len(routers) - len(unfinished)} routers already done"
+            )
+        return unfinished
+
+    def state(self, router):
+        """Return the latest state recorded for a router.
+
+        :param router: key of the router in the job
+        :returns: JournalEntry, or None if not in the journal
+        """
+        history = self.history(router)
+        return history[-1] if history else None
+
+    def history(self, router):
+        """Return every state recorded for a router, oldest first.
+
+        :param router: key of the router in the job
+        :returns: list of JournalEntry
+        """
+        with closing(self._connect()) as database:
+            rows = database.execute(
+                "SELECT router, state, status, recorded FROM journal "
+                "WHERE job = ? AND router = ? ORDER BY rowid",
+                (self.job, router),
+            ).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def done(self):
+        """Return the routers which are done.
+
+        :returns: dictionary of {router: JournalEntry}
+        """
+        return {
+            router: entry
+            for router, entry in self._latest().items()
+            if entry.state == "done"
+        }
+
+    def _latest(self):
+        """Return the latest state recorded for each router in the job.
+
+        :returns: dictionary of {router: JournalEntry}
+        """
+        with closing(self._connect()) as database:
+            rows = database.execute(
+                "SELECT router, state, status, recorded FROM journal "
+                "WHERE job = ? ORDER BY rowid",
+                (self.job,),
+            ).fetchall()
+        return {row[0]: JournalEntry(*row) for row in rows}
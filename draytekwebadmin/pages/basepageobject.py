@@ -1,10 +1,468 @@
 """Draytek Web Admin - BasePage."""
+from collections import namedtuple
+from copy import copy
+import re
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+from toolium.pageobjects.common_object import CommonObject
 from toolium.pageobjects.page_object import PageObject
 
+from draytekwebadmin.utils import nullcontext
+
+# Read every form field on the current frame in a single WebDriver round trip
+SNAPSHOT_FORM_SCRIPT = """
+return Array.prototype.map.call(document.querySelectorAll("input, select, textarea"), function (field) {
+    return {
+        name: field.name || "",
+        id: field.id || "",
+        type: (field.type || "").toLowerCase(),
+        enabled: !field.matches(":disabled"),
+        value: field.value,
+        checked: !!field.checked,
+        option: (field.tagName === "SELECT" && field.selectedIndex >= 0) ? field.options[field.selectedIndex].text : null
+    };
+});
+"""
+
+# Set many form fields with a single WebDriver round trip, firing the events the page scripts listen for.
+# Checkboxes and radio buttons are clicked (as Selenium would) so their onclick handlers run.
+FILL_FORM_SCRIPT = """
+var report = {applied: [], disabled: [], missing: []};
+function find(key) {
+    if (key.charAt(0) === "#") {
+        return document.getElementById(key.substring(1));
+    }
+    var split = key.indexOf("=");
+    var named = document.getElementsByName(split < 0 ? key : key.substring(0, split));
+    for (var i = 0; i < named.length; i++) {
+        if (split < 0 || named[i].value === key.substring(split + 1)) {
+            return named[i];
+        }
+    }
+    return null;
+}
+function fire(field, type) {
+    field.dispatchEvent(new Event(type, {bubbles: true}));
+}
+arguments[0].forEach(function (item) {
+    var field = find(item.key);
+    if (!field) {
+        report.missing.push(item.key);
+        return;
+    }
+    if (field.matches(":disabled")) {
+        report.disabled.push(item.key);
+        return;
+    }
+    if (item.kind === "checkbox" || item.kind === "radio") {
+        if (field.checked !== item.value) {
+            field.click();
+        }
+    } else if (item.kind === "select") {
+        var index = -1;
+        for (var i = 0; i < field.options.length; i++) {
+            if (field.options[i].text.trim() === item.value) {
+                index = i;
+                break;
+            }
+        }
+        if (index < 0) {
+            report.missing.push(item.key);
+            return;
+        }
+        if (field.selectedIndex !== index) {
+            field.selectedIndex = index;
+            fire(field, "change");
+        }
+    } else if (field.value !== item.value) {
+        field.value = item.value;
+        fire(field, "input");
+        fire(field, "change");
+    }
+    report.applied.push(item.key);
+});
+return report;
+"""
+
+# Find the first of several elements displayed on the current frame, without the driver's implicit wait.
+# Returns its index, or -1 if none of them are displayed.
+PROBE_SCRIPT = """
+function locate(by, value) {
+    switch (by) {
+    case "id":
+        return document.getElementById(value);
+    case "name":
+        return document.getElementsByName(value)[0] || null;
+    case "css selector":
+        return document.querySelector(value);
+    case "xpath":
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    case "link text":
+        return Array.prototype.find.call(document.links, function (link) {
+            return link.textContent.trim() === value;
+        }) || null;
+    }
+    throw new Error("Unsupported locator: " + by);
+}
+function displayed(element) {
+    if (!element) {
+        return false;
+    }
+    var style = window.getComputedStyle(element);
+    var rect = element.getBoundingClientRect();
+    return style.visibility !== "hidden" && rect.width > 0 && rect.height > 0;
+}
+return arguments[0].findIndex(function (locator) {
+    return displayed(locate(locator[0], locator[1]));
+});
+"""
+
+# Mark the document of the current frame, so a new document replacing it can be recognised
+MARK_DOCUMENT_SCRIPT = "document.draytekwebadminStale = true;"
+
+# Check the document of the current frame has loaded, and if arguments[0] is true that it isn't a marked one
+READY_SCRIPT = """
+return document.readyState === "complete" && !(arguments[0] && document.draytekwebadminStale);
+"""
+
+# Form keys (see BasePageObject.form_key) applied, disabled or not found (including select options) by fill_form
+FormFill = namedtuple("FormFill", ["applied", "disabled", "missing"])
+
+
+class NavigationState:
+    """What a browser session is showing, shared by every page object using the session.
+
+    Lets page objects skip navigation and form reads already done by an earlier page object.
+    """
+
+    def __init__(self):
+        """Create a new NavigationState, with nothing known about the browser."""
+        # callable taking a phase and detail, returning a context manager timing it (see TimingRecorder.timer)
+        self.timer = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what the browser is showing, after a submit, a reboot, an error or leaving the page."""
+        self.page = None  # locator of the menu item last opened
+        self.tab = None  # locator of the tab last opened on the page
+        # frame names the driver is switched to, from the top level document
+        self.frames = None
+        self.form = None  # form snapshot of the page (see BasePageObject.read_form)
+        self.changed = False  # True if fields have been changed and not yet submitted
+
+
+def navigation_state(driver_wrapper):
+    """Return the NavigationState of a browser session, creating it if needed.
+
+    :param driver_wrapper: Toolium driver wrapper of the session
+    :returns: NavigationState
+    """
+    state = getattr(driver_wrapper, "navigation_state", None)
+    if not isinstance(state, NavigationState):
+        state = NavigationState()
+        driver_wrapper.navigation_state = state
+    return state
+
 
 class BasePageObject(PageObject):
     """Selenium Page Object Model from Toolium. BasePage class."""
 
+    # Seconds to wait for an element which may legitimately be absent (0: check once, without waiting)
+    probe_timeout = 0
+    # Seconds to wait for an expected state, such as a page loading (None: the explicitly_wait setting)
+    wait_timeout = None
+    # Seconds between checks while waiting
+    poll_frequency = 0.05
+
+    def init_page_elements(self):
+        """Give this page object its own copy of the page elements declared on the class.
+
+        Toolium page elements are class attributes, holding the driver wrapper and cached web element.
+        Copying them stops concurrent sessions using the same page object class from sharing a browser.
+        """
+        for attribute in dir(type(self)):
+            value = getattr(type(self), attribute, None)
+            if attribute != "parent" and isinstance(value, CommonObject):
+                setattr(self, attribute, copy(value))
+
+    def _get_page_elements(self):
+        """Return the page elements owned by this page object instance.
+
+        :returns: list of page elements
+        """
+        return [
+            value
+            for attribute, value in self.__dict__.items()
+            if attribute != "parent" and isinstance(value, CommonObject)
+        ]
+
+    @property
+    def navigation(self):
+        """NavigationState: What the browser is showing, shared by the page objects using this session."""
+        return navigation_state(self.driver_wrapper)
+
+    def timed(self, phase, detail=None):
+        """Time a step with the timer set on the session, if any.
+
+        :param phase: step timed e.g. navigation
+        :param detail: what the step is for e.g. menu item
+        :returns: context manager
+        """
+        timer = self.navigation.timer
+        return timer(phase, detail) if timer else nullcontext()
+
+    def expected_timeout(self):
+        """Return the seconds to wait for an expected state.
+
+        :returns: wait_timeout, or the explicitly_wait setting if not set
+        """
+        if self.wait_timeout is not None:
+            return self.wait_timeout
+        return self.driver_wrapper.config.getfloat(
+            "Driver", "explicitly_wait", fallback=10
+        )
+
+    def wait_for(self, condition, timeout):
+        """Call condition every poll_frequency seconds until it returns a true value or the timeout passes.
+
+        JavaScript errors, such as from a page part way through loading, are retried.
+
+        :param condition: function taking no arguments
+        :param timeout: seconds to wait, 0 to call condition once
+        :returns: value returned by condition, or None if the timeout passed
+        """
+        try:
+            return WebDriverWait(
+                self.driver,
+                timeout,
+                poll_frequency=self.poll_frequency,
+                ignored_exceptions=(JavascriptException,),
+            ).until(lambda driver: condition())
+        except TimeoutException:
+            return None
+
+    def first_displayed(self, elements, timeout):
+        """Wait for one of several elements to be displayed, checking them all with one script.
+
+        :param elements: list of Page Elements located by id, name, css selector, xpath or link text
+        :param timeout: seconds to wait, 0 to check once
+        :returns: the first element displayed, or None if none were displayed before the timeout
+        """
+        locators = [list(element.locator) for element in elements]
+
+        def displayed():
+            index = self.driver.execute_script(PROBE_SCRIPT, locators)
+            return elements[index] if index >= 0 else None
+
+        return self.wait_for(displayed, timeout)
+
+    def is_displayed(self, element, timeout=None):
+        """Check if an element is displayed, without waiting for it to appear unless probe_timeout is set.
+
+        :param element: Page Element
+        :param timeout: seconds to wait (Default: probe_timeout)
+        :returns: True if the element is displayed, False otherwise
+        """
+        if timeout is None:
+            timeout = self.probe_timeout
+        return self.first_displayed([element], timeout) is not None
+
+    def wait_until_displayed(self, elements, timeout=None):
+        """Wait for one of several expected elements to be displayed.
+
+        :param elements: list of Page Elements
+        :param timeout: seconds to wait (Default: expected_timeout)
+        :returns: the first element displayed, or None if none were displayed before the timeout
+        """
+        if timeout is None:
+            timeout = self.expected_timeout()
+        return self.first_displayed(elements, timeout)
+
+    def mark_document(self):
+        """Mark the document of the current frame, before an action which replaces it."""
+        self.driver.execute_script(MARK_DOCUMENT_SCRIPT)
+
+    def wait_until_ready(self, new_document=False, timeout=None):
+        """Wait for the document of the current frame to finish loading.
+
+        :param new_document: True to also wait for a document marked by mark_document to be replaced
+        :param timeout: seconds to wait (Default: expected_timeout)
+        :returns: True if the document loaded, False if the timeout passed
+        """
+        if timeout is None:
+            timeout = self.expected_timeout()
+        return bool(
+            self.wait_for(
+                lambda: self.driver.execute_script(READY_SCRIPT, new_document), timeout
+            )
+        )
+
+    def click_and_wait(self, element, timeout=None):
+        """Click an element which loads a new document in its frame, such as a form submit button, and wait for it.
+
+        :param element: Page Element
+        :param timeout: seconds to wait (Default: expected_timeout)
+        :returns: True if the new document loaded, False if the timeout passed
+        """
+        self.mark_document()
+        element.click()
+        return self.wait_until_ready(new_document=True, timeout=timeout)
+
+    def snapshot_form(self):
+        """Read the name, type, enabled state and value of every form field with one script.
+
+        :returns: dictionary of {key: field}
+        """
+        return self.index_form(self.driver.execute_script(SNAPSHOT_FORM_SCRIPT))
+
+    @staticmethod
+    def index_form(fields):
+        """Key form fields by name, "#id" and, for radio buttons, "name=value".
+
+        Where several fields share a key the first on the page is kept, as find_element would.
+
+        :param fields: list of field dictionaries (name, id, type, enabled, value, checked, option)
+        :returns: dictionary of {key: field}
+        """
+        form = {}
+        for field in fields:
+            keys = [f"#{field['id']}" if field["id"] else None]
+            if field["type"] == "radio":
+                keys.append(f"{field['name']}={field['value']}")
+            elif field["name"]:
+                keys.append(field["name"])
+            for key in keys:
+                if key:
+                    form.setdefault(key, field)
+        return form
+
+    def read_form(self):
+        """Return a snapshot of the page form, taken once until the page is reopened or submitted.
+
+        :returns: dictionary of {key: field}
+        """
+        if self.navigation.form is None:
+            self.navigation.form = self.snapshot_form()
+        return self.navigation.form
+
+    @staticmethod
+    def form_key(element):
+        """Return the snapshot_form key for a page element, based on its locator.
+
+        :param element: Page Element located by name, id or an xpath with @name (and @value for radio buttons)
+        :returns: key (str) or None if the locator is not supported
+        """
+        by, value = element.locator
+        if by == By.NAME:
+            return value
+        if by == By.ID:
+            return f"#{value}"
+        if by == By.XPATH:
+            name = re.search(r"@name='([^']*)'", value)
+            option = re.search(r"@value='([^']*)'", value)
+            if name and option:
+                return f"{name.group(1)}={option.group(1)}"
+            if name:
+                return name.group(1)
+        return None
+
+    @classmethod
+    def form_value(cls, form, element):
+        """Read element value from a form snapshot, as read_element_value would from the page.
+
+        :param form: dictionary returned by snapshot_form
+        :param element: Page Element
+        :returns: element value, or None if the element is disabled or not on the page
+        """
+        field = form.get(cls.form_key(element))
+        if field is None or not field["enabled"]:
+            return None
+        if type(element).__name__ == "InputText":
+            return (field["value"] or "").strip()
+        if (type(element).__name__ == "Checkbox") or (
+            type(element).__name__ == "InputRadio"
+        ):
+            return field["checked"]
+        if type(element).__name__ == "Select":
+            return str(field["option"])
+        raise TypeError(f"form_value: Unhandled element type: {type(element).__name__}")
+
+    @classmethod
+    def changed_fields(cls, form, fields):
+        """Select the fields with a value different to the form snapshot.
+
+        Fields which are disabled or not on the page are kept, so they are reported when filling the form.
+
+        :param form: dictionary returned by snapshot_form
+        :param fields: dictionary of {Page Element: value}
+        :returns: dictionary of {Page Element: value} needing to be changed, in the order given
+        """
+        changed = {}
+        for element, value in fields.items():
+            if value is None:
+                continue
+            current = cls.form_value(form, element)
+            if isinstance(current, bool):
+                same = current == bool(value)
+            else:
+                same = current is not None and current == str(value).strip()
+            if not same:
+                changed[element] = value
+        return changed
+
+    def fill_form(self, fields):
+        """Set many elements with one script, in the order given, as set_element_value would one by one.
+
+        Only fields with a value different to the page are set. Fields with a value of None are left unchanged,
+        as are radio buttons with a False value.
+
+        :param fields: dictionary of {Page Element: value}
+        :returns: FormFill of the form keys applied, disabled or missing
+        """
+        kinds = {
+            "InputText": "text",
+            "Checkbox": "checkbox",
+            "InputRadio": "radio",
+            "Select": "select",
+        }
+        payload = []
+        for element, value in self.changed_fields(self.read_form(), fields).items():
+            kind = kinds.get(type(element).__name__)
+            if kind is None:
+                raise TypeError(
+                    f"fill_form: Unhandled element type: {type(element).__name__}"
+                )
+            key = self.form_key(element)
+            if key is None:
+                raise TypeError(
+                    f"fill_form: Unhandled element locator: {element.locator}"
+                )
+            if value is None or (kind == "radio" and not value):
+                continue
+            payload.append(
+                {
+                    "key": key,
+                    "kind": kind,
+                    "value": (
+                        bool(value) if kind in ("checkbox", "radio") else str(value)
+                    ),
+                }
+            )
+        if not payload:
+            return FormFill([], [], [])
+        report = self.driver.execute_script(FILL_FORM_SCRIPT, payload)
+        self.navigation.form = None
+        if report["applied"]:
+            self.navigation.changed = True
+        return FormFill(report["applied"], report["disabled"], report["missing"])
+
+    @property
+    def changed(self):
+        """bool: True if fill_form has changed the page since it was opened or submitted."""
+        return self.navigation.changed
+
     @staticmethod
     def read_element_value(element):
         """Read element value from various properties based on element type.
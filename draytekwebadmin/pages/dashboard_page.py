@@ -9,6 +9,32 @@ from toolium.pageelements import Text
 from draytekwebadmin.routerinfo import RouterInfo
 from draytekwebadmin.pages.basepageobject import BasePageObject
 
+# Read JavaScript variables from the header frame, null for any which aren't defined
+HEADER_SCRIPT = """
+var values = {};
+arguments[0].forEach(function (name) {
+    values[name] = (typeof window[name] === "undefined" || window[name] === null) ? null : String(window[name]);
+});
+return values;
+"""
+
+# Read the displayed text of dashboard cells by CSS selector, and the label and value of every table row
+DASHBOARD_SCRIPT = """
+function text(element) {
+    return (element && element.getClientRects().length) ? element.textContent.trim() : null;
+}
+var selectors = arguments[0], cells = {}, rows = [];
+Object.keys(selectors).forEach(function (name) {
+    cells[name] = text(document.querySelector(selectors[name]));
+});
+Array.prototype.forEach.call(document.querySelectorAll("tr"), function (row) {
+    if (row.cells.length >= 2) {
+        rows.push([text(row.cells[0]), text(row.cells[1])]);
+    }
+});
+return {cells: cells, rows: rows};
+"""
+
 
 class DashboardPage(BasePageObject):
     """Selenium Page Object Model: DashboardPage."""
@@ -36,53 +62,77 @@ class DashboardPage(BasePageObject):
         "#blksysinfo > table:nth-child(1) > tbody:nth-child(1) > tr:nth-child(5) > td:nth-child(3)",
     )
 
+    # JavaScript variables in the header frame, replaced by the dashboard table values where displayed
+    header_variables = {
+        "router_name": "sSysName",
+        "firmware": "sSysVer",
+        "model": "sFwNameLeading",
+    }
+    # Labels of dashboard table rows holding further details, matched ignoring case and a trailing colon
+    row_labels = {
+        "uptime": ["system up time", "system uptime", "up time", "uptime"],
+        "serial": ["serial number", "serial no.", "serial no"],
+        "lan_mac": ["lan mac address", "mac address"],
+        "lan_ip": ["lan ip address", "lan ipv4 address", "lan1 ip address"],
+        "wan_ip": ["wan ip address", "wan ipv4 address", "wan1 ip address"],
+    }
+
     def routerinfo(self):
-        """Get the router info via the table on the dashboard or try and use the Javascript variables in the header.
+        """Get the router info from the table on the dashboard and the Javascript variables in the header.
+
+        Each frame is read with a single script.
 
         :returns: RouterInfo object
         """
-        router = {
-            "router_name": None,
-            "firmware": None,
-            "model": None,
-            "dsl_version": None,
-        }
-        # try:
-        # Initial read via JavaScript Header variables
+        self.navigation.frames = None
         self.driver.switch_to.default_content()
         self.driver.switch_to.frame(self.frame_header)
         try:
-            router["router_name"] = self.driver.execute_script("return sSysName")
-        except Exception:
-            pass
-        try:
-            router["firmware"] = self.driver.execute_script("return sSysVer")
+            header = self.driver.execute_script(
+                HEADER_SCRIPT, list(self.header_variables.values())
+            )
         except Exception:
-            pass
-        try:
-            router["model"] = self.driver.execute_script("return sFwNameLeading")
-        except Exception:
-            pass
-        # except NoSuchElementException:
-        #     pass
+            header = {}
 
-        # Read the values from the dashboard table and replace initial JavaScript values
         self.driver.switch_to.default_content()
         self.driver.switch_to.frame(self.frame_main)
-        # TODO (#4418): Need to replace try/catch around each call with a different approach.
-        #       Needs to be potentially implemented over all files.
-        if self.model_name.is_visible():
-            router["model"] = self.read_element_value(self.model_name)
-        if self.router_name.is_visible():
-            router["router_name"] = self.read_element_value(self.router_name)
-        if self.fw_version.is_visible():
-            router["firmware"] = self.read_element_value(self.fw_version)
-        if self.dsl_version.is_visible():
-            router["dsl_version"] = self.read_element_value(self.dsl_version)
-
-        return RouterInfo(
-            model=router["model"],
-            router_name=router["router_name"],
-            firmware=router["firmware"],
-            dsl_version=router["dsl_version"],
+        self.wait_until_ready()
+        dashboard = self.driver.execute_script(
+            DASHBOARD_SCRIPT,
+            {
+                name: getattr(self, name).locator[1]
+                for name in ["model_name", "router_name", "fw_version", "dsl_version"]
+            },
         )
+        self.navigation.frames = (self.frame_main,)
+        return self.routerinfo_from_dashboard(header, dashboard)
+
+    @classmethod
+    def routerinfo_from_dashboard(cls, header, dashboard):
+        """Build RouterInfo from the values read by the header and dashboard scripts.
+
+        :param header: dictionary of {JavaScript variable name: value or None}
+        :param dashboard: dictionary of cells {element name: text or None} and rows [[label, value], ...]
+        :returns: RouterInfo object
+        """
+        router = {
+            name: header.get(variable) or None
+            for name, variable in cls.header_variables.items()
+        }
+        cells = dashboard.get("cells", {})
+        for name, element in [
+            ("model", "model_name"),
+            ("router_name", "router_name"),
+            ("firmware", "fw_version"),
+            ("dsl_version", "dsl_version"),
+        ]:
+            if cells.get(element):
+                router[name] = cells[element]
+        rows = {}
+        for label, value in dashboard.get("rows", []):
+            rows.setdefault((label or "").strip().rstrip(":").strip().lower(), value)
+        for name, labels in cls.row_labels.items():
+            router[name] = next(
+                (rows[label] for label in labels if rows.get(label)), None
+            )
+        return RouterInfo(**router)
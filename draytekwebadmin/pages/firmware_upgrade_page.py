@@ -1,5 +1,8 @@
 """Draytek Web Admin - Firmware Upgrade Page."""
 
+import re
+from time import monotonic
+
 from selenium.webdriver.common.by import By
 from toolium.pageelements import Button, Text
 
@@ -35,18 +38,30 @@ class FirmwareUpgradePage(BasePageObject):
         menu = MenuNavigator(self.driver_wrapper)
         menu.open_sysmain_firmware_upgrade()
 
-    def new_firmware_preview(self, file: Firmware):
-        """Preview firmware upgrade information for supplied firmware file.
+    def choose_firmware(self, file: Firmware):
+        """Select the firmware file, unless the page already holds the same file from an earlier upload.
 
-        :param file: Full file name and path to router firmware
-        :eturns Firmware object - Firmware object populated with settings retrieved from previewing the firmware
+        :param file: Firmware object containing full file path for new firmware
+        :returns: True if the file was selected, False if the page already held it
         """
-        if file.filepath is None:
-            raise ValueError("Firmware Preview requires a path to the a firmware file")
+        file_input = self.choose_firmware_button.web_element
+        # Browsers only give the name of a selected file e.g. C:\fakepath\v2860_3962.all
+        selected = re.split(r"[\\/]", file_input.get_attribute("value") or "")[-1]
+        if selected == file.filepath.name:
+            return False
+        if selected:
+            # A different file is held from an earlier preview on this page
+            file_input.clear()
+        file_input.send_keys(str(file.filepath))
+        return True
 
-        self.open_page()
+    def preview_selected_firmware(self, file: Firmware):
+        """Preview the selected firmware file, recording the upload transfer.
 
-        self.choose_firmware_button.web_element.send_keys(str(file.filepath))
+        :param file: Firmware object containing full file path for new firmware
+        :returns: Firmware object populated with settings retrieved from previewing the firmware
+        """
+        started = monotonic()
         self.preview_button.click()
         preview_firmware = Firmware(
             filepath=str(file.filepath),
@@ -56,8 +71,39 @@ class FirmwareUpgradePage(BasePageObject):
                 self.preview_current_modem_version
             ),
             modem_firmware_target=self.read_element_value(self.preview_modem_version),
+            transfer_bytes=file.size,
+            transfer_seconds=monotonic() - started,
         )
         self.preview_close_button.click()
+        return preview_firmware
+
+    def install_selected_firmware(self):
+        """Install the selected firmware file and restart the router.
+
+        :returns: seconds taken to upload the firmware, until the router offered to restart
+        """
+        started = monotonic()
+        self.upgrade_button.click()
+        self.driver.switch_to.alert.accept()
+        self.post_upgrade_restart_button.wait_until_visible()
+        transfer_seconds = monotonic() - started
+        self.post_upgrade_restart_button.click()
+        self.driver.switch_to.alert.accept()
+        self.navigation.invalidate()
+        return transfer_seconds
+
+    def new_firmware_preview(self, file: Firmware):
+        """Preview firmware upgrade information for supplied firmware file.
+
+        :param file: Full file name and path to router firmware
+        :eturns Firmware object - Firmware object populated with settings retrieved from previewing the firmware
+        """
+        if file.filepath is None:
+            raise ValueError("Firmware Preview requires a path to the a firmware file")
+
+        self.open_page()
+        self.choose_firmware(file)
+        preview_firmware = self.preview_selected_firmware(file)
 
         # TODO (#4412): Handle incompatible firmware provided to preview. Raise exception?
 
@@ -70,10 +116,30 @@ class FirmwareUpgradePage(BasePageObject):
         :returns success - True if upgrade successful
         """
         self.open_page()
-        self.choose_firmware_button.web_element.send_keys(str(file.filepath))
-        self.upgrade_button.click()
-        self.driver.switch_to.alert.accept()
-        self.post_upgrade_restart_button.click()
-        self.driver.switch_to.alert.accept()
+        self.choose_firmware(file)
+        self.install_selected_firmware()
         # TODO (#4413): Handle firmware install failures and return false or raise exceptions?
         return True
+
+    def new_firmware_preview_install(self, file: Firmware, approve):
+        """Preview firmware, then install it from the same page if approved.
+
+        The page is not reopened between preview and install, and the file is only selected again
+        if the router cleared it after the preview.
+
+        :param file: Firmware object containing full file path for new firmware
+        :param approve: function taking the previewed Firmware object, returning True to install it
+        :returns: (Firmware object populated from the preview, with transfer totals, True if installed)
+        """
+        if file.filepath is None:
+            raise ValueError("Firmware Preview requires a path to the a firmware file")
+
+        self.open_page()
+        self.choose_firmware(file)
+        preview_firmware = self.preview_selected_firmware(file)
+        if not approve(preview_firmware):
+            return preview_firmware, False
+        self.choose_firmware(file)
+        preview_firmware.transfer_bytes += file.size
+        preview_firmware.transfer_seconds += self.install_selected_firmware()
+        return preview_firmware, True
@@ -1,6 +1,6 @@
 """Draytek Web Admin - Login Page."""
 from selenium.webdriver.common.by import By
-from toolium.pageelements import InputText, Button, Text
+from toolium.pageelements import InputText, Button, PageElement, Text
 from draytekwebadmin.pages.basepageobject import BasePageObject
 
 
@@ -12,6 +12,8 @@ class LoginPage(BasePageObject):
     password = InputText(By.NAME, "sSysPass", wait=True)
     login_button = Button(By.NAME, "btnOk", wait=True)
     login_error_message = Text(By.ID, "errmsg")
+    # After a successful login the page is replaced by a frameset, including the menu
+    menu_frame = PageElement(By.NAME, "menu")
 
     def login(self, username, passsword):
         """Submit login details to Web Admin login page.
@@ -24,20 +26,31 @@ class LoginPage(BasePageObject):
         self.login_button.click()
 
     def login_error(self):
-        """Check for presence of login error text.
+        """Wait for the login to be accepted (the menu is displayed) or rejected (error text is displayed).
 
-        :returns: True if error displayed, False otherwise
+        :returns: True if error displayed, or neither was displayed within the wait timeout. False otherwise
         """
-        if self.login_error_message.is_visible():
-            return True
-        return False
+        return (
+            self.wait_until_displayed([self.menu_frame, self.login_error_message])
+            is not self.menu_frame
+        )
+
+    def logged_in(self):
+        """Wait for the page to show either the menu (logged in) or the login form (not logged in).
+
+        :returns: True if the menu is displayed, False otherwise
+        """
+        return (
+            self.wait_until_displayed([self.menu_frame, self.username])
+            is self.menu_frame
+        )
 
     def error_message(self):
         """Return error message displayed on login page.
 
         :returns: Error message string
         """
-        if self.login_error_message.is_visible():
+        if self.is_displayed(self.login_error_message):
             message = self.read_element_value(self.login_error_message)
         else:
             message = "No Error message returned - Login Failed"
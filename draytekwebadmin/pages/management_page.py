@@ -22,6 +22,9 @@ from draytekwebadmin.pages.basepageobject import BasePageObject
 class ManagementPage(BasePageObject):
     """Selenium Page Object Model: ManagementPage."""
 
+    # System Maintenance menu item (link text) for this page
+    menu_item = "Management"
+
     # Page Elements
     ipv4_management_setup_tab = Link(By.ID, "tab1")
     ipv6_management_setup_tab = Link(By.ID, "tab2")
@@ -156,9 +159,27 @@ class ManagementPage(BasePageObject):
     subnet_lan_ip_routed_index = InputText(By.NAME, "iMngObjidxsub")
 
     def open_page(self, tab=None):
-        """Navigate menus to open SNMP configuration page."""
+        """Navigate menus to open Management configuration page.
+
+        Navigation is skipped if the browser is already showing the page, only the tab is changed (if needed).
+
+        :param tab: tab to open (Default: IPv4 Management Setup)
+        """
         menu = MenuNavigator(self.driver_wrapper)
-        menu.open_sysmain_management(tab)
+        menu.open_sysmain_management(tab or self.ipv4_management_setup_tab)
+
+    def submit(self):
+        """Click OK to apply every setting populated on the page, unless none were changed.
+
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        if not self.changed:
+            # Nothing differs from the current settings, so there is nothing to apply
+            return False
+        # Wait for the response, so the reboot prompt isn't looked for on the page being replaced
+        self.click_and_wait(self.ok_button)
+        self.navigation.invalidate()
+        return self.check_reboot()
 
     def check_reboot(self):
         """Check if reboot page is displayed, if so set flag to indicate a reboot is required.
@@ -174,25 +195,51 @@ class ManagementPage(BasePageObject):
 
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.management_settings_from_form(self.read_form())
+
+    @classmethod
+    def management_settings_from_form(cls, form):
+        """Build the Management settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: Management object
+        """
         return Management(
-            router_name=self.read_element_value(self.router_name),
-            disable_auto_logout=self.read_element_value(self.disable_auto_logout),
-            enable_validation_code=self.read_element_value(self.enable_validation_code),
+            router_name=cls.form_value(form, cls.router_name),
+            disable_auto_logout=cls.form_value(form, cls.disable_auto_logout),
+            enable_validation_code=cls.form_value(form, cls.enable_validation_code),
         )
 
-    def write_management_settings(self, settings: Management):
-        """Populate the Management setting.
+    def fill_management_settings(self, settings: Management):
+        """Populate the Management setting, without submitting the page.
 
         :param settings: Management object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.router_name, settings.router_name)
-        self.set_element_value(self.disable_auto_logout, settings.disable_auto_logout)
-        self.set_element_value(
-            self.enable_validation_code, settings.enable_validation_code
-        )
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.management_settings_fields(settings))
+
+    @classmethod
+    def management_settings_fields(cls, settings: Management):
+        """Map the Management settings onto the page elements.
+
+        :param settings: Management object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.router_name: settings.router_name,
+            cls.disable_auto_logout: settings.disable_auto_logout,
+            cls.enable_validation_code: settings.enable_validation_code,
+        }
+
+    def write_management_settings(self, settings: Management):
+        """Populate and apply the Management setting.
+
+        :param settings: Management object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_management_settings(settings)
+        return self.submit()
 
     def read_internet_access_control_settings(self):
         """Return the current InternetAccessControl settings.
@@ -200,45 +247,69 @@ class ManagementPage(BasePageObject):
         :returns: InternetAccessControl object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.internet_access_control_settings_from_form(self.read_form())
+
+    @classmethod
+    def internet_access_control_settings_from_form(cls, form):
+        """Build the InternetAccessControl settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: InternetAccessControl object
+        """
         return InternetAccessControl(
-            internet_management=self.read_element_value(self.enable_internet_access),
-            domain_name_allowed=self.read_element_value(self.domain_name_allowed),
-            ftp_server=self.read_element_value(self.ftp),
-            http_server=self.read_element_value(self.http),
-            enforce_https_access=self.read_element_value(self.enforce_https_access),
-            https_server=self.read_element_value(self.https),
-            telnet_server=self.read_element_value(self.telnet),
-            tr069_server=self.read_element_value(self.tr069),
-            ssh_server=self.read_element_value(self.ssh),
-            snmp_server=self.read_element_value(self.snmp),
-            disable_ping_from_internet=self.read_element_value(
-                self.disable_ping_from_internet
+            internet_management=cls.form_value(form, cls.enable_internet_access),
+            domain_name_allowed=cls.form_value(form, cls.domain_name_allowed),
+            ftp_server=cls.form_value(form, cls.ftp),
+            http_server=cls.form_value(form, cls.http),
+            enforce_https_access=cls.form_value(form, cls.enforce_https_access),
+            https_server=cls.form_value(form, cls.https),
+            telnet_server=cls.form_value(form, cls.telnet),
+            tr069_server=cls.form_value(form, cls.tr069),
+            ssh_server=cls.form_value(form, cls.ssh),
+            snmp_server=cls.form_value(form, cls.snmp),
+            disable_ping_from_internet=cls.form_value(
+                form, cls.disable_ping_from_internet
             ),
         )
 
-    def write_internet_access_control_settings(self, settings: InternetAccessControl):
-        """Populate the InternetAccessControl setting.
+    def fill_internet_access_control_settings(self, settings: InternetAccessControl):
+        """Populate the InternetAccessControl setting, without submitting the page.
 
         :param settings: InternetAccessControl object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(
-            self.enable_internet_access, settings.internet_management
-        )
-        self.set_element_value(self.domain_name_allowed, settings.domain_name_allowed)
-        self.set_element_value(self.ftp, settings.ftp_server)
-        self.set_element_value(self.http, settings.http_server)
-        self.set_element_value(self.enforce_https_access, settings.enforce_https_access)
-        self.set_element_value(self.https, settings.https_server)
-        self.set_element_value(self.telnet, settings.telnet_server)
-        self.set_element_value(self.tr069, settings.tr069_server)
-        self.set_element_value(self.ssh, settings.ssh_server)
-        self.set_element_value(self.snmp, settings.snmp_server)
-        self.set_element_value(
-            self.disable_ping_from_internet, settings.disable_ping_from_internet
-        )
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.internet_access_control_settings_fields(settings))
+
+    @classmethod
+    def internet_access_control_settings_fields(cls, settings: InternetAccessControl):
+        """Map the InternetAccessControl settings onto the page elements.
+
+        :param settings: InternetAccessControl object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.enable_internet_access: settings.internet_management,
+            cls.domain_name_allowed: settings.domain_name_allowed,
+            cls.ftp: settings.ftp_server,
+            cls.http: settings.http_server,
+            cls.enforce_https_access: settings.enforce_https_access,
+            cls.https: settings.https_server,
+            cls.telnet: settings.telnet_server,
+            cls.tr069: settings.tr069_server,
+            cls.ssh: settings.ssh_server,
+            cls.snmp: settings.snmp_server,
+            cls.disable_ping_from_internet: settings.disable_ping_from_internet,
+        }
+
+    def write_internet_access_control_settings(self, settings: InternetAccessControl):
+        """Populate and apply the InternetAccessControl setting.
+
+        :param settings: InternetAccessControl object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_internet_access_control_settings(settings)
+        return self.submit()
 
     def read_access_list_settings(self):
         """Return the current AccessList settings.
@@ -246,37 +317,65 @@ class ManagementPage(BasePageObject):
         :returns: AccessList object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.access_list_settings_from_form(self.read_form())
+
+    @classmethod
+    def access_list_settings_from_form(cls, form):
+        """Build the AccessList settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: AccessList object
+        """
         return AccessList(
-            list_1_ip_object_index=self.read_element_value(self.access_index_1),
-            list_2_ip_object_index=self.read_element_value(self.access_index_2),
-            list_3_ip_object_index=self.read_element_value(self.access_index_3),
-            list_4_ip_object_index=self.read_element_value(self.access_index_4),
-            list_5_ip_object_index=self.read_element_value(self.access_index_5),
-            list_6_ip_object_index=self.read_element_value(self.access_index_6),
-            list_7_ip_object_index=self.read_element_value(self.access_index_7),
-            list_8_ip_object_index=self.read_element_value(self.access_index_8),
-            list_9_ip_object_index=self.read_element_value(self.access_index_9),
-            list_10_ip_object_index=self.read_element_value(self.access_index_10),
+            list_1_ip_object_index=cls.form_value(form, cls.access_index_1),
+            list_2_ip_object_index=cls.form_value(form, cls.access_index_2),
+            list_3_ip_object_index=cls.form_value(form, cls.access_index_3),
+            list_4_ip_object_index=cls.form_value(form, cls.access_index_4),
+            list_5_ip_object_index=cls.form_value(form, cls.access_index_5),
+            list_6_ip_object_index=cls.form_value(form, cls.access_index_6),
+            list_7_ip_object_index=cls.form_value(form, cls.access_index_7),
+            list_8_ip_object_index=cls.form_value(form, cls.access_index_8),
+            list_9_ip_object_index=cls.form_value(form, cls.access_index_9),
+            list_10_ip_object_index=cls.form_value(form, cls.access_index_10),
         )
 
-    def write_access_list_settings(self, settings: AccessList):
-        """Populate the AccessList setting.
+    def fill_access_list_settings(self, settings: AccessList):
+        """Populate the AccessList setting, without submitting the page.
 
         :param settings: AccessList object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.access_index_1, settings.list_1_ip_object_index)
-        self.set_element_value(self.access_index_2, settings.list_2_ip_object_index)
-        self.set_element_value(self.access_index_3, settings.list_3_ip_object_index)
-        self.set_element_value(self.access_index_4, settings.list_4_ip_object_index)
-        self.set_element_value(self.access_index_5, settings.list_5_ip_object_index)
-        self.set_element_value(self.access_index_6, settings.list_6_ip_object_index)
-        self.set_element_value(self.access_index_7, settings.list_7_ip_object_index)
-        self.set_element_value(self.access_index_8, settings.list_8_ip_object_index)
-        self.set_element_value(self.access_index_9, settings.list_9_ip_object_index)
-        self.set_element_value(self.access_index_10, settings.list_10_ip_object_index)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.access_list_settings_fields(settings))
+
+    @classmethod
+    def access_list_settings_fields(cls, settings: AccessList):
+        """Map the AccessList settings onto the page elements.
+
+        :param settings: AccessList object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.access_index_1: settings.list_1_ip_object_index,
+            cls.access_index_2: settings.list_2_ip_object_index,
+            cls.access_index_3: settings.list_3_ip_object_index,
+            cls.access_index_4: settings.list_4_ip_object_index,
+            cls.access_index_5: settings.list_5_ip_object_index,
+            cls.access_index_6: settings.list_6_ip_object_index,
+            cls.access_index_7: settings.list_7_ip_object_index,
+            cls.access_index_8: settings.list_8_ip_object_index,
+            cls.access_index_9: settings.list_9_ip_object_index,
+            cls.access_index_10: settings.list_10_ip_object_index,
+        }
+
+    def write_access_list_settings(self, settings: AccessList):
+        """Populate and apply the AccessList setting.
+
+        :param settings: AccessList object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_access_list_settings(settings)
+        return self.submit()
 
     def read_management_port_settings(self):
         """Return the current ManagementPort settings.
@@ -284,36 +383,64 @@ class ManagementPage(BasePageObject):
         :returns: ManagementPort object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.management_port_settings_from_form(self.read_form())
+
+    @classmethod
+    def management_port_settings_from_form(cls, form):
+        """Build the ManagementPort settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: ManagementPort object
+        """
         return ManagementPort(
-            user_defined_ports=self.read_element_value(self.user_defined_ports_radio),
-            telnet_port=self.read_element_value(self.telnet_port),
-            http_port=self.read_element_value(self.http_port),
-            https_port=self.read_element_value(self.https_port),
-            ftp_port=self.read_element_value(self.ftp_port),
-            tr069_port=self.read_element_value(self.tr069_port),
-            ssh_port=self.read_element_value(self.ssh_port),
+            user_defined_ports=cls.form_value(form, cls.user_defined_ports_radio),
+            telnet_port=cls.form_value(form, cls.telnet_port),
+            http_port=cls.form_value(form, cls.http_port),
+            https_port=cls.form_value(form, cls.https_port),
+            ftp_port=cls.form_value(form, cls.ftp_port),
+            tr069_port=cls.form_value(form, cls.tr069_port),
+            ssh_port=cls.form_value(form, cls.ssh_port),
         )
 
-    def write_management_port_settings(self, settings: ManagementPort):
-        """Populate the ManagementPort setting.
+    def fill_management_port_settings(self, settings: ManagementPort):
+        """Populate the ManagementPort setting, without submitting the page.
 
         :param settings: ManagementPort object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.fill_form(self.management_port_settings_fields(settings))
+
+    @classmethod
+    def management_port_settings_fields(cls, settings: ManagementPort):
+        """Map the ManagementPort settings onto the page elements.
+
+        :param settings: ManagementPort object
+        :returns: dictionary of {Page Element: value}
+        """
+        ports = {
+            cls.telnet_port: settings.telnet_port,
+            cls.http_port: settings.http_port,
+            cls.https_port: settings.https_port,
+            cls.ftp_port: settings.ftp_port,
+            cls.tr069_port: settings.tr069_port,
+            cls.ssh_port: settings.ssh_port,
+        }
         if settings.user_defined_ports:
-            self.set_element_value(
-                self.user_defined_ports_radio, settings.user_defined_ports
-            )
-            self.set_element_value(self.telnet_port, settings.telnet_port)
-            self.set_element_value(self.http_port, settings.http_port)
-            self.set_element_value(self.https_port, settings.https_port)
-            self.set_element_value(self.ftp_port, settings.ftp_port)
-            self.set_element_value(self.tr069_port, settings.tr069_port)
-            self.set_element_value(self.ssh_port, settings.ssh_port)
-        else:
-            self.set_element_value(self.default_ports_radio, True)
-        self.ok_button.click()
-        return self.check_reboot()
+            return {cls.user_defined_ports_radio: True, **ports}
+        if settings.user_defined_ports is False:
+            return {cls.default_ports_radio: True}
+        # Port selection left as is
+        return ports
+
+    def write_management_port_settings(self, settings: ManagementPort):
+        """Populate and apply the ManagementPort setting.
+
+        :param settings: ManagementPort object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_management_port_settings(settings)
+        return self.submit()
 
     def read_brute_force_protection_settings(self):
         """Return the current BruteForceProtection settings.
@@ -321,35 +448,63 @@ class ManagementPage(BasePageObject):
         :returns: BruteForceProtection object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.brute_force_protection_settings_from_form(self.read_form())
+
+    @classmethod
+    def brute_force_protection_settings_from_form(cls, form):
+        """Build the BruteForceProtection settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: BruteForceProtection object
+        """
         return BruteForceProtection(
-            enable=self.read_element_value(self.bf_enable),
-            ftp_server=self.read_element_value(self.bf_ftp),
-            http_server=self.read_element_value(self.bf_http),
-            https_server=self.read_element_value(self.bf_https),
-            telnet_server=self.read_element_value(self.bf_telnet),
-            tr069_server=self.read_element_value(self.bf_tr069),
-            ssh_server=self.read_element_value(self.bf_ssh),
-            max_login_failures=self.read_element_value(self.bf_max_login_failures),
-            penalty_period=self.read_element_value(self.bf_penality_period),
+            enable=cls.form_value(form, cls.bf_enable),
+            ftp_server=cls.form_value(form, cls.bf_ftp),
+            http_server=cls.form_value(form, cls.bf_http),
+            https_server=cls.form_value(form, cls.bf_https),
+            telnet_server=cls.form_value(form, cls.bf_telnet),
+            tr069_server=cls.form_value(form, cls.bf_tr069),
+            ssh_server=cls.form_value(form, cls.bf_ssh),
+            max_login_failures=cls.form_value(form, cls.bf_max_login_failures),
+            penalty_period=cls.form_value(form, cls.bf_penality_period),
         )
 
-    def write_brute_force_protection_settings(self, settings: BruteForceProtection):
-        """Populate the BruteForceProtection setting.
+    def fill_brute_force_protection_settings(self, settings: BruteForceProtection):
+        """Populate the BruteForceProtection setting, without submitting the page.
 
         :param settings: BruteForceProtection object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.bf_enable, settings.enable)
-        self.set_element_value(self.bf_ftp, settings.ftp_server)
-        self.set_element_value(self.bf_http, settings.http_server)
-        self.set_element_value(self.bf_https, settings.https_server)
-        self.set_element_value(self.bf_telnet, settings.telnet_server)
-        self.set_element_value(self.bf_tr069, settings.tr069_server)
-        self.set_element_value(self.bf_ssh, settings.ssh_server)
-        self.set_element_value(self.bf_max_login_failures, settings.max_login_failures)
-        self.set_element_value(self.bf_penality_period, settings.penalty_period)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.brute_force_protection_settings_fields(settings))
+
+    @classmethod
+    def brute_force_protection_settings_fields(cls, settings: BruteForceProtection):
+        """Map the BruteForceProtection settings onto the page elements.
+
+        :param settings: BruteForceProtection object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.bf_enable: settings.enable,
+            cls.bf_ftp: settings.ftp_server,
+            cls.bf_http: settings.http_server,
+            cls.bf_https: settings.https_server,
+            cls.bf_telnet: settings.telnet_server,
+            cls.bf_tr069: settings.tr069_server,
+            cls.bf_ssh: settings.ssh_server,
+            cls.bf_max_login_failures: settings.max_login_failures,
+            cls.bf_penality_period: settings.penalty_period,
+        }
+
+    def write_brute_force_protection_settings(self, settings: BruteForceProtection):
+        """Populate and apply the BruteForceProtection setting.
+
+        :param settings: BruteForceProtection object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_brute_force_protection_settings(settings)
+        return self.submit()
 
     def read_encryption_settings(self):
         """Return the current Encryption settings.
@@ -357,25 +512,53 @@ class ManagementPage(BasePageObject):
         :returns: Encryption object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.encryption_settings_from_form(self.read_form())
+
+    @classmethod
+    def encryption_settings_from_form(cls, form):
+        """Build the Encryption settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: Encryption object
+        """
         return Encryption(
-            tls_1_2=self.read_element_value(self.enc_tls12),
-            tls_1_1=self.read_element_value(self.enc_tls11),
-            tls_1_0=self.read_element_value(self.enc_tls10),
-            ssl_3_0=self.read_element_value(self.enc_ssl30),
+            tls_1_2=cls.form_value(form, cls.enc_tls12),
+            tls_1_1=cls.form_value(form, cls.enc_tls11),
+            tls_1_0=cls.form_value(form, cls.enc_tls10),
+            ssl_3_0=cls.form_value(form, cls.enc_ssl30),
         )
 
-    def write_encryption_settings(self, settings: Encryption):
-        """Populate the Encryption setting.
+    def fill_encryption_settings(self, settings: Encryption):
+        """Populate the Encryption setting, without submitting the page.
 
         :param settings: Encryption object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.enc_tls12, settings.tls_1_2)
-        self.set_element_value(self.enc_tls11, settings.tls_1_1)
-        self.set_element_value(self.enc_tls10, settings.tls_1_0)
-        self.set_element_value(self.enc_ssl30, settings.ssl_3_0)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.encryption_settings_fields(settings))
+
+    @classmethod
+    def encryption_settings_fields(cls, settings: Encryption):
+        """Map the Encryption settings onto the page elements.
+
+        :param settings: Encryption object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.enc_tls12: settings.tls_1_2,
+            cls.enc_tls11: settings.tls_1_1,
+            cls.enc_tls10: settings.tls_1_0,
+            cls.enc_ssl30: settings.ssl_3_0,
+        }
+
+    def write_encryption_settings(self, settings: Encryption):
+        """Populate and apply the Encryption setting.
+
+        :param settings: Encryption object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_encryption_settings(settings)
+        return self.submit()
 
     def read_cvm_access_control_settings(self):
         """Return the current CVM_AccessControl settings.
@@ -383,25 +566,53 @@ class ManagementPage(BasePageObject):
         :returns: CVM_AccessControl object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.cvm_access_control_settings_from_form(self.read_form())
+
+    @classmethod
+    def cvm_access_control_settings_from_form(cls, form):
+        """Build the CVM_AccessControl settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: CVM_AccessControl object
+        """
         return CVM_AccessControl(
-            enable=self.read_element_value(self.cvm_port_enable),
-            ssl_enable=self.read_element_value(self.cvm_ssl_port_enable),
-            port=self.read_element_value(self.cvm_port),
-            ssl_port=self.read_element_value(self.cvm_ssl_port),
+            enable=cls.form_value(form, cls.cvm_port_enable),
+            ssl_enable=cls.form_value(form, cls.cvm_ssl_port_enable),
+            port=cls.form_value(form, cls.cvm_port),
+            ssl_port=cls.form_value(form, cls.cvm_ssl_port),
         )
 
-    def write_cvm_access_control_settings(self, settings: CVM_AccessControl):
-        """Populate the CVM_AccessControl setting.
+    def fill_cvm_access_control_settings(self, settings: CVM_AccessControl):
+        """Populate the CVM_AccessControl setting, without submitting the page.
 
         :param settings: CVM_AccessControl object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.cvm_port_enable, settings.enable)
-        self.set_element_value(self.cvm_ssl_port_enable, settings.ssl_enable)
-        self.set_element_value(self.cvm_port, settings.port)
-        self.set_element_value(self.cvm_ssl_port, settings.ssl_port)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.cvm_access_control_settings_fields(settings))
+
+    @classmethod
+    def cvm_access_control_settings_fields(cls, settings: CVM_AccessControl):
+        """Map the CVM_AccessControl settings onto the page elements.
+
+        :param settings: CVM_AccessControl object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.cvm_port_enable: settings.enable,
+            cls.cvm_ssl_port_enable: settings.ssl_enable,
+            cls.cvm_port: settings.port,
+            cls.cvm_ssl_port: settings.ssl_port,
+        }
+
+    def write_cvm_access_control_settings(self, settings: CVM_AccessControl):
+        """Populate and apply the CVM_AccessControl setting.
+
+        :param settings: CVM_AccessControl object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_cvm_access_control_settings(settings)
+        return self.submit()
 
     def read_ap_management_settings(self):
         """Return the current AP_Management settings.
@@ -409,17 +620,47 @@ class ManagementPage(BasePageObject):
         :returns: AP_Management object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        return AP_Management(enable=self.read_element_value(self.ap_management),)
+        return self.ap_management_settings_from_form(self.read_form())
 
-    def write_ap_management_settings(self, settings: AP_Management):
-        """Populate the AP_Management setting.
+    @classmethod
+    def ap_management_settings_from_form(cls, form):
+        """Build the AP_Management settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: AP_Management object
+        """
+        return AP_Management(
+            enable=cls.form_value(form, cls.ap_management),
+        )
+
+    def fill_ap_management_settings(self, settings: AP_Management):
+        """Populate the AP_Management setting, without submitting the page.
 
         :param settings: AP_Management object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.ap_management, settings.enable)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.ap_management_settings_fields(settings))
+
+    @classmethod
+    def ap_management_settings_fields(cls, settings: AP_Management):
+        """Map the AP_Management settings onto the page elements.
+
+        :param settings: AP_Management object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.ap_management: settings.enable,
+        }
+
+    def write_ap_management_settings(self, settings: AP_Management):
+        """Populate and apply the AP_Management setting.
+
+        :param settings: AP_Management object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_ap_management_settings(settings)
+        return self.submit()
 
     def read_device_management_settings(self):
         """Return the current DeviceManagement settings.
@@ -427,25 +668,51 @@ class ManagementPage(BasePageObject):
         :returns: DeviceManagement object
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
+        return self.device_management_settings_from_form(self.read_form())
+
+    @classmethod
+    def device_management_settings_from_form(cls, form):
+        """Build the DeviceManagement settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: DeviceManagement object
+        """
         return DeviceManagement(
-            enable=self.read_element_value(self.device_management),
-            respond_to_external_device=self.read_element_value(
-                self.device_management_respond_external
+            enable=cls.form_value(form, cls.device_management),
+            respond_to_external_device=cls.form_value(
+                form, cls.device_management_respond_external
             ),
         )
 
-    def write_device_management_settings(self, settings: DeviceManagement):
-        """Populate the DeviceManagement setting.
+    def fill_device_management_settings(self, settings: DeviceManagement):
+        """Populate the DeviceManagement setting, without submitting the page.
 
         :param settings: DeviceManagement object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv4_management_setup_tab)
-        self.set_element_value(self.device_management, settings.enable)
-        self.set_element_value(
-            self.device_management_respond_external, settings.respond_to_external_device
-        )
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.device_management_settings_fields(settings))
+
+    @classmethod
+    def device_management_settings_fields(cls, settings: DeviceManagement):
+        """Map the DeviceManagement settings onto the page elements.
+
+        :param settings: DeviceManagement object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.device_management: settings.enable,
+            cls.device_management_respond_external: settings.respond_to_external_device,
+        }
+
+    def write_device_management_settings(self, settings: DeviceManagement):
+        """Populate and apply the DeviceManagement setting.
+
+        :param settings: DeviceManagement object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_device_management_settings(settings)
+        return self.submit()
 
     def read_ipv6_management_settings(self):
         """Return the currrent IPv6 Management settings.
@@ -453,60 +720,81 @@ class ManagementPage(BasePageObject):
         :returns IPv6Management object
         """
         self.open_page(tab=self.ipv6_management_setup_tab)
+        return self.ipv6_management_settings_from_form(self.read_form())
+
+    @classmethod
+    def ipv6_management_settings_from_form(cls, form):
+        """Build the IPv6Management settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: IPv6Management object
+        """
         return IPv6Management(
-            internet_management=self.read_element_value(
-                self.ipv6_enable_internet_access
-            ),
-            telnet_server=self.read_element_value(self.ipv6_telnet),
-            http_server=self.read_element_value(self.ipv6_http),
-            https_server=self.read_element_value(self.ipv6_https),
-            ssh_server=self.read_element_value(self.ipv6_ssh),
-            snmp_server=self.read_element_value(self.ipv6_snmp),
-            disable_ping_from_internet=self.read_element_value(
-                self.ipv6_disable_ping_from_internet
+            internet_management=cls.form_value(form, cls.ipv6_enable_internet_access),
+            telnet_server=cls.form_value(form, cls.ipv6_telnet),
+            http_server=cls.form_value(form, cls.ipv6_http),
+            https_server=cls.form_value(form, cls.ipv6_https),
+            ssh_server=cls.form_value(form, cls.ipv6_ssh),
+            snmp_server=cls.form_value(form, cls.ipv6_snmp),
+            disable_ping_from_internet=cls.form_value(
+                form, cls.ipv6_disable_ping_from_internet
             ),
-            access_index_1=self.read_element_value(self.ipv6_access_list_index_1),
-            access_index_2=self.read_element_value(self.ipv6_access_list_index_2),
-            access_index_3=self.read_element_value(self.ipv6_access_list_index_3),
-            access_index_4=self.read_element_value(self.ipv6_access_list_index_4),
-            access_index_5=self.read_element_value(self.ipv6_access_list_index_5),
-            access_index_6=self.read_element_value(self.ipv6_access_list_index_6),
-            access_index_7=self.read_element_value(self.ipv6_access_list_index_7),
-            access_index_8=self.read_element_value(self.ipv6_access_list_index_8),
-            access_index_9=self.read_element_value(self.ipv6_access_list_index_9),
-            access_index_10=self.read_element_value(self.ipv6_access_list_index_10),
+            access_index_1=cls.form_value(form, cls.ipv6_access_list_index_1),
+            access_index_2=cls.form_value(form, cls.ipv6_access_list_index_2),
+            access_index_3=cls.form_value(form, cls.ipv6_access_list_index_3),
+            access_index_4=cls.form_value(form, cls.ipv6_access_list_index_4),
+            access_index_5=cls.form_value(form, cls.ipv6_access_list_index_5),
+            access_index_6=cls.form_value(form, cls.ipv6_access_list_index_6),
+            access_index_7=cls.form_value(form, cls.ipv6_access_list_index_7),
+            access_index_8=cls.form_value(form, cls.ipv6_access_list_index_8),
+            access_index_9=cls.form_value(form, cls.ipv6_access_list_index_9),
+            access_index_10=cls.form_value(form, cls.ipv6_access_list_index_10),
         )
 
-    def write_ipv6_management_settings(self, settings: IPv6Management):
-        """Populate the IPv6Management setting.
+    def fill_ipv6_management_settings(self, settings: IPv6Management):
+        """Populate the IPv6Management setting, without submitting the page.
 
         :param settings: IPv6Management object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.ipv6_management_setup_tab)
-        self.set_element_value(
-            self.ipv6_enable_internet_access, settings.internet_management
-        )
-        self.set_element_value(self.ipv6_telnet, settings.telnet_server)
-        self.set_element_value(self.ipv6_http, settings.http_server)
-        self.set_element_value(self.ipv6_https, settings.https_server)
-        self.set_element_value(self.ipv6_ssh, settings.ssh_server)
-        self.set_element_value(self.ipv6_snmp, settings.snmp_server)
-        self.set_element_value(
-            self.ipv6_disable_ping_from_internet, settings.disable_ping_from_internet
-        )
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_1)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_2)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_3)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_4)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_5)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_6)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_7)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_8)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_9)
-        self.set_element_value(self.ipv6_access_list_index_1, settings.access_index_10)
-
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.ipv6_management_settings_fields(settings))
+
+    @classmethod
+    def ipv6_management_settings_fields(cls, settings: IPv6Management):
+        """Map the IPv6Management settings onto the page elements.
+
+        :param settings: IPv6Management object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.ipv6_enable_internet_access: settings.internet_management,
+            cls.ipv6_telnet: settings.telnet_server,
+            cls.ipv6_http: settings.http_server,
+            cls.ipv6_https: settings.https_server,
+            cls.ipv6_ssh: settings.ssh_server,
+            cls.ipv6_snmp: settings.snmp_server,
+            cls.ipv6_disable_ping_from_internet: settings.disable_ping_from_internet,
+            cls.ipv6_access_list_index_1: settings.access_index_1,
+            cls.ipv6_access_list_index_2: settings.access_index_2,
+            cls.ipv6_access_list_index_3: settings.access_index_3,
+            cls.ipv6_access_list_index_4: settings.access_index_4,
+            cls.ipv6_access_list_index_5: settings.access_index_5,
+            cls.ipv6_access_list_index_6: settings.access_index_6,
+            cls.ipv6_access_list_index_7: settings.access_index_7,
+            cls.ipv6_access_list_index_8: settings.access_index_8,
+            cls.ipv6_access_list_index_9: settings.access_index_9,
+            cls.ipv6_access_list_index_10: settings.access_index_10,
+        }
+
+    def write_ipv6_management_settings(self, settings: IPv6Management):
+        """Populate and apply the IPv6Management setting.
+
+        :param settings: IPv6Management object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_ipv6_management_settings(settings)
+        return self.submit()
 
     def read_lan_access_settings(self):
         """Return the current LAN_Access settings.
@@ -514,84 +802,104 @@ class ManagementPage(BasePageObject):
         :returns: LAN_Access object
         """
         self.open_page(tab=self.lan_access_setup_tab)
+        return self.lan_access_settings_from_form(self.read_form())
+
+    @classmethod
+    def lan_access_settings_from_form(cls, form):
+        """Build the LAN_Access settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: LAN_Access object
+        """
         return LAN_Access(
-            enable=self.read_element_value(self.allow_management_from_lan),
-            ftp_server=self.read_element_value(self.lan_ftp),
-            http_server=self.read_element_value(self.lan_http),
-            enforce_https_access=self.read_element_value(self.lan_enforce_https_access),
-            https_server=self.read_element_value(self.lan_https),
-            telnet_server=self.read_element_value(self.lan_telnet),
-            tr069_server=self.read_element_value(self.lan_tr069),
-            ssh_server=self.read_element_value(self.lan_ssh),
-            lan_1_access=self.read_element_value(self.subnet_lan_1),
-            lan_1_use_index=self.read_element_value(self.subnet_lan_1_use_index),
-            lan_1_index=self.read_element_value(self.subnet_lan_1_index),
-            lan_2_access=self.read_element_value(self.subnet_lan_2),
-            lan_2_use_index=self.read_element_value(self.subnet_lan_2_use_index),
-            lan_2_index=self.read_element_value(self.subnet_lan_2_index),
-            lan_3_access=self.read_element_value(self.subnet_lan_3),
-            lan_3_use_index=self.read_element_value(self.subnet_lan_3_use_index),
-            lan_3_index=self.read_element_value(self.subnet_lan_3_index),
-            lan_4_access=self.read_element_value(self.subnet_lan_4),
-            lan_4_use_index=self.read_element_value(self.subnet_lan_4_use_index),
-            lan_4_index=self.read_element_value(self.subnet_lan_4_index),
-            lan_5_access=self.read_element_value(self.subnet_lan_5),
-            lan_5_use_index=self.read_element_value(self.subnet_lan_5_use_index),
-            lan_5_index=self.read_element_value(self.subnet_lan_5_index),
-            lan_6_access=self.read_element_value(self.subnet_lan_6),
-            lan_6_use_index=self.read_element_value(self.subnet_lan_6_use_index),
-            lan_6_index=self.read_element_value(self.subnet_lan_6_index),
-            dmz_access=self.read_element_value(self.subnet_lan_dmz),
-            lan_ip_routed_access=self.read_element_value(self.subnet_lan_ip_routed),
-            lan_ip_routed_use_index=self.read_element_value(
-                self.subnet_lan_ip_routed_use_index
-            ),
-            lan_ip_routed_index=self.read_element_value(
-                self.subnet_lan_ip_routed_index
+            enable=cls.form_value(form, cls.allow_management_from_lan),
+            ftp_server=cls.form_value(form, cls.lan_ftp),
+            http_server=cls.form_value(form, cls.lan_http),
+            enforce_https_access=cls.form_value(form, cls.lan_enforce_https_access),
+            https_server=cls.form_value(form, cls.lan_https),
+            telnet_server=cls.form_value(form, cls.lan_telnet),
+            tr069_server=cls.form_value(form, cls.lan_tr069),
+            ssh_server=cls.form_value(form, cls.lan_ssh),
+            lan_1_access=cls.form_value(form, cls.subnet_lan_1),
+            lan_1_use_index=cls.form_value(form, cls.subnet_lan_1_use_index),
+            lan_1_index=cls.form_value(form, cls.subnet_lan_1_index),
+            lan_2_access=cls.form_value(form, cls.subnet_lan_2),
+            lan_2_use_index=cls.form_value(form, cls.subnet_lan_2_use_index),
+            lan_2_index=cls.form_value(form, cls.subnet_lan_2_index),
+            lan_3_access=cls.form_value(form, cls.subnet_lan_3),
+            lan_3_use_index=cls.form_value(form, cls.subnet_lan_3_use_index),
+            lan_3_index=cls.form_value(form, cls.subnet_lan_3_index),
+            lan_4_access=cls.form_value(form, cls.subnet_lan_4),
+            lan_4_use_index=cls.form_value(form, cls.subnet_lan_4_use_index),
+            lan_4_index=cls.form_value(form, cls.subnet_lan_4_index),
+            lan_5_access=cls.form_value(form, cls.subnet_lan_5),
+            lan_5_use_index=cls.form_value(form, cls.subnet_lan_5_use_index),
+            lan_5_index=cls.form_value(form, cls.subnet_lan_5_index),
+            lan_6_access=cls.form_value(form, cls.subnet_lan_6),
+            lan_6_use_index=cls.form_value(form, cls.subnet_lan_6_use_index),
+            lan_6_index=cls.form_value(form, cls.subnet_lan_6_index),
+            dmz_access=cls.form_value(form, cls.subnet_lan_dmz),
+            lan_ip_routed_access=cls.form_value(form, cls.subnet_lan_ip_routed),
+            lan_ip_routed_use_index=cls.form_value(
+                form, cls.subnet_lan_ip_routed_use_index
             ),
+            lan_ip_routed_index=cls.form_value(form, cls.subnet_lan_ip_routed_index),
         )
 
-    def write_lan_access_settings(self, settings: LAN_Access):
-        """Populate the LAN_Access setting.
+    def fill_lan_access_settings(self, settings: LAN_Access):
+        """Populate the LAN_Access setting, without submitting the page.
 
         :param settings: LAN_Access object
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page(tab=self.lan_access_setup_tab)
-        self.set_element_value(self.allow_management_from_lan, settings.enable)
-        self.set_element_value(self.lan_ftp, settings.ftp_server)
-        self.set_element_value(self.lan_http, settings.http_server)
-        self.set_element_value(
-            self.lan_enforce_https_access, settings.enforce_https_access
-        )
-        self.set_element_value(self.lan_https, settings.https_server)
-        self.set_element_value(self.lan_telnet, settings.telnet_server)
-        self.set_element_value(self.lan_tr069, settings.tr069_server)
-        self.set_element_value(self.lan_ssh, settings.ssh_server)
-        self.set_element_value(self.subnet_lan_1, settings.lan_1_access)
-        self.set_element_value(self.subnet_lan_1_use_index, settings.lan_1_use_index)
-        self.set_element_value(self.subnet_lan_1_index, settings.lan_1_index)
-        self.set_element_value(self.subnet_lan_2, settings.lan_2_access)
-        self.set_element_value(self.subnet_lan_2_use_index, settings.lan_2_use_index)
-        self.set_element_value(self.subnet_lan_2_index, settings.lan_2_index)
-        self.set_element_value(self.subnet_lan_3, settings.lan_3_access)
-        self.set_element_value(self.subnet_lan_3_use_index, settings.lan_3_use_index)
-        self.set_element_value(self.subnet_lan_3_index, settings.lan_3_index)
-        self.set_element_value(self.subnet_lan_4, settings.lan_4_access)
-        self.set_element_value(self.subnet_lan_4_use_index, settings.lan_4_use_index)
-        self.set_element_value(self.subnet_lan_4_index, settings.lan_4_index)
-        self.set_element_value(self.subnet_lan_5, settings.lan_5_access)
-        self.set_element_value(self.subnet_lan_5_use_index, settings.lan_5_use_index)
-        self.set_element_value(self.subnet_lan_5_index, settings.lan_5_index)
-        self.set_element_value(self.subnet_lan_6, settings.lan_6_access)
-        self.set_element_value(self.subnet_lan_6_use_index, settings.lan_6_use_index)
-        self.set_element_value(self.subnet_lan_6_index, settings.lan_6_index)
-        self.set_element_value(self.subnet_lan_dmz, settings.dmz_access)
-        self.set_element_value(self.subnet_lan_ip_routed, settings.lan_ip_routed_access)
-        self.set_element_value(
-            self.subnet_lan_ip_routed_use_index, settings.lan_ip_routed_use_index
-        )
-        self.set_element_value(
-            self.subnet_lan_ip_routed_index, settings.lan_ip_routed_index
-        )
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.lan_access_settings_fields(settings))
+
+    @classmethod
+    def lan_access_settings_fields(cls, settings: LAN_Access):
+        """Map the LAN_Access settings onto the page elements.
+
+        :param settings: LAN_Access object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.allow_management_from_lan: settings.enable,
+            cls.lan_ftp: settings.ftp_server,
+            cls.lan_http: settings.http_server,
+            cls.lan_enforce_https_access: settings.enforce_https_access,
+            cls.lan_https: settings.https_server,
+            cls.lan_telnet: settings.telnet_server,
+            cls.lan_tr069: settings.tr069_server,
+            cls.lan_ssh: settings.ssh_server,
+            cls.subnet_lan_1: settings.lan_1_access,
+            cls.subnet_lan_1_use_index: settings.lan_1_use_index,
+            cls.subnet_lan_1_index: settings.lan_1_index,
+            cls.subnet_lan_2: settings.lan_2_access,
+            cls.subnet_lan_2_use_index: settings.lan_2_use_index,
+            cls.subnet_lan_2_index: settings.lan_2_index,
+            cls.subnet_lan_3: settings.lan_3_access,
+            cls.subnet_lan_3_use_index: settings.lan_3_use_index,
+            cls.subnet_lan_3_index: settings.lan_3_index,
+            cls.subnet_lan_4: settings.lan_4_access,
+            cls.subnet_lan_4_use_index: settings.lan_4_use_index,
+            cls.subnet_lan_4_index: settings.lan_4_index,
+            cls.subnet_lan_5: settings.lan_5_access,
+            cls.subnet_lan_5_use_index: settings.lan_5_use_index,
+            cls.subnet_lan_5_index: settings.lan_5_index,
+            cls.subnet_lan_6: settings.lan_6_access,
+            cls.subnet_lan_6_use_index: settings.lan_6_use_index,
+            cls.subnet_lan_6_index: settings.lan_6_index,
+            cls.subnet_lan_dmz: settings.dmz_access,
+            cls.subnet_lan_ip_routed: settings.lan_ip_routed_access,
+            cls.subnet_lan_ip_routed_use_index: settings.lan_ip_routed_use_index,
+            cls.subnet_lan_ip_routed_index: settings.lan_ip_routed_index,
+        }
+
+    def write_lan_access_settings(self, settings: LAN_Access):
+        """Populate and apply the LAN_Access setting.
+
+        :param settings: LAN_Access object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_lan_access_settings(settings)
+        return self.submit()
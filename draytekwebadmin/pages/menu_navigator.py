@@ -25,48 +25,86 @@ class MenuNavigator(BasePageObject):
     # Reboot Page Radio button
     reboot_radio = InputRadio(By.NAME, "sReboot")
 
-    def open_sysmain_snmp(self):
-        """Navigate the menus to open the SNMP configuration panel."""
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_menu)
-        if not self.menu_snmp.is_visible():
-            self.menu_system_maintenance.click()
-        self.menu_snmp.click()
+    def open_menu_page(self, menu_item: Link, frames, tab: Link = None):
+        """Open a System Maintenance page from the menu, unless the browser is already showing it.
+
+        :param menu_item: Link in the menu frame
+        :param frames: names of the frames holding the page, from the top level document
+        :param tab: Link to click on the page, if visible (Default: leave the tab as is)
+        :returns: True if the page was opened, False if it was already showing
+        """
+        state = self.navigation
+        if state.page == menu_item.locator:
+            self.switch_to_frames(frames)
+            if tab is not None and state.tab != tab.locator:
+                if self.is_displayed(tab):
+                    tab.click()
+                state.tab = tab.locator
+                state.form = None
+            return False
+        # Forget the old page first, so a failure part way leaves nothing assumed
+        state.invalidate()
+        with self.timed("navigation", menu_item.locator[1]):
+            # Mark the page being replaced, to tell when the new one has loaded
+            self.switch_to_frames(frames[:1])
+            self.mark_document()
+            self.switch_to_frames([self.frame_menu])
+            self.wait_until_ready()
+            if not self.is_displayed(menu_item):
+                self.menu_system_maintenance.click()
+            menu_item.click()
+            self.switch_to_frames(frames[:1])
+            self.wait_until_ready(new_document=True)
+            self.switch_to_frames(frames)
+            self.wait_until_ready()
+            if tab and self.wait_until_displayed([tab]):
+                tab.click()
+        state.page = menu_item.locator
+        state.tab = tab.locator if tab else None
+        return True
+
+    def switch_to_frames(self, frames):
+        """Switch to a frame, unless already switched to it.
+
+        :param frames: frame names, from the top level document
+        """
+        frames = tuple(frames)
+        if self.navigation.frames == frames:
+            return
         self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_main)
+        for frame in frames:
+            self.driver.switch_to.frame(frame)
+        self.navigation.frames = frames
+
+    def open_sysmain_snmp(self):
+        """Navigate the menus to open the SNMP configuration panel.
+
+        :returns: True if the page was opened, False if it was already showing
+        """
+        return self.open_menu_page(self.menu_snmp, [self.frame_main])
 
     def open_sysmain_management(self, tab: Link):
-        """Navigate the menus to open the SNMP configuration panel."""
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_menu)
-        if not self.menu_management.is_visible():
-            self.menu_system_maintenance.click()
-        self.menu_management.click()
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_main)
-        if tab and tab.is_visible():
-            tab.click()
+        """Navigate the menus to open the Management configuration panel, on the tab given.
+
+        :returns: True if the page was opened, False if it was already showing
+        """
+        return self.open_menu_page(self.menu_management, [self.frame_main], tab)
 
     def open_sysmain_reboot_system(self):
-        """Navigate the menus to open the Reboot System panel."""
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_menu)
-        if not self.menu_reboot_system.is_visible():
-            self.menu_system_maintenance.click()
-        self.menu_reboot_system.click()
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_main)
+        """Navigate the menus to open the Reboot System panel.
+
+        :returns: True if the page was opened, False if it was already showing
+        """
+        return self.open_menu_page(self.menu_reboot_system, [self.frame_main])
 
     def open_sysmain_firmware_upgrade(self):
-        """Navigate the menus to open the Reboot System panel."""
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_menu)
-        if not self.menu_firmware_upgrade.is_visible():
-            self.menu_system_maintenance.click()
-        self.menu_firmware_upgrade.click()
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_main)
-        self.driver.switch_to.frame(self.frame_cfgMain)
+        """Navigate the menus to open the Firmware Upgrade panel.
+
+        :returns: True if the page was opened, False if it was already showing
+        """
+        return self.open_menu_page(
+            self.menu_firmware_upgrade, [self.frame_main, self.frame_cfgMain]
+        )
 
     def is_reboot_system_displayed(self):
         # TODO (#4423): This feels like the wrong place for this. But is common to other pages.
@@ -74,6 +112,9 @@ class MenuNavigator(BasePageObject):
 
         :returns: True if reboot page is displayed, False otherwise
         """
-        self.driver.switch_to.default_content()
-        self.driver.switch_to.frame(self.frame_main)
-        return self.reboot_radio.is_visible()
+        self.switch_to_frames([self.frame_main])
+        if self.is_displayed(self.reboot_radio):
+            # The reboot prompt replaces the page that was showing
+            self.navigation.invalidate()
+            return True
+        return False
@@ -31,9 +31,11 @@ class RebootSystemPage(BasePageObject):
         self.open_page()
         self.current_settings_radio.click()
         self.reboot_now_button.click()
+        self.navigation.invalidate()
 
     def reboot_reset_to_factory_configuration(self):
         """***CAUTION*** Trigger router reboot back to factory default configuration."""
         self.open_page()
         self.factory_settings_radio.click()
         self.reboot_now_button.click()
+        self.navigation.invalidate()
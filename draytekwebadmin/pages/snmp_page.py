@@ -11,6 +11,9 @@ from draytekwebadmin.pages.basepageobject import BasePageObject
 class SNMPpage(BasePageObject):
     """Selenium Page Object Model: SNMPpage."""
 
+    # System Maintenance menu item (link text) for this page
+    menu_item = "SNMP"
+
     # Page Elements
     snmp_agent_enable = Checkbox(By.NAME, "SNMPAgentEn")
     get_community = InputText(By.NAME, "SNMPGetCom")
@@ -49,10 +52,26 @@ class SNMPpage(BasePageObject):
     ok_button = Button(By.NAME, "snmp_btnOk")
 
     def open_page(self):
-        """Navigate menus to open SNMP configuration page."""
+        """Navigate menus to open SNMP configuration page.
+
+        Navigation is skipped if the browser is already showing the page.
+        """
         menu = MenuNavigator(self.driver_wrapper)
         menu.open_sysmain_snmp()
 
+    def submit(self):
+        """Click OK to apply every setting populated on the page, unless none were changed.
+
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        if not self.changed:
+            # Nothing differs from the current settings, so there is nothing to apply
+            return False
+        # Wait for the response, so the reboot prompt isn't looked for on the page being replaced
+        self.click_and_wait(self.ok_button)
+        self.navigation.invalidate()
+        return self.check_reboot()
+
     def check_reboot(self):
         """Check if reboot page is displayed, if so set flag to indicate a reboot is required.
 
@@ -66,48 +85,69 @@ class SNMPpage(BasePageObject):
         :returns SNMPIPv4 object
         """
         self.open_page()
+        return self.snmp_ipv4_settings_from_form(self.read_form())
+
+    @classmethod
+    def snmp_ipv4_settings_from_form(cls, form):
+        """Build the SNMPIPv4 settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: SNMPIPv4 object
+        """
         return SNMPIPv4(
-            enable_agent=self.read_element_value(self.snmp_agent_enable),
-            get_community=self.read_element_value(self.get_community),
-            set_community=self.read_element_value(self.set_community),
-            manager_host_1=self.read_element_value(self.manager_host_v4_index_1),
-            manager_host_subnet_1=self.read_element_value(
-                self.manager_host_v4_subnet_index_1
+            enable_agent=cls.form_value(form, cls.snmp_agent_enable),
+            get_community=cls.form_value(form, cls.get_community),
+            set_community=cls.form_value(form, cls.set_community),
+            manager_host_1=cls.form_value(form, cls.manager_host_v4_index_1),
+            manager_host_subnet_1=cls.form_value(
+                form, cls.manager_host_v4_subnet_index_1
             ),
-            manager_host_2=self.read_element_value(self.manager_host_v4_index_2),
-            manager_host_subnet_2=self.read_element_value(
-                self.manager_host_v4_subnet_index_2
+            manager_host_2=cls.form_value(form, cls.manager_host_v4_index_2),
+            manager_host_subnet_2=cls.form_value(
+                form, cls.manager_host_v4_subnet_index_2
             ),
-            manager_host_3=self.read_element_value(self.manager_host_v4_index_3),
-            manager_host_subnet_3=self.read_element_value(
-                self.manager_host_v4_subnet_index_3
+            manager_host_3=cls.form_value(form, cls.manager_host_v4_index_3),
+            manager_host_subnet_3=cls.form_value(
+                form, cls.manager_host_v4_subnet_index_3
             ),
         )
 
-    def write_snmp_ipv4_settings(self, settings: SNMPIPv4):
-        """Populate the SNMPIPv4 settings.
+    def fill_snmp_ipv4_settings(self, settings: SNMPIPv4):
+        """Populate the SNMPIPv4 settings, without submitting the page.
 
         :param settings: SNMPIPv4 object
-        :returns reboot required (bool) - Indicating if settings change requires a reboot
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page()
-        self.set_element_value(self.snmp_agent_enable, settings.enable_agent)
-        self.set_element_value(self.get_community, settings.get_community)
-        self.set_element_value(self.set_community, settings.set_community)
-        self.set_element_value(self.manager_host_v4_index_1, settings.manager_host_1)
-        self.set_element_value(self.manager_host_v4_index_2, settings.manager_host_2)
-        self.set_element_value(self.manager_host_v4_index_3, settings.manager_host_3)
-        self.set_element_value(
-            self.manager_host_v4_subnet_index_1, settings.manager_host_subnet_1
-        )
-        self.set_element_value(
-            self.manager_host_v4_subnet_index_2, settings.manager_host_subnet_2
-        )
-        self.set_element_value(
-            self.manager_host_v4_subnet_index_3, settings.manager_host_subnet_3
-        )
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.snmp_ipv4_settings_fields(settings))
+
+    @classmethod
+    def snmp_ipv4_settings_fields(cls, settings: SNMPIPv4):
+        """Map the SNMPIPv4 settings onto the page elements.
+
+        :param settings: SNMPIPv4 object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.snmp_agent_enable: settings.enable_agent,
+            cls.get_community: settings.get_community,
+            cls.set_community: settings.set_community,
+            cls.manager_host_v4_index_1: settings.manager_host_1,
+            cls.manager_host_v4_index_2: settings.manager_host_2,
+            cls.manager_host_v4_index_3: settings.manager_host_3,
+            cls.manager_host_v4_subnet_index_1: settings.manager_host_subnet_1,
+            cls.manager_host_v4_subnet_index_2: settings.manager_host_subnet_2,
+            cls.manager_host_v4_subnet_index_3: settings.manager_host_subnet_3,
+        }
+
+    def write_snmp_ipv4_settings(self, settings: SNMPIPv4):
+        """Populate and apply the SNMPIPv4 settings.
+
+        :param settings: SNMPIPv4 object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_snmp_ipv4_settings(settings)
+        return self.submit()
 
     def read_snmp_ipv6_settings(self):
         """Return the current SNMPIPv6 settings.
@@ -115,48 +155,69 @@ class SNMPpage(BasePageObject):
         :returns SNMPIPv6 object
         """
         self.open_page()
+        return self.snmp_ipv6_settings_from_form(self.read_form())
+
+    @classmethod
+    def snmp_ipv6_settings_from_form(cls, form):
+        """Build the SNMPIPv6 settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: SNMPIPv6 object
+        """
         return SNMPIPv6(
-            enable_agent=self.read_element_value(self.snmp_agent_enable),
-            get_community=self.read_element_value(self.get_community),
-            set_community=self.read_element_value(self.set_community),
-            manager_host_1=self.read_element_value(self.manager_host_v6_index_1),
-            manager_host_prelen_1=self.read_element_value(
-                self.manager_host_v6_prelen_index_1
+            enable_agent=cls.form_value(form, cls.snmp_agent_enable),
+            get_community=cls.form_value(form, cls.get_community),
+            set_community=cls.form_value(form, cls.set_community),
+            manager_host_1=cls.form_value(form, cls.manager_host_v6_index_1),
+            manager_host_prelen_1=cls.form_value(
+                form, cls.manager_host_v6_prelen_index_1
             ),
-            manager_host_2=self.read_element_value(self.manager_host_v6_index_2),
-            manager_host_prelen_2=self.read_element_value(
-                self.manager_host_v6_prelen_index_2
+            manager_host_2=cls.form_value(form, cls.manager_host_v6_index_2),
+            manager_host_prelen_2=cls.form_value(
+                form, cls.manager_host_v6_prelen_index_2
             ),
-            manager_host_3=self.read_element_value(self.manager_host_v6_index_3),
-            manager_host_prelen_3=self.read_element_value(
-                self.manager_host_v6_prelen_index_3
+            manager_host_3=cls.form_value(form, cls.manager_host_v6_index_3),
+            manager_host_prelen_3=cls.form_value(
+                form, cls.manager_host_v6_prelen_index_3
             ),
         )
 
+    def fill_snmp_ipv6_settings(self, settings: SNMPIPv6):
+        """Populate the SNMPIPv6 settings, without submitting the page.
+
+        :param settings: SNMPIPv6 object
+        :returns: FormFill of the fields applied, disabled or missing
+        """
+        self.open_page()
+        return self.fill_form(self.snmp_ipv6_settings_fields(settings))
+
+    @classmethod
+    def snmp_ipv6_settings_fields(cls, settings: SNMPIPv6):
+        """Map the SNMPIPv6 settings onto the page elements.
+
+        :param settings: SNMPIPv6 object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.snmp_agent_enable: settings.enable_agent,
+            cls.get_community: settings.get_community,
+            cls.set_community: settings.set_community,
+            cls.manager_host_v6_index_1: settings.manager_host_1,
+            cls.manager_host_v6_index_2: settings.manager_host_2,
+            cls.manager_host_v6_index_3: settings.manager_host_3,
+            cls.manager_host_v6_prelen_index_1: settings.manager_host_prelen_1,
+            cls.manager_host_v6_prelen_index_2: settings.manager_host_prelen_2,
+            cls.manager_host_v6_prelen_index_3: settings.manager_host_prelen_3,
+        }
+
     def write_snmp_ipv6_settings(self, settings: SNMPIPv6):
-        """Populate the SNMPIPv6 settings.
+        """Populate and apply the SNMPIPv6 settings.
 
         :param settings: SNMPIPv6 object
         :returns: reboot required (bool) - Indicating if settings change requires a reboot
         """
-        self.open_page()
-        self.set_element_value(self.snmp_agent_enable, settings.enable_agent)
-        self.set_element_value(self.get_community, settings.get_community)
-        self.set_element_value(self.set_community, settings.set_community)
-        self.set_element_value(self.manager_host_v6_index_1, settings.manager_host_1)
-        self.set_element_value(self.manager_host_v6_index_2, settings.manager_host_2)
-        self.set_element_value(self.manager_host_v6_index_3, settings.manager_host_3)
-        self.set_element_value(
-            self.manager_host_v6_prelen_index_1, settings.manager_host_prelen_1
-        )
-        self.set_element_value(
-            self.manager_host_v6_prelen_index_2, settings.manager_host_prelen_2
-        )
-        self.set_element_value(
-            self.manager_host_v6_prelen_index_3, settings.manager_host_prelen_3
-        )
-        self.ok_button.click()
-        return self.check_reboot()
+        self.fill_snmp_ipv6_settings(settings)
+        return self.submit()
 
     def read_snmp_ipv4_trap_setting(self):
         """Return the current SNMPIPv4 Trap settings.
@@ -164,26 +225,53 @@ class SNMPpage(BasePageObject):
         :returns: SNMPIPv4Trap object
         """
         self.open_page()
+        return self.snmp_ipv4_trap_settings_from_form(self.read_form())
+
+    @classmethod
+    def snmp_ipv4_trap_settings_from_form(cls, form):
+        """Build the SNMPTrapIPv4 settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: SNMPTrapIPv4 object
+        """
         return SNMPTrapIPv4(
-            community=self.read_element_value(self.trap_community),
-            timeout=self.read_element_value(self.trap_timeout),
-            host_1=self.read_element_value(self.trap_host_v4_index_1),
-            host_2=self.read_element_value(self.trap_host_v4_index_2),
+            community=cls.form_value(form, cls.trap_community),
+            timeout=cls.form_value(form, cls.trap_timeout),
+            host_1=cls.form_value(form, cls.trap_host_v4_index_1),
+            host_2=cls.form_value(form, cls.trap_host_v4_index_2),
         )
 
-    def write_snmp_ipv4_trap_settings(self, settings: SNMPTrapIPv4):
-        """Populate the SNMPIPv4 Trap settings.
+    def fill_snmp_ipv4_trap_settings(self, settings: SNMPTrapIPv4):
+        """Populate the SNMPIPv4 Trap settings, without submitting the page.
 
         :param settings: SNMPIPv4Trap object
-        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page()
-        self.set_element_value(self.trap_community, settings.community)
-        self.set_element_value(self.trap_timeout, settings.timeout)
-        self.set_element_value(self.trap_host_v4_index_1, settings.host_1)
-        self.set_element_value(self.trap_host_v4_index_2, settings.host_2)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.snmp_ipv4_trap_settings_fields(settings))
+
+    @classmethod
+    def snmp_ipv4_trap_settings_fields(cls, settings: SNMPTrapIPv4):
+        """Map the SNMPTrapIPv4 settings onto the page elements.
+
+        :param settings: SNMPTrapIPv4 object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.trap_community: settings.community,
+            cls.trap_timeout: settings.timeout,
+            cls.trap_host_v4_index_1: settings.host_1,
+            cls.trap_host_v4_index_2: settings.host_2,
+        }
+
+    def write_snmp_ipv4_trap_settings(self, settings: SNMPTrapIPv4):
+        """Populate and apply the SNMPIPv4 Trap settings.
+
+        :param settings: SNMPTrapIPv4 object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_snmp_ipv4_trap_settings(settings)
+        return self.submit()
 
     def read_snmp_ipv6_trap_setting(self):
         """Return the current SNMPIPv6 Trap settings.
@@ -191,26 +279,53 @@ class SNMPpage(BasePageObject):
         :returns: SNMPIPv6Trap object
         """
         self.open_page()
+        return self.snmp_ipv6_trap_settings_from_form(self.read_form())
+
+    @classmethod
+    def snmp_ipv6_trap_settings_from_form(cls, form):
+        """Build the SNMPTrapIPv6 settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: SNMPTrapIPv6 object
+        """
         return SNMPTrapIPv6(
-            community=self.read_element_value(self.trap_community),
-            timeout=self.read_element_value(self.trap_timeout),
-            host_1=self.read_element_value(self.trap_host_v6_index_1),
-            host_2=self.read_element_value(self.trap_host_v6_index_2),
+            community=cls.form_value(form, cls.trap_community),
+            timeout=cls.form_value(form, cls.trap_timeout),
+            host_1=cls.form_value(form, cls.trap_host_v6_index_1),
+            host_2=cls.form_value(form, cls.trap_host_v6_index_2),
         )
 
-    def write_snmp_ipv6_trap_settings(self, settings: SNMPTrapIPv6):
-        """Populate the SNMPIPv6 Trap settings.
+    def fill_snmp_ipv6_trap_settings(self, settings: SNMPTrapIPv6):
+        """Populate the SNMPIPv6 Trap settings, without submitting the page.
 
         :param settings: SNMPIPv6Trap object
-        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        :returns: FormFill of the fields applied, disabled or missing
         """
         self.open_page()
-        self.set_element_value(self.trap_community, settings.community)
-        self.set_element_value(self.trap_timeout, settings.timeout)
-        self.set_element_value(self.trap_host_v6_index_1, settings.host_1)
-        self.set_element_value(self.trap_host_v6_index_2, settings.host_2)
-        self.ok_button.click()
-        return self.check_reboot()
+        return self.fill_form(self.snmp_ipv6_trap_settings_fields(settings))
+
+    @classmethod
+    def snmp_ipv6_trap_settings_fields(cls, settings: SNMPTrapIPv6):
+        """Map the SNMPTrapIPv6 settings onto the page elements.
+
+        :param settings: SNMPTrapIPv6 object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.trap_community: settings.community,
+            cls.trap_timeout: settings.timeout,
+            cls.trap_host_v6_index_1: settings.host_1,
+            cls.trap_host_v6_index_2: settings.host_2,
+        }
+
+    def write_snmp_ipv6_trap_settings(self, settings: SNMPTrapIPv6):
+        """Populate and apply the SNMPIPv6 Trap settings.
+
+        :param settings: SNMPTrapIPv6 object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_snmp_ipv6_trap_settings(settings)
+        return self.submit()
 
     def read_snmp_v3_settings(self):
         """Return the current SNMPv3 settings.
@@ -218,35 +333,63 @@ class SNMPpage(BasePageObject):
         :returns: SNMPv3 object
         """
         self.open_page()
+        return self.snmp_v3_settings_from_form(self.read_form())
+
+    @classmethod
+    def snmp_v3_settings_from_form(cls, form):
+        """Build the SNMPv3 settings from a form snapshot.
+
+        :param form: dictionary of form fields, as returned by snapshot_form
+        :returns: SNMPv3 object
+        """
         return SNMPv3(
-            enable_v3_agent=self.read_element_value(self.snmpv3_agent_enable),
-            usm_user=self.read_element_value(self.snmpv3_usm_user),
-            auth_algorithm=self.read_element_value(self.snmpv3_auth_algo),
-            auth_password=self.read_element_value(self.snmpv3_auth_password),
-            priv_algorithm=self.read_element_value(self.snmpv3_priv_algo),
-            priv_password=self.read_element_value(self.snmpv3_priv_password),
+            enable_v3_agent=cls.form_value(form, cls.snmpv3_agent_enable),
+            usm_user=cls.form_value(form, cls.snmpv3_usm_user),
+            auth_algorithm=cls.form_value(form, cls.snmpv3_auth_algo),
+            auth_password=cls.form_value(form, cls.snmpv3_auth_password),
+            priv_algorithm=cls.form_value(form, cls.snmpv3_priv_algo),
+            priv_password=cls.form_value(form, cls.snmpv3_priv_password),
         )
 
-    def write_snmp_v3_settings(self, settings: SNMPv3):
-        """Populate the SNMPv3 settings.
+    def fill_snmp_v3_settings(self, settings: SNMPv3):
+        """Populate the SNMPv3 settings, without submitting the page.
 
         :param settings: SNMPv3 object
-        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        :returns: FormFill of the fields applied, disabled or missing
         """
         # Note: To enable SNMPv3 agent, you also have to enable the SNMPv1v2 agent.
         # Which also needs v1v2 community strings, manager hosts etc.
         self.open_page()
-        if not self.set_element_value(
-            self.snmpv3_agent_enable, settings.enable_v3_agent
-        ):
+        filled = self.fill_form(self.snmp_v3_settings_fields(settings))
+        agent_enable = self.form_key(self.snmpv3_agent_enable)
+        if agent_enable in filled.disabled or agent_enable in filled.missing:
             # Unable to enable V3 - Likely SNMP Agent for v1/v2 not enabled
             raise ValueError(
                 f"Can't enable SNMPv3 Agent. Draytek requires v2 to be enabled and configured to use SNMPv3."
             )
-        self.set_element_value(self.snmpv3_usm_user, settings.usm_user)
-        self.set_element_value(self.snmpv3_auth_algo, settings.auth_algorithm)
-        self.set_element_value(self.snmpv3_auth_password, settings.auth_password)
-        self.set_element_value(self.snmpv3_priv_algo, settings.priv_algorithm)
-        self.set_element_value(self.snmpv3_priv_password, settings.priv_password)
-        self.ok_button.click()
-        return self.check_reboot()
+        return filled
+
+    @classmethod
+    def snmp_v3_settings_fields(cls, settings: SNMPv3):
+        """Map the SNMPv3 settings onto the page elements.
+
+        :param settings: SNMPv3 object
+        :returns: dictionary of {Page Element: value}
+        """
+        return {
+            cls.snmpv3_agent_enable: settings.enable_v3_agent,
+            cls.snmpv3_usm_user: settings.usm_user,
+            cls.snmpv3_auth_algo: settings.auth_algorithm,
+            cls.snmpv3_auth_password: settings.auth_password,
+            cls.snmpv3_priv_algo: settings.priv_algorithm,
+            cls.snmpv3_priv_password: settings.priv_password,
+        }
+
+    def write_snmp_v3_settings(self, settings: SNMPv3):
+        """Populate and apply the SNMPv3 settings.
+
+        :param settings: SNMPv3 object
+        :returns: reboot required (bool) - Indicating if settings change requires a reboot
+        """
+        self.fill_snmp_v3_settings(settings)
+        return self.submit()
@@ -0,0 +1,147 @@
+"""Draytek Web Admin - Router reachability checks."""
+
+import logging
+import socket
+import ssl
+from collections import namedtuple
+from time import monotonic, sleep
+
+import requests
+import urllib3
+
+from draytekwebadmin.fleet import FleetExecutor
+
+LOGGER = logging.getLogger("root")
+
+# Result of waiting for a router to come back after a reboot or upgrade.
+# downtime: seconds from the restart until the dashboard could be read (None if the restart wasn't seen)
+# firmware: firmware version read from the dashboard
+# firmware_confirmed: True if firmware matches the version upgraded to, None if there was no upgrade
+Recovery = namedtuple("Recovery", ["downtime", "firmware", "firmware_confirmed"])
+
+# Result of checking a router can be reached, before starting a browser for it.
+# latency: seconds to connect, including the TLS handshake for HTTPS (None if not reachable)
+# error: reason the router couldn't be reached (None if reachable)
+Preflight = namedtuple(
+    "Preflight", ["hostname", "port", "reachable", "latency", "error"]
+)
+
+# Preflight checks are only network round trips, so many more can run at once than browser sessions
+PREFLIGHT_CONCURRENCY = 32
+
+
+def tcp_reachable(hostname, port, timeout=3):
+    """Check if a TCP connection can be opened.
+
+    :param hostname: Hostname or IP address
+    :param port: TCP port number
+    :param timeout: seconds to wait for the connection
+    :returns: True if the connection was accepted
+    """
+    try:
+        with socket.create_connection((hostname, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def preflight(hostname, port, use_https=True, timeout=3):
+    """Check a router's web port accepts a connection and, for HTTPS, completes a TLS handshake.
+
+    Certificates aren't verified, routers use self signed certificates.
+
+    :param hostname: Hostname or IP address
+    :param port: TCP port number
+    :param use_https: True to also perform a TLS handshake
+    :param timeout: seconds to wait for the connection and the handshake
+    :returns: Preflight
+    """
+    start = monotonic()
+    try:
+        with socket.create_connection((hostname, port), timeout=timeout) as connection:
+            if use_https:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                with context.wrap_socket(connection, server_hostname=hostname):
+                    pass
+    except (OSError, ValueError) as error:
+        return Preflight(
+            hostname, port, False, None, str(error) or type(error).__name__
+        )
+    return Preflight(hostname, port, True, monotonic() - start, None)
+
+
+def preflight_fleet(routers, concurrency=PREFLIGHT_CONCURRENCY, timeout=3):
+    """Check many routers can be reached at the same time, before starting any browser.
+
+    :param routers: list of objects with hostname, port and use_https attributes e.g. DrayTekWebAdmin
+    :param concurrency: Maximum number of routers checked at the same time (Default: 32)
+    :param timeout: seconds to wait for each router
+    :returns: list of Preflight, one per router in input order
+    """
+    routers = list(routers)
+    results = FleetExecutor(concurrency=concurrency).run(
+        routers,
+        lambda router: preflight(
+            router.hostname, router.port, router.use_https, timeout=timeout
+        ),
+    )
+    # An unexpected exception, e.g. from a router without a hostname, is returned as a failed check
+    results = [
+        (
+            result
+            if isinstance(result, Preflight)
+            else Preflight(router.hostname, router.port, False, None, str(result))
+        )
+        for router, result in zip(routers, results)
+    ]
+    reachable = sum(1 for result in results if result.reachable)
+    LOGGER.info(f"Preflight: {reachable} of {len(results)} routers reachable")
+    return results
+
+
+def http_ok(url, timeout=5):
+    """Check if a web page loads. Certificates aren't verified, routers use self signed certificates.
+
+    :param url: URL to request
+    :param timeout: seconds to wait for the response
+    :returns: True if the response status was 200
+    """
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    try:
+        return requests.get(url, timeout=timeout, verify=False).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def backoff(initial=1.0, maximum=30.0, factor=2.0):
+    """Generate exponentially increasing delays.
+
+    :param initial: first delay in seconds
+    :param maximum: largest delay in seconds
+    :param factor: multiplier applied to each following delay
+    :returns: generator of delays in seconds
+    """
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+
+def poll(check, deadline, initial=1.0, maximum=30.0):
+    """Call check with exponential backoff, until it returns True or the deadline passes.
+
+    :param check: function returning True when the wait is over
+    :param deadline: time.monotonic() value after which to give up
+    :param initial: first delay in seconds
+    :param maximum: largest delay in seconds
+    :returns: True if check succeeded before the deadline
+    """
+    for delay in backoff(initial, maximum):
+        if check():
+            return True
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return False
+        sleep(min(delay, remaining))
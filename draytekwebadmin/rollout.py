@@ -0,0 +1,116 @@
+"""Draytek Web Admin - Rolling Wave Scheduler."""
+
+import logging
+from collections import namedtuple
+from math import ceil
+
+from draytekwebadmin.fleet import DEFAULT_CONCURRENCY, FleetExecutor
+
+LOGGER = logging.getLogger("root")
+
+# results: task result (or exception) per router in input order, None for routers not reached
+# waves: number of waves run
+# halted: True if the rollout stopped early because the failure budget was exceeded
+# failures: number of routers which failed
+RolloutResult = namedtuple("RolloutResult", ["results", "waves", "halted", "failures"])
+
+
+def task_failed(result):
+    """Default failure test: the task raised an exception or returned False.
+
+    :param result: task result
+    :returns: True if the task failed
+    """
+    return isinstance(result, Exception) or result is False
+
+
+class RolloutScheduler:
+    """Run a task against a fleet in waves, a canary wave then growing batches, stopping if too many fail."""
+
+    def __init__(
+        self,
+        canary=1,
+        waves=(10, 50, 100),
+        failure_budget=0.0,
+        concurrency=DEFAULT_CONCURRENCY,
+        failed=task_failed,
+    ):
+        """Create a new RolloutScheduler.
+
+        :param canary: Number of routers in the first wave, run before any other (Default: 1, 0 for no canary)
+        :param waves: Cumulative percentages of the fleet completed by the end of each following wave
+                      (Default: 10, 50, 100). Routers left over after the last wave form a final wave.
+        :param failure_budget: Fraction of routers processed so far allowed to fail (Default: 0.0, any failure stops)
+        :param concurrency: Maximum number of routers processed at the same time within a wave (Default: 4)
+        :param failed: callable returning True if a task result is a failure (Default: exception or False)
+        """
+        self.canary = canary
+        self.waves = waves
+        self.failure_budget = failure_budget
+        self.concurrency = concurrency
+        self.failed = failed
+
+    def __setattr__(self, name, value):
+        if name == "canary":
+            value = int(value)
+            if value < 0:
+                raise ValueError(f"Canary must not be negative: {value}")
+        elif name == "waves":
+            value = [float(percentage) for percentage in value]
+            if any(not 0 < percentage <= 100 for percentage in value):
+                raise ValueError(f"Wave percentages must be between 0 and 100: {value}")
+            if value != sorted(value):
+                raise ValueError(f"Wave percentages must increase: {value}")
+        elif name == "failure_budget":
+            value = float(value)
+            if not 0 <= value <= 1:
+                raise ValueError(f"Failure budget must be between 0 and 1: {value}")
+        elif name == "concurrency":
+            value = int(value)
+            if value < 1:
+                raise ValueError(f"Concurrency must be at least 1: {value}")
+        super(RolloutScheduler, self).__setattr__(name, value)
+
+    def plan(self, routers):
+        """Split routers into waves.
+
+        :param routers: list of routers e.g. rows read from a CSV file
+        :returns: list of waves, each a list of routers
+        """
+        routers = list(routers)
+        boundaries = [min(self.canary, len(routers))]
+        boundaries += [
+            ceil(len(routers) * percentage / 100) for percentage in self.waves
+        ]
+        boundaries.append(len(routers))
+        waves = []
+        start = 0
+        for end in boundaries:
+            if end > start:
+                waves.append(routers[start:end])
+                start = end
+        return waves
+
+    def run(self, routers, task, *args, **kwargs):
+        """Run task for every router, one wave at a time, until done or the failure budget is exceeded.
+
+        :param routers: list of routers e.g. rows read from a CSV file
+        :param task: callable invoked as task(router, *args, **kwargs)
+        :returns: RolloutResult
+        """
+        executor = FleetExecutor(concurrency=self.concurrency)
+        results = []
+        failures = 0
+        waves = self.plan(routers)
+        for number, wave in enumerate(waves, start=1):
+            LOGGER.info(f"Rollout wave {number} of {len(waves)}: {len(wave)} routers")
+            wave_results = executor.run(wave, task, *args, **kwargs)
+            results += wave_results
+            failures += sum(1 for result in wave_results if self.failed(result))
+            if failures > self.failure_budget * len(results):
+                LOGGER.critical(
+                    f"Rollout halted after wave {number}: {failures} of {len(results)} routers failed"
+                )
+                skipped = sum(len(remaining) for remaining in waves[number:])
+                return RolloutResult(results + [None] * skipped, number, True, failures)
+        return RolloutResult(results, len(waves), False, failures)
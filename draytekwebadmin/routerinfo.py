@@ -4,9 +4,25 @@
 class RouterInfo:
     """RouterInfo Object."""
 
-    def __init__(self, model=None, router_name=None, firmware=None, dsl_version=None):
+    def __init__(
+        self,
+        model=None,
+        router_name=None,
+        firmware=None,
+        dsl_version=None,
+        uptime=None,
+        serial=None,
+        lan_mac=None,
+        lan_ip=None,
+        wan_ip=None,
+    ):
         """Create a new RouterInfo object."""
         self.model = model
         self.router_name = router_name
         self.firmware = firmware
         self.dsl_version = dsl_version
+        self.uptime = uptime
+        self.serial = serial
+        self.lan_mac = lan_mac
+        self.lan_ip = lan_ip
+        self.wan_ip = wan_ip
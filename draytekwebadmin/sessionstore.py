@@ -0,0 +1,135 @@
+"""Draytek Web Admin - Session Store."""
+
+import json
+import logging
+import os
+import sqlite3
+from collections import namedtuple
+from contextlib import closing
+from time import time
+
+from draytekwebadmin.routerinfo import RouterInfo
+
+LOGGER = logging.getLogger("root")
+
+DEFAULT_LIFETIME = 3600
+# Idle seconds after which the web console logs a session out, unless Management disable_auto_logout is set
+AUTO_LOGOUT = 300
+
+# cookies: list of browser cookie dictionaries, as returned by WebDriver get_cookies
+# routerinfo: RouterInfo read from the dashboard when the session logged in
+StoredSession = namedtuple("StoredSession", ["cookies", "routerinfo"])
+
+
+class SessionStore:
+    """On disk store of logged in web console sessions, keyed by console URL and username.
+
+    Lets a later run against the same router restore the session cookies, skipping login and the dashboard.
+    A session is kept until it has been idle for the lifetime, or for the web console's auto-logout time
+    unless the router is known to have auto-logout disabled. The file holds session cookies,
+    so it is created readable by its owner only.
+    """
+
+    def __init__(
+        self,
+        path="draytekwebadmin-sessions.sqlite",
+        lifetime=DEFAULT_LIFETIME,
+        auto_logout=AUTO_LOGOUT,
+    ):
+        """Open (creating if needed) a session store.
+
+        :param path: SQLite database file (Default: draytekwebadmin-sessions.sqlite in the current directory)
+        :param lifetime: Seconds an idle session is reused for (Default: 3600)
+        :param auto_logout: Idle seconds before the web console logs a session out, if auto-logout is enabled
+                            or not known (Default: 300)
+        """
+        self.path = str(path)
+        self.lifetime = lifetime
+        self.auto_logout = auto_logout
+        if not os.path.exists(self.path):
+            # Create the file before SQLite does, so the cookies are never readable by others
+            os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+        with closing(self._connect()) as database, database:
+            database.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "url TEXT, username TEXT, used REAL, auto_logout INTEGER, cookies TEXT, routerinfo TEXT, "
+                "PRIMARY KEY (url, username))"
+            )
+
+    def __setattr__(self, name, value):
+        if name in ("lifetime", "auto_logout"):
+            value = float(value)
+            if value < 0:
+                raise ValueError(f"{name} must not be negative: {value}")
+        super(SessionStore, self).__setattr__(name, value)
+
+    def _connect(self):
+        """Open a connection to the store database. Connections aren't shared between threads.
+
+        :returns: sqlite3 connection
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, url, username):
+        """Return a stored session, if present and not expired.
+
+        :param url: Web admin console URL e.g. https://192.168.1.1:443
+        :param username: Web admin account username
+        :returns: StoredSession, or None if not stored
+        """
+        with closing(self._connect()) as database:
+            row = database.execute(
+                "SELECT used, auto_logout, cookies, routerinfo FROM sessions "
+                "WHERE url = ? AND username = ?",
+                (url, username),
+            ).fetchone()
+        if row is None:
+            return None
+        used, auto_logout, cookies, routerinfo = row
+        lifetime = self.lifetime
+        if auto_logout is None or auto_logout:
+            lifetime = min(lifetime, self.auto_logout)
+        if used < time() - lifetime:
+            LOGGER.debug(f"Stored session for {url} has expired")
+            return None
+        info = RouterInfo()
+        for name, value in json.loads(routerinfo).items():
+            setattr(info, name, value)
+        return StoredSession(json.loads(cookies), info)
+
+    def put(self, url, username, cookies, routerinfo, auto_logout=None):
+        """Store a logged in session, or record that it has just been used.
+
+        :param url: Web admin console URL
+        :param username: Web admin account username
+        :param cookies: list of browser cookie dictionaries
+        :param routerinfo: RouterInfo of the router
+        :param auto_logout: False if the router has auto-logout disabled, True if enabled, None if not known
+        """
+        with closing(self._connect()) as database, database:
+            database.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    username,
+                    time(),
+                    None if auto_logout is None else int(auto_logout),
+                    json.dumps(cookies),
+                    json.dumps(vars(routerinfo) if routerinfo else {}),
+                ),
+            )
+
+    def invalidate(self, url, username=None):
+        """Remove stored sessions for a router, e.g. after it has been rebooted.
+
+        :param url: Web admin console URL
+        :param username: Web admin account username (Default: all users)
+        """
+        with closing(self._connect()) as database, database:
+            if username is None:
+                database.execute("DELETE FROM sessions WHERE url = ?", (url,))
+            else:
+                database.execute(
+                    "DELETE FROM sessions WHERE url = ? AND username = ?",
+                    (url, username),
+                )
@@ -0,0 +1,804 @@
+"""Draytek Web Admin - Web Console Simulator."""
+
+import argparse
+import ipaddress
+import json
+import logging
+import random
+import socketserver
+import ssl
+import threading
+from collections import Counter
+from email.parser import BytesParser
+from email.policy import HTTP
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from secrets import token_hex
+from time import monotonic, sleep
+from urllib.parse import parse_qsl, urlsplit
+
+from selenium.webdriver.common.by import By
+
+from draytekwebadmin.const import (
+    IPV4_SUBNET_MAX,
+    IPV4_SUBNET_MIN,
+    SNMPV3_AUTH_ALGO,
+    SNMPV3_PRIV_ALGP,
+)
+from draytekwebadmin.firmware import HEADER_SCAN_BYTES, parse_firmware_header
+from draytekwebadmin.pages import (
+    BasePageObject,
+    LoginPage,
+    ManagementPage,
+    MenuNavigator,
+    RebootSystemPage,
+    SNMPpage,
+)
+
+LOGGER = logging.getLogger("root")
+
+SESSION_COOKIE = "SESSION_ID_VIGOR"
+LOGIN_ERROR = "Invalid username or password"
+
+SUBNETS = [
+    f"{ipaddress.IPv4Network(f'0.0.0.0/{prefix}').netmask} / {prefix}"
+    for prefix in range(IPV4_SUBNET_MIN, IPV4_SUBNET_MAX + 1)
+]
+# Options of the select fields, by field name
+SELECT_OPTIONS = {
+    "SNMPMngHostMask0": SUBNETS,
+    "SNMPMngHostMask1": SUBNETS,
+    "SNMPMngHostMask2": SUBNETS,
+    "SNMPAuthProto": SNMPV3_AUTH_ALGO,
+    "SNMPPrivProto": SNMPV3_PRIV_ALGP,
+}
+# Settings of a new router, by form key. Other text fields are empty and checkboxes unchecked.
+FACTORY_SETTINGS = {
+    "SNMPGetCom": "public",
+    "SNMPSetCom": "private",
+    "SNMPTrapCom": "public",
+    "SNMPTrapTimeOut": "10",
+    "SNMPMngHostMask0": "255.255.255.255 / 32",
+    "SNMPMngHostMask1": "255.255.255.255 / 32",
+    "SNMPMngHostMask2": "255.255.255.255 / 32",
+    "SNMPAuthProto": "No Auth",
+    "SNMPPrivProto": "No Priv",
+    "sRouterName": "DrayTek",
+    "sRMC": True,
+    "sRMCHttps": True,
+    "ConfigPort=Default": True,
+    "TelnetPort": "23",
+    "HttpPort": "80",
+    "HttpsPort": "443",
+    "txtFtpPort": "21",
+    "txtTr069Port": "8069",
+    "txtSshPort": "22",
+    "iLoginFailures": "3",
+    "iPenaltyPeriod": "60",
+    "enTLSv1_2": True,
+    "CvmHttpPort": "8080",
+    "CvmHttpsPort": "8443",
+    "sMngtfrmLanEn1": True,
+    "iMngtlanHttp1": True,
+    "iMngtlanHttps1": True,
+}
+# Fields which only take effect after a reboot, so changing them brings up the reboot prompt
+REBOOT_FIELDS = {
+    "ConfigPort",
+    "TelnetPort",
+    "HttpPort",
+    "HttpsPort",
+    "txtFtpPort",
+    "txtTr069Port",
+    "txtSshPort",
+}
+
+DOCUMENT = (
+    "<!DOCTYPE html><html><head><title>{title}</title></head><body>{body}</body></html>"
+)
+FRAMESET = (
+    "<!DOCTYPE html><html><head><title>{title}</title></head>"
+    '<frameset rows="40,*" border="0"><frame name="header" src="/header.htm">'
+    '<frameset cols="200,*"><frame name="menu" src="/menu.htm">'
+    '<frame name="main" src="/doc/dashboard.htm"></frameset></frameset></html>'
+)
+LOGIN_FORM = (
+    '<form method="post" action="/cgi-bin/wlogin.cgi">'
+    '<input type="text" name="sUserName"><input type="password" name="sSysPass">'
+    '<input type="submit" name="btnOk" value="Login"></form>'
+    '<div id="errmsg">{error}</div>'
+)
+MENU = (
+    '<a href="javascript:void(0)" onclick="var items = document.getElementById(\'sysmain\'); '
+    "items.style.display = items.style.display == 'none' ? 'block' : 'none';\">{toggle}</a>"
+    '<div id="sysmain" style="display: none">{items}</div>'
+)
+UPGRADE_FORM = (
+    '<form method="post" enctype="multipart/form-data" action="/cgi-bin/fw_preview.cgi">'
+    '<input type="file" id="fw_file" name="fw_file">'
+    '<input type="submit" name="btnpreview" value="Preview">'
+    '<input type="button" name="attach" value="Upgrade" onclick="if (confirm(\'Upgrade firmware?\')) '
+    "{ this.form.action = '/cgi-bin/fw_upgrade.cgi'; this.form.submit(); }\"></form>"
+)
+UPGRADE_PREVIEW = (
+    '<table><tr><td>Model</td><td id="smodelName">{model}</td></tr>'
+    '<tr><td>Firmware Version</td><td id="sfwversion">{firmware}</td></tr>'
+    '<tr><td>Current Modem Version</td><td id="snewmdmver">{modem}</td></tr>'
+    '<tr><td>New Modem Version</td><td id="scurmdmver">{modem}</td></tr></table>'
+    '<input type="button" name="btnClose" value="Close" onclick="location.href = \'/doc/upgrade_form.htm\'">'
+)
+UPGRADE_DONE = (
+    "<p>Firmware upgraded. Restart the router to run the new firmware.</p>"
+    '<input type="button" value="Restart" onclick="if (confirm(\'Restart the router?\')) '
+    "location.href = '/cgi-bin/restart.cgi'\">"
+)
+
+
+def page_fields(page_type):
+    """List the form fields declared by a page object, in declaration order.
+
+    :param page_type: BasePageObject subclass e.g. SNMPpage
+    :returns: list of (element type name, field name, radio value, form key)
+    """
+    fields = []
+    for element in vars(page_type).values():
+        kind = type(element).__name__
+        if kind in ["InputText", "Checkbox", "InputRadio", "Select"]:
+            key = BasePageObject.form_key(element)
+            name, _, value = key.partition("=")
+            fields.append((kind, name, value, key))
+    return fields
+
+
+def render_button(element, value="OK"):
+    """Return the HTML of a submit button matching a page object button locator.
+
+    :param element: Button page element located by name or class name
+    :param value: button label
+    :returns: HTML (str)
+    """
+    by, locator = element.locator
+    attribute = "name" if by == By.NAME else "class"
+    return f'<input type="submit" {attribute}="{locator}" value="{value}">'
+
+
+class SettingsForm:
+    """A simulated settings page: the page object it is driven by and where its form is posted."""
+
+    def __init__(self, page_type, action, ok_button, tabs=()):
+        """Describe a settings page.
+
+        :param page_type: BasePageObject subclass whose elements the form is built from
+        :param action: path the form is posted to
+        :param ok_button: Button page element submitting the form
+        :param tabs: Link page elements located by id, switching tabs within the page
+        """
+        self.page_type = page_type
+        self.action = action
+        self.ok_button = ok_button
+        self.tabs = tabs
+        self.fields = page_fields(page_type)
+
+    def render(self, state, disabled):
+        """Return the page HTML, showing the current settings.
+
+        :param state: dictionary of {form key: value}
+        :param disabled: form keys of the fields shown disabled
+        :returns: HTML (str)
+        """
+        tabs = "".join(
+            f'<a id="{tab.locator[1]}" href="javascript:void(0)">{tab.locator[1]}</a> '
+            for tab in self.tabs
+        )
+        rows = []
+        for kind, name, value, key in self.fields:
+            attributes = " disabled" if key in disabled else ""
+            if kind == "InputText":
+                field = f'<input type="text" name="{name}" value="{escape(state[key])}"{attributes}>'
+            elif kind == "Select":
+                options = "".join(
+                    f'<option value="{escape(option)}"{" selected" if option == state[key] else ""}>'
+                    f"{escape(option)}</option>"
+                    for option in SELECT_OPTIONS.get(name, [])
+                )
+                field = f'<select name="{name}"{attributes}>{options}</select>'
+            else:
+                checked = " checked" if state[key] else ""
+                field = (
+                    f'<input type="radio" name="{name}" value="{value}"{checked}{attributes}>'
+                    if kind == "InputRadio"
+                    else f'<input type="checkbox" name="{name}"{checked}{attributes}>'
+                )
+            rows.append(f"<tr><td>{key}</td><td>{field}</td></tr>")
+        return (
+            f'{tabs}<form method="post" action="{self.action}">'
+            f'<input type="hidden" name="sFormAuthStr" value="{token_hex(8)}">'
+            f'<table>{"".join(rows)}</table>{render_button(self.ok_button)}</form>'
+        )
+
+    def apply(self, state, disabled, data):
+        """Update settings from a posted form, as the router would.
+
+        :param state: dictionary of {form key: value}, updated in place
+        :param disabled: form keys of the fields shown disabled, which are not changed
+        :param data: dictionary of posted {field name: value}
+        :returns: list of form keys changed
+        """
+        changed = []
+        for kind, name, value, key in self.fields:
+            if key in disabled:
+                continue
+            if kind == "Checkbox":
+                new = name in data
+            elif name not in data:
+                continue
+            elif kind == "InputRadio":
+                new = data[name] == value
+            else:
+                new = data[name]
+            if state[key] != new:
+                state[key] = new
+                changed.append(key)
+        return changed
+
+
+SNMP_FORM = SettingsForm(SNMPpage, "/cgi-bin/snmp.cgi", SNMPpage.ok_button)
+MANAGEMENT_FORM = SettingsForm(
+    ManagementPage,
+    "/cgi-bin/mng.cgi",
+    ManagementPage.ok_button,
+    tabs=(
+        ManagementPage.ipv4_management_setup_tab,
+        ManagementPage.ipv6_management_setup_tab,
+        ManagementPage.lan_access_setup_tab,
+    ),
+)
+REBOOT_FORM = SettingsForm(
+    RebootSystemPage, "/cgi-bin/reboot.cgi", RebootSystemPage.reboot_now_button
+)
+# Settings pages by the path they are shown at
+SETTINGS_PAGES = {
+    "/doc/snmp.htm": SNMP_FORM,
+    "/doc/mng.htm": MANAGEMENT_FORM,
+}
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each connection in a thread, as http.server.ThreadingHTTPServer which needs Python 3.7."""
+
+    daemon_threads = True
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """Serves the pages of a RouterSimulator."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm would hold back on a kept alive connection
+    disable_nagle_algorithm = True
+    server_version = "DrayTek/Vigor"
+
+    @property
+    def simulator(self):
+        """RouterSimulator: the simulator served."""
+        return self.server.simulator
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        LOGGER.debug(f"Simulator {self.address_string()}: {format % args}")
+
+    def do_GET(self):
+        """Serve a page."""
+        self._handle("GET")
+
+    def do_POST(self):
+        """Handle a form post."""
+        self._handle("POST")
+
+    def _handle(self, method):
+        path = urlsplit(self.path).path
+        body = b""
+        if method == "POST":
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        simulator = self.simulator
+        if self.server is not simulator.server:
+            # Connection kept alive across a reboot, which a restarting router would drop
+            self.close_connection = True
+            return
+        simulator.count(method, path)
+        if simulator.latency:
+            sleep(simulator.latency)
+        if simulator.inject_failure():
+            self._send(503, DOCUMENT.format(title="Busy", body="Service Unavailable"))
+            return
+        after = None
+        if method == "POST" and path == "/cgi-bin/wlogin.cgi":
+            status, html, cookie = self._login(dict(parse_qsl(body.decode())))
+            self._send(status, html, cookie)
+            return
+        if not simulator.logged_in(self._session_id()):
+            self._send(200, simulator.login_page())
+            return
+        if method == "GET":
+            html = simulator.page(path)
+            if path == "/cgi-bin/restart.cgi":
+                after = simulator.reboot
+        elif path in ("/cgi-bin/fw_preview.cgi", "/cgi-bin/fw_upgrade.cgi"):
+            upload = self._upload(body)
+            if path.endswith("preview.cgi"):
+                html = simulator.preview_firmware(upload)
+            else:
+                html = simulator.upgrade_firmware(upload)
+        else:
+            html, after = simulator.post(path, dict(parse_qsl(body.decode())))
+        self._send(200 if html is not None else 404, html or "Not Found")
+        if after is not None:
+            after()
+
+    def _session_id(self):
+        """Return the session cookie sent, if any."""
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+
+    def _login(self, data):
+        """Check login details, starting a session if they match.
+
+        :param data: dictionary of posted {field name: value}
+        :returns: (status, HTML, session id or None)
+        """
+        session_id = self.simulator.login(
+            data.get(LoginPage.username.locator[1]),
+            data.get(LoginPage.password.locator[1]),
+        )
+        if session_id is None:
+            return 200, self.simulator.login_page(LOGIN_ERROR), None
+        return 200, self.simulator.frameset(), session_id
+
+    def _upload(self, body):
+        """Return the file uploaded in a multipart form post.
+
+        :param body: request body
+        :returns: file content (bytes), empty if no file was sent
+        """
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode()
+            + body
+        )
+        if not message.is_multipart():
+            return b""
+        for part in message.iter_parts():
+            if part.get_filename() is not None:
+                return part.get_payload(decode=True) or b""
+        return b""
+
+    def _send(self, status, html, session_id=None):
+        content = html.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        if session_id is not None:
+            self.send_header(
+                "Set-Cookie", f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly"
+            )
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class RouterSimulator:
+    """Local stand in for a DrayTek Vigor web administration console, for benchmarks and tests.
+
+    Serves the login form, the header, menu and main frames, the dashboard, and the SNMP, Management,
+    Reboot System and Firmware Upgrade pages, built from the page object locators. Settings posted are
+    kept in memory. Changing a management port brings up the reboot prompt, and a reboot stops the
+    server for a while and logs every session out. Each request can be delayed, or fail at random.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        username="admin",
+        password="admin",
+        model="Vigor2862",
+        firmware="3.9.6.2",
+        latency=0.0,
+        failure_rate=0.0,
+        reboot_seconds=1.0,
+        disabled=(),
+        certfile=None,
+        keyfile=None,
+        seed=None,
+    ):
+        """Create a simulated router. Call start to serve it.
+
+        :param host: address to listen on (Default: 127.0.0.1)
+        :param port: port to listen on (Default: 0, any free port)
+        :param username: Web admin account username (Default: admin)
+        :param password: Web admin account password (Default: admin)
+        :param model: Router model shown on the dashboard (Default: Vigor2862)
+        :param firmware: Firmware version shown on the dashboard (Default: 3.9.6.2)
+        :param latency: seconds each request is delayed by (Default: 0)
+        :param failure_rate: fraction of requests answered with 503 Service Unavailable (Default: 0)
+        :param reboot_seconds: seconds the router is unavailable for while rebooting (Default: 1)
+        :param disabled: form keys of fields shown disabled, e.g. SNMPMngHostIP2
+        :param certfile: PEM certificate to serve HTTPS with (Default: None, serve HTTP)
+        :param keyfile: PEM private key, if not in certfile
+        :param seed: random seed for failure injection, for repeatable runs
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.model = model
+        self.firmware = firmware
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.reboot_seconds = reboot_seconds
+        self.disabled = set(disabled)
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.router_name = "DrayTek"
+        self.dsl_version = "08-0D-01-09-01-07"
+        self.modem_version = "08-0D-01-09"
+        self.serial = "2862000000001"
+        self.lan_mac = "00:1D:AA:00:00:01"
+        self.lan_ip = "192.168.1.1"
+        self.wan_ip = "203.0.113.1"
+        self.settings = self.factory_settings()
+        self.requests = Counter()
+        self.reboots = 0
+        self.server = None
+        self.booted = monotonic()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions = set()
+        self._pending_firmware = None
+        self._stopped = True
+
+    def __setattr__(self, name, value):
+        if name in ("latency", "reboot_seconds"):
+            value = float(value)
+            if value < 0:
+                raise ValueError(f"{name} must not be negative: {value}")
+        elif name == "failure_rate":
+            value = float(value)
+            if not 0 <= value <= 1:
+                raise ValueError(f"Failure rate must be between 0 and 1: {value}")
+        super(RouterSimulator, self).__setattr__(name, value)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        """str: Web admin console URL, e.g. http://127.0.0.1:8080."""
+        scheme = "https" if self.certfile else "http"
+        return f"{scheme}://{self.host}:{self.port}"
+
+    @staticmethod
+    def factory_settings():
+        """Return the settings of a new router.
+
+        :returns: dictionary of {form key: value}
+        """
+        settings = {}
+        for form in (SNMP_FORM, MANAGEMENT_FORM):
+            for kind, name, _, key in form.fields:
+                default = False if kind in ["Checkbox", "InputRadio"] else ""
+                if kind == "Select":
+                    default = SELECT_OPTIONS.get(name, [""])[0]
+                settings[key] = FACTORY_SETTINGS.get(key, default)
+        return settings
+
+    def start(self):
+        """Start serving in a background thread."""
+        server = ThreadingHTTPServer((self.host, self.port), SimulatorRequestHandler)
+        server.simulator = self
+        if self.certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.certfile, self.keyfile)
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+        # Keep the port chosen, so the router comes back at the same address after a reboot
+        self.port = server.server_address[1]
+        self.server = server
+        self.booted = monotonic()
+        self._stopped = False
+        # Poll often, so stopping for a reboot isn't held up
+        threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        LOGGER.info(f"Simulating {self.model} at {self.url}")
+
+    def stop(self):
+        """Stop serving, including after a reboot in progress."""
+        self._stopped = True
+        server, self.server = self.server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def wait_until_serving(self, timeout=10):
+        """Wait for the router to be served again after a reboot.
+
+        :param timeout: seconds to wait
+        :returns: True if serving, False if the timeout passed first
+        """
+        deadline = monotonic() + timeout
+        while self.server is None:
+            if self._stopped or monotonic() > deadline:
+                return False
+            sleep(0.01)
+        return True
+
+    def reboot(self, factory_reset=False):
+        """Restart the router: stop serving, log every session out and install any firmware uploaded.
+
+        Returns straight away. The router is served again after reboot_seconds.
+
+        :param factory_reset: True to restore the factory settings
+        """
+        server, self.server = self.server, None
+        if server is None:
+            return
+        with self._lock:
+            self._sessions.clear()
+            self.reboots += 1
+            if self._pending_firmware:
+                self.firmware, self._pending_firmware = self._pending_firmware, None
+            if factory_reset:
+                self.settings = self.factory_settings()
+        LOGGER.info(f"Simulated {self.model} rebooting for {self.reboot_seconds}s")
+
+        def restart():
+            server.shutdown()
+            server.server_close()
+            sleep(self.reboot_seconds)
+            if not self._stopped:
+                self.start()
+
+        threading.Thread(target=restart, daemon=True).start()
+
+    def count(self, method, path):
+        """Record a request.
+
+        :param method: HTTP method
+        :param path: URL path
+        """
+        with self._lock:
+            self.requests[(method, path)] += 1
+
+    def inject_failure(self):
+        """Return True if a request should fail, at the failure rate."""
+        if not self.failure_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+    def login(self, username, password):
+        """Start a session if the login details match.
+
+        :param username: username posted
+        :param password: password posted
+        :returns: session id (str), or None if the login details don't match
+        """
+        if username != self.username or password != self.password:
+            return None
+        session_id = token_hex(16)
+        with self._lock:
+            self._sessions.add(session_id)
+        return session_id
+
+    def logged_in(self, session_id):
+        """Return True if the session id belongs to a session started since the last reboot."""
+        with self._lock:
+            return session_id in self._sessions
+
+    def login_page(self, error=""):
+        """Return the login page HTML, with an error message if given."""
+        return DOCUMENT.format(title=self.model, body=LOGIN_FORM.format(error=error))
+
+    def frameset(self):
+        """Return the HTML of the home page, once logged in."""
+        return FRAMESET.format(title=self.model)
+
+    def page(self, path):
+        """Return the HTML of a page.
+
+        :param path: URL path
+        :returns: HTML (str), or None if there is no such page
+        """
+        if path == "/":
+            return self.frameset()
+        if path == "/header.htm":
+            header = {
+                "sSysName": self.model,
+                "sSysVer": self.firmware,
+                "sFwNameLeading": self.model.replace("Vigor", "v"),
+            }
+            script = "".join(
+                f"var {name} = {json.dumps(value)};" for name, value in header.items()
+            )
+            return DOCUMENT.format(
+                title="header", body=f"<script>{script}</script>{self.model}"
+            )
+        if path == "/menu.htm":
+            items = "<br>".join(
+                f'<a href="{href}" target="{MenuNavigator.frame_main}">{link.locator[1]}</a>'
+                for href, link in (
+                    ("/doc/snmp.htm", MenuNavigator.menu_snmp),
+                    ("/doc/mng.htm", MenuNavigator.menu_management),
+                    ("/doc/reboot.htm", MenuNavigator.menu_reboot_system),
+                    ("/doc/upgrade.htm", MenuNavigator.menu_firmware_upgrade),
+                )
+            )
+            toggle = MenuNavigator.menu_system_maintenance.locator[1]
+            return DOCUMENT.format(
+                title="menu", body=MENU.format(toggle=toggle, items=items)
+            )
+        if path == "/doc/dashboard.htm":
+            return DOCUMENT.format(title="Dashboard", body=self.dashboard())
+        if path == "/doc/reboot.htm":
+            return self.reboot_page()
+        if path == "/doc/upgrade.htm":
+            return DOCUMENT.format(
+                title="Firmware Upgrade",
+                body='<iframe name="cfgMain" src="/doc/upgrade_form.htm" width="100%" height="400"></iframe>',
+            )
+        if path == "/doc/upgrade_form.htm":
+            return DOCUMENT.format(title="Firmware Upgrade", body=UPGRADE_FORM)
+        if path == "/cgi-bin/restart.cgi":
+            return DOCUMENT.format(title="Restart", body="Restarting")
+        form = SETTINGS_PAGES.get(path)
+        if form is None:
+            return None
+        with self._lock:
+            body = form.render(self.settings, self.disabled)
+        return DOCUMENT.format(title=form.page_type.__name__, body=body)
+
+    def dashboard(self):
+        """Return the dashboard system information table HTML."""
+        seconds = int(monotonic() - self.booted)
+        rows = [
+            ("Model Name", self.model),
+            ("Router Name", self.router_name),
+            ("Firmware Version", self.firmware),
+            ("DSL Version", None),
+            (
+                "System Up Time",
+                f"{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}",
+            ),
+            ("Serial Number", self.serial),
+            ("LAN MAC Address", self.lan_mac),
+            ("LAN IP Address", self.lan_ip),
+            ("WAN IP Address", self.wan_ip),
+        ]
+        cells = "".join(
+            (
+                f"<tr><td>{label}</td><td>{escape(value)}</td></tr>"
+                if value is not None
+                # The DSL version is in a third column
+                else f"<tr><td>{label}</td><td></td><td>{escape(self.dsl_version)}</td></tr>"
+            )
+            for label, value in rows
+        )
+        return (
+            '<div id="blksysinfo"><table><tbody>'
+            f'<tr><th colspan="2">System Information</th></tr>{cells}'
+            "</tbody></table></div>"
+        )
+
+    def reboot_page(self):
+        """Return the Reboot System page HTML, also shown when a settings change needs a reboot."""
+        state = {"sReboot=Current": True, "sReboot=Default": False}
+        return DOCUMENT.format(
+            title="Reboot System", body=REBOOT_FORM.render(state, ())
+        )
+
+    def post(self, path, data):
+        """Handle a settings form post.
+
+        :param path: URL path posted to
+        :param data: dictionary of posted {field name: value}
+        :returns: (HTML or None if there is no such form, function to call once the response is sent)
+        """
+        if path == REBOOT_FORM.action:
+            factory_reset = data.get("sReboot") == "Default"
+            return (
+                DOCUMENT.format(title="Reboot System", body="Rebooting"),
+                lambda: self.reboot(factory_reset=factory_reset),
+            )
+        for page_path, form in SETTINGS_PAGES.items():
+            if path == form.action:
+                with self._lock:
+                    changed = form.apply(self.settings, self.disabled, data)
+                if any(key.partition("=")[0] in REBOOT_FIELDS for key in changed):
+                    return self.reboot_page(), None
+                return self.page(page_path), None
+        return None, None
+
+    def preview_firmware(self, upload):
+        """Return the preview of an uploaded firmware file.
+
+        :param upload: file content
+        :returns: HTML (str)
+        """
+        model, version = parse_firmware_header(upload[:HEADER_SCAN_BYTES])
+        body = UPGRADE_PREVIEW.format(
+            model=escape(model or self.model),
+            firmware=escape(version or ""),
+            modem=escape(self.modem_version),
+        )
+        return DOCUMENT.format(title="Firmware Preview", body=body)
+
+    def upgrade_firmware(self, upload):
+        """Accept an uploaded firmware file, installed by the next reboot.
+
+        :param upload: file content
+        :returns: HTML (str)
+        """
+        _, version = parse_firmware_header(upload[:HEADER_SCAN_BYTES])
+        with self._lock:
+            self._pending_firmware = version or self.firmware
+        return DOCUMENT.format(title="Firmware Upgrade", body=UPGRADE_DONE)
+
+
+def main(argv=None):
+    """Serve a simulated router until interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Serve a simulated DrayTek web administration console"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--username", default="admin", help="Login username")
+    parser.add_argument("--password", default="admin", help="Login password")
+    parser.add_argument("--model", default="Vigor2862", help="Router model")
+    parser.add_argument("--firmware", default="3.9.6.2", help="Firmware version")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds each request is delayed by"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 503 Service Unavailable",
+    )
+    parser.add_argument(
+        "--reboot-seconds",
+        type=float,
+        default=1.0,
+        help="Seconds the router is unavailable for while rebooting",
+    )
+    parser.add_argument("--certfile", help="PEM certificate, to serve HTTPS")
+    parser.add_argument(
+        "--keyfile", help="PEM private key, if not in the certificate file"
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for failure injection")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    simulator = RouterSimulator(
+        host=args.host,
+        port=args.port,
+        username=args.username,
+        password=args.password,
+        model=args.model,
+        firmware=args.firmware,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        reboot_seconds=args.reboot_seconds,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+        seed=args.seed,
+    )
+    simulator.start()
+    try:
+        while True:
+            sleep(3600)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
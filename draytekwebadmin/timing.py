@@ -0,0 +1,225 @@
+"""Draytek Web Admin - Timing Report."""
+
+import csv
+import json
+import logging
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from time import perf_counter, time
+
+LOGGER = logging.getLogger("root")
+
+# Phases recorded by DrayTekWebAdmin, in the order they are reported
+PHASES = [
+    "session",
+    "login",
+    "routerinfo",
+    "navigation",
+    "read",
+    "write",
+    "reboot",
+    "upgrade_preview",
+    "upgrade",
+    "upgrade_transfer",
+    "reboot_wait",
+]
+# Router details reported with the timings
+ROUTER_DETAILS = ["model", "firmware", "router_name"]
+
+# hostname: router the event is for
+# phase: step timed, one of PHASES
+# detail: what the step was for e.g. settings type SNMPIPv4 or menu item Management, or None
+# started: time the step started (seconds since the epoch)
+# seconds: seconds taken
+# ok: False if the step raised an exception
+# nested: True if the step was timed within another step e.g. navigation within read, so isn't added to totals
+TimingEvent = namedtuple(
+    "TimingEvent",
+    ["hostname", "phase", "detail", "started", "seconds", "ok", "nested"],
+)
+
+
+class TimingRecorder:
+    """Collects timing events from DrayTekWebAdmin operations on a fleet of routers.
+
+    One recorder is shared by the sessions of a fleet run, and reports the time spent per router
+    and per phase, so slow sites, slow firmware versions and the dominant cost of a run stand out.
+    """
+
+    def __init__(self):
+        """Create a new TimingRecorder."""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._events = []
+        self._routers = {}
+
+    def record(self, hostname, phase, seconds, detail=None, ok=True, nested=False):
+        """Record a step timed elsewhere, e.g. the firmware upload measured by the page object.
+
+        :param hostname: Router hostname
+        :param phase: step timed, one of PHASES
+        :param seconds: seconds taken
+        :param detail: what the step was for (Default: None)
+        :param ok: False if the step failed (Default: True)
+        :param nested: True if within another step, so not added to totals (Default: False)
+        """
+        event = TimingEvent(
+            hostname, phase, detail, time() - seconds, seconds, ok, nested
+        )
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def time(self, hostname, phase, detail=None):
+        """Time the steps within a with block.
+
+        :param hostname: Router hostname
+        :param phase: step timed, one of PHASES
+        :param detail: what the step was for (Default: None)
+        """
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        started = time()
+        clock = perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self._local.depth = depth
+            event = TimingEvent(
+                hostname,
+                phase,
+                detail,
+                started,
+                perf_counter() - clock,
+                ok,
+                depth > 0,
+            )
+            with self._lock:
+                self._events.append(event)
+
+    def timer(self, hostname):
+        """Return a callable timing steps for one router.
+
+        :param hostname: Router hostname
+        :returns: callable taking phase and detail, returning a context manager
+        """
+        return partial(self.time, hostname)
+
+    def annotate(self, hostname, **details):
+        """Record details of a router reported with its timings e.g. model and firmware.
+
+        :param hostname: Router hostname
+        :param details: detail values, by name
+        """
+        with self._lock:
+            self._routers.setdefault(hostname, {}).update(details)
+
+    def events(self):
+        """Return the events recorded, in the order they finished.
+
+        :returns: list of TimingEvent
+        """
+        with self._lock:
+            return list(self._events)
+
+    def report(self):
+        """Summarise the events per router and per phase.
+
+        :returns: dictionary of:
+                  routers - list, in the order first seen, of the router details with total seconds,
+                  seconds by phase and number of failed steps
+                  phases - dictionary of {phase: count, total and maximum seconds}
+                  seconds - total seconds of all routers
+        """
+        with self._lock:
+            events = list(self._events)
+            details = {hostname: dict(info) for hostname, info in self._routers.items()}
+        routers = {}
+        phases = {}
+        for event in events:
+            router = routers.get(event.hostname)
+            if router is None:
+                info = details.get(event.hostname, {})
+                router = {
+                    "hostname": event.hostname,
+                    **{name: info.get(name) for name in ROUTER_DETAILS},
+                    "seconds": 0.0,
+                    "failures": 0,
+                    "phases": {},
+                }
+                routers[event.hostname] = router
+            router["phases"][event.phase] = (
+                router["phases"].get(event.phase, 0.0) + event.seconds
+            )
+            if not event.nested:
+                router["seconds"] += event.seconds
+            if not event.ok and not event.nested:
+                router["failures"] += 1
+            phase = phases.setdefault(
+                event.phase, {"count": 0, "seconds": 0.0, "max": 0.0}
+            )
+            phase["count"] += 1
+            phase["seconds"] += event.seconds
+            phase["max"] = max(phase["max"], event.seconds)
+        order = {phase: index for index, phase in enumerate(PHASES)}
+        return {
+            "routers": list(routers.values()),
+            "phases": dict(
+                sorted(phases.items(), key=lambda item: order.get(item[0], len(order)))
+            ),
+            "seconds": sum(router["seconds"] for router in routers.values()),
+        }
+
+    def write_json(self, path):
+        """Write the report, with every event, to a JSON file.
+
+        :param path: JSON file to write
+        """
+        data = self.report()
+        data["events"] = [event._asdict() for event in self.events()]
+        Path(path).write_text(json.dumps(data, indent=2))
+
+    def write_csv(self, path):
+        """Write the report to a CSV file, a row per router with a column per phase and a total row.
+
+        :param path: CSV file to write
+        """
+        report = self.report()
+        phases = list(report["phases"])
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                ["hostname"] + ROUTER_DETAILS + ["seconds", "failures"] + phases
+            )
+            for router in report["routers"]:
+                writer.writerow(
+                    [router["hostname"]]
+                    + [router[name] for name in ROUTER_DETAILS]
+                    + [f"{router['seconds']:.3f}", router["failures"]]
+                    + [f"{router['phases'].get(phase, 0.0):.3f}" for phase in phases]
+                )
+            writer.writerow(
+                ["TOTAL"]
+                + [None] * len(ROUTER_DETAILS)
+                + [
+                    f"{report['seconds']:.3f}",
+                    sum(router["failures"] for router in report["routers"]),
+                ]
+                + [f"{report['phases'][phase]['seconds']:.3f}" for phase in phases]
+            )
+
+    def write(self, path):
+        """Write the report as CSV if the file name ends .csv, otherwise JSON.
+
+        :param path: file to write
+        """
+        if str(path).lower().endswith(".csv"):
+            self.write_csv(path)
+        else:
+            self.write_json(path)
+        LOGGER.info(f"Timing report written to {path}")
@@ -0,0 +1,152 @@
+"""Draytek Web Admin - WebDriver Tracing."""
+
+import logging
+import sys
+import threading
+from collections import namedtuple
+from time import perf_counter
+
+from draytekwebadmin.pages.basepageobject import BasePageObject
+
+LOGGER = logging.getLogger("root")
+
+# operation: method the commands are attributed to e.g. ManagementPage.read_lan_access_settings
+# command: WebDriver command name e.g. findElement, or None for all commands of the operation
+# count: number of commands sent
+# seconds: total seconds until the commands returned
+CommandTrace = namedtuple("CommandTrace", ["operation", "command", "count", "seconds"])
+
+# Operation of commands sent from outside this package and its page objects
+UNATTRIBUTED = "(other)"
+
+
+def caller_operation(frame):
+    """Name the method a WebDriver command is sent for, from the call stack.
+
+    The outermost page object method is used, e.g. ManagementPage.read_lan_access_settings rather than
+    the helpers it calls, so that the commands are attributed to the step of the operation.
+    Commands sent outside a page object are attributed to the innermost method in this package,
+    e.g. DrayTekWebAdmin.session.
+
+    :param frame: innermost stack frame
+    :returns: operation name (str)
+    """
+    page_method = None
+    package_method = None
+    while frame is not None:
+        owner = frame.f_locals.get("self", frame.f_locals.get("cls"))
+        module = frame.f_globals.get("__name__", "")
+        if isinstance(owner, BasePageObject) or (
+            isinstance(owner, type) and issubclass(owner, BasePageObject)
+        ):
+            owner_name = (
+                owner.__name__ if isinstance(owner, type) else type(owner).__name__
+            )
+            page_method = f"{owner_name}.{frame.f_code.co_name}"
+        elif (
+            package_method is None
+            and module.startswith("draytekwebadmin.")
+            and module != __name__
+        ):
+            package_method = (
+                f"{type(owner).__name__}.{frame.f_code.co_name}"
+                if owner is not None and not isinstance(owner, type)
+                else frame.f_code.co_name
+            )
+        frame = frame.f_back
+    return page_method or package_method or UNATTRIBUTED
+
+
+class WebDriverTracer:
+    """Counts and times the remote WebDriver commands sent by browser sessions.
+
+    Each command e.g. findElement, isElementEnabled, clickElement, switchToFrame or executeScript is
+    attributed to the page object method on the call stack, so the round trips made per router can be
+    traced to the steps which send them. One tracer may be attached to several drivers at once.
+    """
+
+    def __init__(self):
+        """Create a new WebDriverTracer."""
+        self._lock = threading.Lock()
+        self._traces = {}
+
+    def attach(self, driver):
+        """Trace the commands sent by a driver, until detached. Attaching twice has no effect.
+
+        :param driver: Selenium WebDriver
+        """
+        if "execute" in vars(driver):
+            return
+        execute = driver.execute
+        tracer = self
+
+        def traced_execute(driver_command, params=None):
+            started = perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                seconds = perf_counter() - started
+                caller = sys._getframe(1)  # pylint: disable=protected-access
+                tracer.record(caller_operation(caller), driver_command, seconds)
+
+        driver.execute = traced_execute
+
+    @staticmethod
+    def detach(driver):
+        """Stop tracing the commands sent by a driver.
+
+        :param driver: Selenium WebDriver
+        """
+        vars(driver).pop("execute", None)
+
+    def record(self, operation, command, seconds):
+        """Record a command sent.
+
+        :param operation: method the command is attributed to
+        :param command: WebDriver command name
+        :param seconds: seconds until the command returned
+        """
+        with self._lock:
+            count, total = self._traces.get((operation, command), (0, 0.0))
+            self._traces[(operation, command)] = (count + 1, total + seconds)
+
+    def reset(self):
+        """Forget the commands recorded so far."""
+        with self._lock:
+            self._traces = {}
+
+    @property
+    def count(self):
+        """int: Number of commands recorded."""
+        with self._lock:
+            return sum(count for count, _ in self._traces.values())
+
+    def commands(self):
+        """Return the commands recorded, by operation and command, slowest first.
+
+        :returns: list of CommandTrace
+        """
+        with self._lock:
+            traces = [
+                CommandTrace(operation, command, count, seconds)
+                for (operation, command), (count, seconds) in self._traces.items()
+            ]
+        return sorted(traces, key=lambda trace: trace.seconds, reverse=True)
+
+    def operations(self):
+        """Return the commands recorded, totalled by operation, slowest first.
+
+        :returns: list of CommandTrace, with command None
+        """
+        totals = {}
+        for trace in self.commands():
+            count, seconds = totals.get(trace.operation, (0, 0.0))
+            totals[trace.operation] = (count + trace.count, seconds + trace.seconds)
+        return sorted(
+            (
+                CommandTrace(operation, None, count, seconds)
+                for operation, (count, seconds) in totals.items()
+            ),
+            key=lambda trace: trace.seconds,
+            reverse=True,
+        )
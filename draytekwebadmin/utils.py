@@ -3,6 +3,7 @@
 import ipaddress
 import logging
 import re
+from contextlib import contextmanager
 
 from draytekwebadmin.const import (
     IPV4_SUBNET_MAX,
@@ -157,3 +158,12 @@ def port_or_none(value):
     if port is not None and port > MAX_PORT:
         raise ValueError(f"Port exceeds maximum port number {MAX_PORT}")
     return port
+
+
+@contextmanager
+def nullcontext():
+    """Context manager which does nothing, as contextlib.nullcontext which needs Python 3.7.
+
+    :returns: context manager
+    """
+    yield
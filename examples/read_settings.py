@@ -9,6 +9,7 @@ from pathlib import Path
 
 from draytekwebadmin import (
     DrayTekWebAdmin,
+    SessionStore,
     SNMPIPv4,
     SNMPIPv6,
     SNMPTrapIPv4,
@@ -68,6 +69,11 @@ def _get_parser():
         default="draytek-out.csv",
         help="Output data file (default: draytek-out.csv)",
     )
+    parser.add_argument(
+        "--session-store",
+        type=str,
+        help="File of logged in sessions, reused by later runs instead of logging in e.g. --session-store sessions.sqlite",
+    )
     parser.add_argument(
         "-c",
         "--config",
@@ -154,21 +160,22 @@ def read_data(session):
     )
 
     router_info = vars(session.routerinfo)  # Read router info
-    snmp_ipv4 = vars(session.read_settings(SNMPIPv4))
-    snmp_ipv6 = vars(session.read_settings(SNMPIPv6))
-    snmp_trap_ipv4 = vars(session.read_settings(SNMPTrapIPv4))
-    snmp_trap_ipv6 = vars(session.read_settings(SNMPTrapIPv6))
-    snmpv3 = vars(session.read_settings(SNMPv3))
-    internet_access = vars(session.read_settings(InternetAccessControl))
-    access_list = vars(session.read_settings(AccessList))
-    management_port = vars(session.read_settings(ManagementPort))
-    brute_force = vars(session.read_settings(BruteForceProtection))
-    encryption = vars(session.read_settings(Encryption))
-    cvm_access = vars(session.read_settings(CVM_AccessControl))
-    device_management = vars(session.read_settings(DeviceManagement))
-    ap_management = vars(session.read_settings(AP_Management))
-    lan_access = vars(session.read_settings(LAN_Access))
-    ipv6_management = vars(session.read_settings(IPv6Management))
+    current = session.read_all_settings()  # Opens each page and tab once
+    snmp_ipv4 = vars(current[SNMPIPv4])
+    snmp_ipv6 = vars(current[SNMPIPv6])
+    snmp_trap_ipv4 = vars(current[SNMPTrapIPv4])
+    snmp_trap_ipv6 = vars(current[SNMPTrapIPv6])
+    snmpv3 = vars(current[SNMPv3])
+    internet_access = vars(current[InternetAccessControl])
+    access_list = vars(current[AccessList])
+    management_port = vars(current[ManagementPort])
+    brute_force = vars(current[BruteForceProtection])
+    encryption = vars(current[Encryption])
+    cvm_access = vars(current[CVM_AccessControl])
+    device_management = vars(current[DeviceManagement])
+    ap_management = vars(current[AP_Management])
+    lan_access = vars(current[LAN_Access])
+    ipv6_management = vars(current[IPv6Management])
 
     # Rename the dictionary keys to include the object model name
     sep = "|"
@@ -300,6 +307,9 @@ def main():
             search_driver=test_settings.search_driver,
             implicit_wait_time=test_settings.implicit_wait_time,
             explicit_wait_time=test_settings.explicit_wait_time,
+            session_store=(
+                SessionStore(args.session_store) if args.session_store else None
+            ),
         )
         webadmin_session.start_session()
         dataset = read_data(webadmin_session)
@@ -9,7 +9,14 @@ from pathlib import Path
 
 from tabulate import tabulate
 
-from draytekwebadmin import DrayTekWebAdmin, Firmware
+from draytekwebadmin import (
+    DrayTekWebAdmin,
+    Firmware,
+    RolloutScheduler,
+    TimingRecorder,
+    TooliumSessionPool,
+)
+from draytekwebadmin.reachability import preflight_fleet
 
 LOGGER = logging.getLogger("root")
 FORMAT = "[%(levelname)s] %(message)s"
@@ -44,6 +51,56 @@ def _get_parser():
         default=False,
         help="Perform firmware upgrade (inc reboot), preview only",
     )
+    parser.add_argument(
+        "-w",
+        "--wait",
+        type=int,
+        default=0,
+        help="Seconds to wait for each router to return after upgrading, confirming the new firmware (default: don't wait)",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of routers to upgrade at the same time (default: 1)",
+    )
+    parser.add_argument(
+        "--canary",
+        type=int,
+        default=0,
+        help="Number of routers to upgrade first, before any other (default: 0)",
+    )
+    parser.add_argument(
+        "--waves",
+        type=percentages,
+        default=[100],
+        help="Cumulative percentages of routers upgraded by the end of each wave after the canary e.g. 10,50,100 (default: 100)",
+    )
+    parser.add_argument(
+        "--failure-budget",
+        type=float,
+        default=1.0,
+        help="Stop after a wave if more than this fraction of routers so far have failed e.g. 0.05 (default: 1.0, never stop)",
+    )
+    parser.add_argument(
+        "--max-browser-uses",
+        type=int,
+        default=25,
+        help="Number of routers a browser is reused for before it is restarted (default: 25)",
+    )
+    parser.add_argument(
+        "--no-preflight",
+        dest="preflight",
+        action="store_false",
+        default=True,
+        help="Do not check routers can be reached before starting browsers",
+    )
+    parser.add_argument(
+        "--timing-report",
+        type=str,
+        help="File to write the time taken per router and step to, CSV if named .csv otherwise JSON e.g. --timing-report timing.csv",
+    )
     parser.add_argument(
         "-c",
         "--config",
@@ -91,6 +148,30 @@ def dir_path(string):
         raise NotADirectoryError(string)
 
 
+def percentages(string):
+    """Parse a comma separated list of percentages.
+
+    :param string: e.g. "10,50,100"
+    :returns: list of floats
+    """
+    try:
+        return [float(value) for value in string.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid percentages: {string}")
+
+
+def upgrade_failed(result):
+    """Check if upgrading a router failed, for the rollout failure budget.
+
+    :param result: upgrade_and_close result or exception
+    :return: True if the upgrade failed
+    """
+    if isinstance(result, Exception):
+        return True
+    status = result[2]
+    return status is None or status.startswith("ERROR")
+
+
 def read_csv(csvfilename):
     """Read data from CSV file into dictionary
 
@@ -125,9 +206,27 @@ def check_upgrade_router(router, test_settings):
         webadmin_session.search_driver = test_settings.search_driver
         webadmin_session.implicit_wait_time = test_settings.implicit_wait_time
         webadmin_session.explcit_wait_time = test_settings.explicit_wait_time
-        preview = webadmin_session.upgrade_preview(
-            Firmware(filepath=settings["firmware"].filepath)
-        )
+        webadmin_session.session_pool = test_settings.session_pool
+        webadmin_session.timing = test_settings.timing
+        # Skip uploading the file when the router already runs the version named in its header.
+        # The header has no modem version, so routers with modem firmware are still previewed.
+        header = Firmware.from_header(settings["firmware"].filepath)
+        if header.firmware_target:
+            webadmin_session.start_session()
+            header.firmware_current = webadmin_session.routerinfo.firmware
+            if header.up_to_date(modem=bool(webadmin_session.routerinfo.dsl_version)):
+                LOGGER.info(
+                    f"Router {webadmin_session.hostname} - Already on {header.firmware_target}, skipping upload"
+                )
+                return webadmin_session, header
+
+        firmware = Firmware(filepath=settings["firmware"].filepath)
+        if test_settings.upgrade:
+            # Preview and install in one pass, so the firmware file is only uploaded for one page visit
+            webadmin_session.upgrade(firmware)
+            preview = webadmin_session.firmware
+        else:
+            preview = webadmin_session.upgrade_preview(firmware)
         return webadmin_session, preview
 
     except Exception as exception:
@@ -139,7 +238,7 @@ def check_upgrade_router(router, test_settings):
                 # This avoids having another try/except/finally block within this error handling routine.
                 hostname = webadmin_session.hostname
                 page_source = webadmin_session.session.driver.page_source
-                webadmin_session.close_session()
+                webadmin_session.close_session(failed=True)
 
                 debugfile = open(
                     f"draytek_upgrade_debug-{hostname}-{timestamp}.html", "w+"
@@ -147,7 +246,7 @@ def check_upgrade_router(router, test_settings):
                 debugfile.write(page_source)
                 debugfile.close()
             else:
-                webadmin_session.close_session()
+                webadmin_session.close_session(failed=True)
             return webadmin_session, preview
         return None, None
 
@@ -240,32 +339,112 @@ def upgrade_router(router, test_settings):
     router_firmware = None
     upgrade_status_message = None
     upgrade_required = False
-    try:
-        (session, router_firmware) = check_upgrade_router(
-            router=router, test_settings=test_settings
-        )
-        if (session) and (router_firmware):  # Both values not None
-            if (router_firmware.router_firmware_upgradable()) or (
-                router_firmware.modem_firmware_upgradable()
-            ):
-                if test_settings.upgrade:
-                    upgrade_status_message = "UPGRADED!"
-                    LOGGER.info(f"Router {session.hostname} - Upgrading Router")
-                    session.upgrade(router_firmware)
+    (session, router_firmware) = check_upgrade_router(
+        router=router, test_settings=test_settings
+    )
+    if (session) and (router_firmware):  # Both values not None
+        if (router_firmware.router_firmware_upgradable()) or (
+            router_firmware.modem_firmware_upgradable()
+        ):
+            if test_settings.upgrade:
+                LOGGER.info(
+                    f"Router {session.hostname} - Upgraded Router, uploaded "
+                    f"{router_firmware.transfer_bytes} bytes in {router_firmware.transfer_seconds:.1f}s"
+                )
+                if test_settings.wait:
+                    try:
+                        recovery = session.wait_until_available(test_settings.wait)
+                    except Exception as exception:
+                        # Counted against the rollout failure budget, like any other error
+                        LOGGER.critical(exception)
+                        session.close_session(failed=True)
+                        upgrade_status_message = (
+                            f"ERROR: not back after upgrade: {exception}"
+                        )
+                    else:
+                        if recovery.firmware_confirmed:
+                            upgrade_status_message = (
+                                f"UPGRADED! Back after {recovery.downtime:.0f}s"
+                            )
+                        else:
+                            upgrade_status_message = (
+                                f"ERROR: Running {recovery.firmware} after upgrade"
+                            )
                 else:
-                    upgrade_required = True
-                    upgrade_status_message = "Upgrade Required"
+                    upgrade_status_message = "UPGRADED!"
             else:
-                upgrade_status_message = "N/A"
-                LOGGER.info(f"Router {session.hostname} - Firmware up-to-date")
+                upgrade_required = True
+                upgrade_status_message = "Upgrade Required"
         else:
-            upgrade_status_message = "ERROR: Unable to access Firmware information"
+            upgrade_status_message = "N/A"
+            LOGGER.info(f"Router {session.hostname} - Firmware up-to-date")
+    else:
+        upgrade_status_message = "ERROR: Unable to access Firmware information"
+        if session:
             LOGGER.info(
                 f"Router {session.hostname} - Unable to access Firmware information"
             )
-        return session, router_firmware, upgrade_status_message, upgrade_required
-    finally:
-        return session, router_firmware, upgrade_status_message, upgrade_required
+    return session, router_firmware, upgrade_status_message, upgrade_required
+
+
+def preflight_routers(datasource, results, config_dir=None):
+    """Check which routers can be reached, at the same time, before starting any browser
+
+    :param datasource: rows from CSV, one per router
+    :param results: results table, a row is added for each router which can't be reached
+    :param config_dir: path to configuration file for toolium
+    :return: rows of the routers which can be reached
+    """
+    connections = [
+        extract_settings(router, config_dir)["connection"] for router in datasource
+    ]
+    reachable = []
+    for router, check in zip(datasource, preflight_fleet(connections)):
+        if check.reachable:
+            LOGGER.info(
+                f"Router {check.hostname} - Reachable in {check.latency * 1000:.0f}ms"
+            )
+            reachable.append(router)
+        else:
+            results.add_row(
+                [check.hostname, "", "", "", "", "", "", f"UNREACHABLE: {check.error}"]
+            )
+    return reachable
+
+
+def router_hostname(router, config_dir=None):
+    """Hostname of a router, for results rows of routers without a session
+
+    :param router: row from CSV with settings for a single router
+    :param config_dir: path to configuration file for toolium
+    :return: hostname
+    """
+    return extract_settings(router, config_dir)["connection"].hostname
+
+
+def upgrade_and_close(router, test_settings):
+    """Upgrade router firmware, or preview potential upgrade, then close the browser session
+
+    :param router: connection information from csv input file
+    :param test_settings: collection of test settings
+    :return: webadmin_session, router firmware object, status message, upgrade required Boolean
+    """
+    (session, firmware, status, upgrade_required) = upgrade_router(
+        router=router, test_settings=test_settings
+    )
+    if session is not None:
+        session.close_session()
+    return session, firmware, status, upgrade_required
+
+
+def first_word(text):
+    """First word of text, or empty string if there isn't one (e.g. modem firmware not read from the router)
+
+    :param text: string or None
+    :return: first word
+    """
+    words = (text or "").split()
+    return words[0] if words else ""
 
 
 def result_row_builder(session, status, firmware=None, router_name=None):
@@ -284,15 +463,17 @@ def result_row_builder(session, status, firmware=None, router_name=None):
             session.routerinfo.model,
             session.routerinfo.router_name,
             firmware.firmware_current,
-            firmware.modem_firmware_current.split()[0],
+            first_word(firmware.modem_firmware_current),
             firmware.firmware_target,
-            firmware.modem_firmware_target.split()[0],
+            first_word(firmware.modem_firmware_target),
             status,
         ]
     elif (session) and (len(status) > 0):
         row = [session.hostname, "", "", "", "", "", "", status]
     elif session:
         row = [session.hostname, "", "", "", "", "", "", "ERROR!"]
+    elif (router_name) and (len(status) > 0):
+        row = [router_name, "", "", "", "", "", "", status]
     elif router_name:
         row = [router_name, "", "", "", "", "", "", "ERROR!"]
     else:
@@ -327,6 +508,7 @@ class TestSettings:
     def __init__(
         self,
         upgrade=None,
+        wait=0,
         config_dir=None,
         browser=None,
         headless=None,
@@ -334,10 +516,13 @@ class TestSettings:
         implicit_wait_time=None,
         explicit_wait_time=None,
         debug=False,
+        session_pool=None,
+        timing=None,
     ):
         """"Test Environment settings.
 
         :param upgrade: Flag to upgrade should not be attempted or just previewed
+        :param wait: seconds to wait for routers to return after upgrading (0 to not wait)
         :param config_dir: Path to toolium configuration file
         :param browser: browser name to override configuration file
         :param headless: headless session, to override configuration file
@@ -345,8 +530,11 @@ class TestSettings:
         :param implicit_wait_time: WebDriver implicit wait time, override configuration file
         :param explicit_wait_time: WebDriver explicit wait time, override configuration file
         :param debug: flag to trigger debug behaviours
+        :param session_pool: pool of browser sessions shared between routers
+        :param timing: recorder of the time taken per router and step
         """
         self.upgrade = upgrade
+        self.wait = wait
         self.config_dir = config_dir
         self.browser = browser
         self.headless = headless
@@ -354,6 +542,8 @@ class TestSettings:
         self.implicit_wait_time = implicit_wait_time
         self.explicit_wait_time = explicit_wait_time
         self.debug = debug
+        self.session_pool = session_pool
+        self.timing = timing
 
 
 def main():
@@ -373,16 +563,17 @@ def main():
         ]
     )
     upgrade_pending_count = 0
-    session = None
     argv = None
     parser = _get_parser()
     args = parser.parse_args(argv)
+    test_settings = None
     try:
         if args.template:
             create_template_csv(args.template)
         elif args.inputfile:
             test_settings = TestSettings(
                 upgrade=args.upgrade,
+                wait=args.wait,
                 config_dir=args.config,
                 browser=args.browser,
                 headless=args.headless,
@@ -390,18 +581,60 @@ def main():
                 implicit_wait_time=args.implicit_wait,
                 explicit_wait_time=args.explicit_wait,
                 debug=args.debug,
+                session_pool=TooliumSessionPool(
+                    max_size=args.concurrency,
+                    max_uses=args.max_browser_uses,
+                    config_dir=args.config,
+                    browser=args.browser,
+                    search_driver=args.search_driver,
+                    headless=args.headless,
+                    implicit_wait=args.implicit_wait,
+                    explicit_wait=args.explicit_wait,
+                ),
+                timing=TimingRecorder() if args.timing_report else None,
             )
             datasource = read_csv(args.inputfile)
-            for router in datasource:
-                (session, firmware, status, upgrade_required) = upgrade_router(
-                    router=router, test_settings=test_settings
-                )
+            if args.preflight:
+                datasource = preflight_routers(datasource, results, args.config)
+
+            # Upgrade routers in waves, in parallel within a wave. Results are returned in input order
+            rollout = RolloutScheduler(
+                canary=args.canary,
+                waves=args.waves,
+                failure_budget=args.failure_budget,
+                concurrency=args.concurrency,
+                failed=upgrade_failed,
+            ).run(datasource, upgrade_and_close, test_settings=test_settings)
+            for router, result in zip(datasource, rollout.results):
+                if result is None:
+                    results.add_row(
+                        result_row_builder(
+                            None,
+                            "SKIPPED",
+                            router_name=router_hostname(router, args.config),
+                        )
+                    )
+                    continue
+                if isinstance(result, Exception):
+                    results.add_row(
+                        result_row_builder(
+                            None,
+                            f"ERROR: {result}",
+                            router_name=router_hostname(router, args.config),
+                        )
+                    )
+                    continue
+                (session, firmware, status, upgrade_required) = result
                 if upgrade_required:
                     upgrade_pending_count += 1
-
                 results.add_row(result_row_builder(session, status, firmware))
-                results.print()
-                session.close_session()
+            results.print()
+            if test_settings.timing is not None:
+                test_settings.timing.write(args.timing_report)
+            if rollout.halted:
+                print(
+                    f"\nRollout halted after wave {rollout.waves}: {rollout.failures} routers failed"
+                )
             if upgrade_pending_count > 0:
                 print("\nUpgrades required! Re-run with --upgrade (or -u) argument")
 
@@ -410,11 +643,10 @@ def main():
     except OSError as os_err:
         LOGGER.critical(f"OSError: {os_err}")
     except Exception as e:
-        if session:
-            results.add_row(
-                result_row_builder(session=session, status=status, router_name=router)
-            )
         LOGGER.critical(f"Error: {e}")
+    finally:
+        if test_settings is not None:
+            test_settings.session_pool.close()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 import argparse
 import csv
+import hashlib
 import logging
 import time
 from urllib.parse import urlparse
@@ -11,6 +12,12 @@ from tabulate import tabulate
 
 from draytekwebadmin import (
     DrayTekWebAdmin,
+    FleetExecutor,
+    JobJournal,
+    SessionStore,
+    SettingsCache,
+    TimingRecorder,
+    TooliumSessionPool,
     SNMPIPv4,
     SNMPIPv6,
     SNMPTrapIPv4,
@@ -27,11 +34,16 @@ from draytekwebadmin import (
     LAN_Access,
     IPv6Management,
 )
+from draytekwebadmin.reachability import preflight_fleet
 
 LOGGER = logging.getLogger("root")
 FORMAT = "[%(levelname)s] %(message)s"
 logging.basicConfig(format=FORMAT)
 LOGGER.setLevel(logging.ERROR)
+# Journal status of settings written which need the router to reboot
+REBOOT_REQUIRED = "reboot required"
+# Fields the web console masks, so settings written can't be read back to verify them
+MASKED_FIELDS = ("auth_password", "priv_password")
 
 
 def _get_parser():
@@ -68,6 +80,52 @@ def _get_parser():
         default=True,
         help="Do not reboot routers after configuration change, even if required",
     )
+    parser.add_argument(
+        "--no-preflight",
+        dest="preflight",
+        action="store_false",
+        default=True,
+        help="Do not check routers can be reached before starting browsers",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        help="Cache file of settings read from routers, reused by later runs e.g. --cache settings.sqlite",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=3600,
+        help="Seconds cached settings are used for (default: 3600)",
+    )
+    parser.add_argument(
+        "--session-store",
+        type=str,
+        help="File of logged in sessions, reused by later runs instead of logging in e.g. --session-store sessions.sqlite",
+    )
+    parser.add_argument(
+        "--timing-report",
+        type=str,
+        help="File to write the time taken per router and step to, CSV if named .csv otherwise JSON e.g. --timing-report timing.csv",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help="Journal file of each router's progress. Re-running the same job resumes it, skipping routers already done e.g. --journal journal.sqlite",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of routers to configure at the same time (default: 1)",
+    )
+    parser.add_argument(
+        "--max-browser-uses",
+        type=int,
+        default=25,
+        help="Number of routers a browser is reused for before it is restarted (default: 25)",
+    )
     parser.add_argument(
         "-c",
         "--config",
@@ -177,6 +235,29 @@ def diff(current, new):
     return differences
 
 
+def unapplied_settings(session, settings):
+    """Read settings back after writing them, listing the values the router doesn't have
+
+    :param session: DrayTekWebAdmin session object
+    :param settings: settings objects written
+    :returns: List of strings showing differences, empty if all the settings were applied
+    """
+    current = session.read_all_settings([type(setting) for setting in settings])
+    differences = []
+    for setting in settings:
+        dict_current = vars(current[type(setting)])
+        for key, requested in vars(setting).items():
+            if requested is None or key in MASKED_FIELDS:
+                continue
+            value = dict_current.get(key)
+            # None is the same as False and an empty value
+            if value != requested and ((value) or (requested)):
+                differences.append(
+                    f"{type(setting).__name__} {key}: CURRENT = {value} | NEW = {requested}"
+                )
+    return differences
+
+
 def configure_router(router, allow_reboot, test_settings):
     """ Apply router configuration specified
 
@@ -185,6 +266,7 @@ def configure_router(router, allow_reboot, test_settings):
     :param test_settings: collection of test settings
     :return: webadmin_session
     :return: Configuration status message
+    :return: True if configuring the router failed, so its browser session must not be reused
     """
     webadmin_session = None
     reboot_required = False
@@ -194,73 +276,237 @@ def configure_router(router, allow_reboot, test_settings):
         settings = extract_settings(router)
 
         webadmin_session = settings["connection"]
+        if test_settings.journal is not None:
+            # Settings written by an interrupted run may still need the router to reboot
+            reboot_required = reboot_pending(
+                test_settings.journal, router_key(webadmin_session)
+            )
         webadmin_session.config_dir = test_settings.config_dir
         webadmin_session.browser = test_settings.browser
         webadmin_session.headless = test_settings.headless
         webadmin_session.search_driver = test_settings.search_driver
         webadmin_session.implicit_wait_time = test_settings.implicit_wait_time
         webadmin_session.explcit_wait_time = test_settings.explicit_wait_time
+        webadmin_session.session_pool = test_settings.session_pool
+        webadmin_session.settings_cache = test_settings.settings_cache
+        webadmin_session.session_store = test_settings.session_store
+        webadmin_session.timing = test_settings.timing
         # Not strictly needed, since configuring modules will trigger connect.
         # But this way we can ensure we ensure we can connect outside the for loop.
         webadmin_session.start_session()
-        for modulename in settings:
+        journal_record(test_settings, webadmin_session, "connected")
+        modules = [
+            modulename
+            for modulename in settings
+            if modulename not in ("connection", "info")  # Ignore these
+        ]
+        current = webadmin_session.read_all_settings(
+            [type(settings[modulename]) for modulename in modules]
+        )
+        journal_record(test_settings, webadmin_session, "read")
+        changed = []
+        router_configure_status = "No changes required"
+        for modulename in modules:
             LOGGER.debug(f"Processing modulename: {modulename}")
-            if modulename not in ("connection", "info"):  # Ignore these
-                newsettings = settings[modulename]
-                LOGGER.info(
-                    f"Module: {modulename} of type {type(newsettings)} found. Applying settings"
-                )
-                current = webadmin_session.read_settings(type(settings[modulename]))
-                differences = diff(current, newsettings)
-                if len(differences) > 0:
-                    if test_settings.what_if:
-                        for change in differences:
-                            router_configure_status = (
-                                "WhatIf Mode - Changes not applied"
-                            )
-                            print(
-                                f"[WhatIf] {webadmin_session.hostname} : {modulename} - {change}"
-                            )
-                    else:
-                        reboot_requested = webadmin_session.write_settings(newsettings)
-                        router_configure_status = "Updated"
-                        if reboot_requested:
-                            reboot_required = True
+            newsettings = settings[modulename]
+            LOGGER.info(
+                f"Module: {modulename} of type {type(newsettings)} found. Applying settings"
+            )
+            differences = diff(current[type(newsettings)], newsettings)
+            if len(differences) > 0:
+                if test_settings.what_if:
+                    for change in differences:
+                        router_configure_status = "WhatIf Mode - Changes not applied"
+                        print(
+                            f"[WhatIf] {webadmin_session.hostname} : {modulename} - {change}"
+                        )
                 else:
-                    router_configure_status = "No changes required"
+                    changed.append(newsettings)
+        if changed:
+            # Settings sharing a page are applied with a single submit
+            if webadmin_session.write_settings_batch(changed):
+                reboot_required = True
+            router_configure_status = "Updated"
+            journal_record(
+                test_settings,
+                webadmin_session,
+                "written",
+                REBOOT_REQUIRED if reboot_required else None,
+            )
+        elif not test_settings.what_if:
+            journal_record(test_settings, webadmin_session, "verified")
         if reboot_required:
             LOGGER.info("Router Reboot required to apply configuration changes")
             if allow_reboot:
                 LOGGER.info(f"Rebooting Router: {webadmin_session.hostname}")
-                webadmin_session.reboot_router()
+                webadmin_session.reboot()
                 router_configure_status = "Updated & router restarted"
+                journal_record(test_settings, webadmin_session, "rebooted")
+                if changed:
+                    # Log in again once the router is back, to read the settings written
+                    webadmin_session.wait_until_available()
             else:
                 router_configure_status = "Updated. REBOOT REQUIRED"
-                print(
-                    f"Reboot required to complete configuration of {webadmin_session.hostname}"
+        if changed:
+            # Fields disabled or not found on the page are skipped when writing, so check what was applied
+            differences = unapplied_settings(webadmin_session, changed)
+            if differences:
+                router_configure_status = (
+                    f"ERROR: Settings not applied: {'; '.join(differences)}"
                 )
-        else:
+                LOGGER.error(
+                    f"Router {webadmin_session.hostname} - {router_configure_status}"
+                )
+                # Not done, so the router is configured again when the job is resumed
+                journal_record(
+                    test_settings, webadmin_session, "failed", router_configure_status
+                )
+                return webadmin_session, router_configure_status, False
+            journal_record(test_settings, webadmin_session, "verified")
+        if reboot_required and not allow_reboot:
+            print(
+                f"Reboot required to complete configuration of {webadmin_session.hostname}"
+            )
+        elif not reboot_required:
             print(f"Router: {webadmin_session.hostname} - Reconfiguration completed")
+        journal_record(test_settings, webadmin_session, "done", router_configure_status)
 
-        return webadmin_session, router_configure_status
+        return webadmin_session, router_configure_status, False
 
     except Exception as exception:
         LOGGER.critical(exception)
         if webadmin_session is not None:
+            journal_record(test_settings, webadmin_session, "failed", str(exception))
             if test_settings.debug:
                 timestamp = time.strftime("%Y%m%d-%H%M%S")
-                # Collect the information from the session object and close it before attempting file access in case that fails
-                # This avoids having another try/except/finally block within this error handling routine.
-                hostname = webadmin_session.hostname
-                page_source = webadmin_session.session.driver.page_source
-                webadmin_session.close_session()
-
-                debugfile = open(
-                    f"draytek_write_settings_debug-{hostname}-{timestamp}.html", "w+"
-                )
-                debugfile.write(page_source)
-                debugfile.close()
-        return webadmin_session, router_configure_status
+                # The session is closed by the caller, so don't let saving the page raise
+                try:
+                    page_source = webadmin_session.session.driver.page_source
+                    with open(
+                        f"draytek_write_settings_debug-{webadmin_session.hostname}-{timestamp}.html",
+                        "w+",
+                    ) as debugfile:
+                        debugfile.write(page_source)
+                except Exception as debug_exception:
+                    LOGGER.error(f"Unable to save debug page: {debug_exception}")
+        return webadmin_session, router_configure_status, True
+
+
+def router_key(session):
+    """Key of a router in the job journal
+
+    :param session: DrayTekWebAdmin session object
+    :returns: hostname and port e.g. 192.168.1.1:443
+    """
+    return f"{session.hostname}:{session.port}"
+
+
+def router_hostname(router):
+    """Hostname of a router, for results rows of routers without a session
+
+    :param router: row from CSV with settings for a single router
+    :return: hostname
+    """
+    return extract_settings(router)["connection"].hostname
+
+
+def journal_job(args):
+    """Name of the job in the journal, the same when the same input file is run again with the same options
+
+    :param args: parsed command line arguments
+    :returns: job name
+    """
+    with open(args.inputfile, "rb") as inputfile:
+        digest = hashlib.sha256(inputfile.read()).hexdigest()[:16]
+    return f"write_settings:{digest}:reboot={args.reboot}:whatif={args.whatif}"
+
+
+def journal_record(test_settings, session, state, status=None):
+    """Record a router reaching a state in the job journal, if there is one
+
+    :param test_settings: collection of test settings
+    :param session: DrayTekWebAdmin session object
+    :param state: state reached, see draytekwebadmin.journal.STATES
+    :param status: status message (Default: None)
+    """
+    if test_settings.journal is not None:
+        test_settings.journal.record(router_key(session), state, status)
+
+
+def reboot_pending(journal, key):
+    """Check the journal for settings written which needed a reboot the router hasn't had
+
+    :param journal: JobJournal
+    :param key: key of the router in the journal
+    :return: True if the router still needs to reboot
+    """
+    pending = False
+    for entry in journal.history(key):
+        if entry.state == "written" and entry.status == REBOOT_REQUIRED:
+            pending = True
+        elif entry.state == "rebooted":
+            pending = False
+    return pending
+
+
+def resume_routers(datasource, results, journal):
+    """Start or resume the job in the journal, skipping the routers an earlier run has done
+
+    :param datasource: rows from CSV, one per router
+    :param results: results table, a row is added for each router already done
+    :param journal: JobJournal
+    :return: rows of the routers still to configure
+    """
+    keys = [router_key(extract_settings(router)["connection"]) for router in datasource]
+    unfinished = set(journal.start(keys))
+    done = journal.done()
+    remaining = []
+    for router, key in zip(datasource, keys):
+        if key in unfinished:
+            remaining.append(router)
+        else:
+            results.add_row([key, "", "", f"{done[key].status} (previous run)"])
+    return remaining
+
+
+def preflight_routers(datasource, results):
+    """Check which routers can be reached, at the same time, before starting any browser
+
+    :param datasource: rows from CSV, one per router
+    :param results: results table, a row is added for each router which can't be reached
+    :return: rows of the routers which can be reached
+    """
+    connections = [extract_settings(router)["connection"] for router in datasource]
+    reachable = []
+    for router, check in zip(datasource, preflight_fleet(connections)):
+        if check.reachable:
+            LOGGER.info(
+                f"Router {check.hostname} - Reachable in {check.latency * 1000:.0f}ms"
+            )
+            reachable.append(router)
+        else:
+            results.add_row(
+                result_row_builder(None, f"UNREACHABLE: {check.error}", check.hostname)
+            )
+    return reachable
+
+
+def configure_and_close(router, allow_reboot, test_settings):
+    """Apply router configuration and close the browser session afterwards
+
+    :param router: row from CSV with settings for a single router
+    :param allow_reboot: reboot router if required after config change
+    :param test_settings: collection of test settings
+    :return: webadmin_session
+    :return: Configuration status message
+    """
+    (session, status, failed) = configure_router(
+        router=router, allow_reboot=allow_reboot, test_settings=test_settings
+    )
+    if session is not None:
+        # A failed browser session isn't returned to the pool or stored for reuse
+        session.close_session(failed=failed)
+    return session, status
 
 
 def extract_settings(router_settings, separator="|"):
@@ -478,6 +724,11 @@ class TestSettings:
         implicit_wait_time=None,
         explicit_wait_time=None,
         debug=False,
+        session_pool=None,
+        settings_cache=None,
+        session_store=None,
+        timing=None,
+        journal=None,
     ):
         """"Test Environment settings.
 
@@ -489,6 +740,11 @@ class TestSettings:
         :param implicit_wait_time: WebDriver implicit wait time, override configuration file
         :param explicit_wait_time: WebDriver explicit wait time, override configuration file
         :param debug: flag to trigger debug behaviours
+        :param session_pool: pool of browser sessions shared between routers
+        :param settings_cache: cache of settings read from routers
+        :param session_store: store of logged in sessions, reused instead of logging in
+        :param timing: recorder of the time taken per router and step
+        :param journal: journal of each router's progress, to resume the job if interrupted
         """
         self.what_if = what_if
         self.config_dir = config_dir
@@ -498,6 +754,11 @@ class TestSettings:
         self.implicit_wait_time = implicit_wait_time
         self.explicit_wait_time = explicit_wait_time
         self.debug = debug
+        self.session_pool = session_pool
+        self.settings_cache = settings_cache
+        self.session_store = session_store
+        self.timing = timing
+        self.journal = journal
 
 
 def main():
@@ -505,13 +766,13 @@ def main():
 
     """
     results = results_table(headers=["Index", "Router", "Model", "Name", "Status"])
-    session = None
     argv = None
     parser = _get_parser()
     args = parser.parse_args(argv)
     if args.template:
         create_template_csv(args.template)
     elif args.inputfile:
+        test_settings = None
         try:
             test_settings = TestSettings(
                 what_if=args.whatif,
@@ -522,28 +783,65 @@ def main():
                 implicit_wait_time=args.implicit_wait,
                 explicit_wait_time=args.explicit_wait,
                 debug=args.debug,
+                session_pool=TooliumSessionPool(
+                    max_size=args.concurrency,
+                    max_uses=args.max_browser_uses,
+                    config_dir=args.config,
+                    browser=args.browser,
+                    search_driver=args.search_driver,
+                    headless=args.headless,
+                    implicit_wait=args.implicit_wait,
+                    explicit_wait=args.explicit_wait,
+                ),
+                settings_cache=(
+                    SettingsCache(args.cache, ttl=args.cache_ttl) if args.cache else None
+                ),
+                session_store=(
+                    SessionStore(args.session_store) if args.session_store else None
+                ),
+                timing=TimingRecorder() if args.timing_report else None,
+                journal=(
+                    JobJournal(args.journal, job=journal_job(args))
+                    if args.journal
+                    else None
+                ),
             )
             datasource = read_csv(args.inputfile)
-
-            # For each row attempt to configure router
-            for router in datasource:
-                (session, status) = configure_router(
-                    router=router,
+            if test_settings.journal is not None:
+                datasource = resume_routers(datasource, results, test_settings.journal)
+            if args.preflight:
+                datasource = preflight_routers(datasource, results)
+
+            # Configure routers in parallel, results are returned in input order
+            fleet = FleetExecutor(concurrency=args.concurrency)
+            for router, result in zip(
+                datasource,
+                fleet.run(
+                    datasource,
+                    configure_and_close,
                     allow_reboot=args.reboot,
                     test_settings=test_settings,
-                )
-                results.add_row(result_row_builder(session, status))
-                results.print()
-                session.close_session()
+                ),
+            ):
+                if isinstance(result, Exception):
+                    results.add_row(
+                        result_row_builder(
+                            None, f"ERROR: {result}", router_hostname(router)
+                        )
+                    )
+                else:
+                    (session, status) = result
+                    results.add_row(result_row_builder(session, status))
+            results.print()
+            if test_settings.timing is not None:
+                test_settings.timing.write(args.timing_report)
         except FileNotFoundError:
             LOGGER.critical(f"Input file not found: {args.inputfile}")
         except Exception as e:
-            if session:
-                results.add_row(result_row_builder(session, status, router))
             LOGGER.critical(f"Error: {e}")
         finally:
-            if session is not None:
-                session.close_session()
+            if test_settings is not None:
+                test_settings.session_pool.close()
     else:
         parser.print_help()
 
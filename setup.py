@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 
 PACKAGES = find_packages(exclude=["tests", "tests.*"])
 
-REQUIRES = ["toolium>=1.6.1", "tabulate==0.8.6"]
+REQUIRES = ["toolium>=1.6.1", "tabulate==0.8.6", "requests"]
 
 PROJECT_CLASSIFIERS = [
     "Intended Audience :: Developers",
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from draytekwebadmin import AsyncDrayTekWebAdmin, DrayTekWebAdmin
+from draytekwebadmin.firmware import Firmware
+from draytekwebadmin.snmp import SNMPIPv4
+
+
+class TestAsyncDrayTekWebAdmin(unittest.TestCase):
+    def run_async(self, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    def test_properties(self):
+        router = AsyncDrayTekWebAdmin(hostname="myhost", password="secret", port=8443)
+        self.assertEqual("myhost", router.hostname)
+        self.assertEqual(8443, router.admin.port)
+        self.assertFalse(router.reboot_required)
+        self.assertIsNone(router.routerinfo)
+
+    @patch.object(DrayTekWebAdmin, "read_settings", autospec=True)
+    def test_read_settings(self, mock_read_settings):
+        mock_read_settings.return_value = SNMPIPv4(get_community="public")
+        router = AsyncDrayTekWebAdmin(hostname="myhost", password="secret")
+        settings = self.run_async(router.read_settings(SNMPIPv4))
+        self.assertEqual("public", settings.get_community)
+        mock_read_settings.assert_called_once_with(router.admin, SNMPIPv4)
+
+    @patch.object(DrayTekWebAdmin, "upgrade", autospec=True)
+    def test_upgrade_approve(self, mock_upgrade):
+        mock_upgrade.return_value = False
+        firmware = Firmware()
+        router = AsyncDrayTekWebAdmin(hostname="myhost", password="secret")
+        self.assertFalse(self.run_async(router.upgrade(firmware, approve=bool)))
+        mock_upgrade.assert_called_once_with(router.admin, firmware, bool)
+
+    def test_context_manager_closes_session(self):
+        async def use_router():
+            async with AsyncDrayTekWebAdmin(hostname="myhost") as router:
+                self.assertEqual("myhost", router.hostname)
+                raise RuntimeError("Failed")
+
+        with patch.object(
+            DrayTekWebAdmin, "close_session", autospec=True
+        ) as mock_close:
+            with self.assertRaises(RuntimeError):
+                self.run_async(use_router())
+        self.assertTrue(mock_close.call_args[1]["failed"])
+
+    def test_concurrency(self):
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def reboot(admin):
+            with lock:
+                active.append(admin)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(admin)
+
+        async def reboot_all(routers):
+            await asyncio.gather(*(router.reboot() for router in routers))
+
+        async def main():
+            # Two routers share a site semaphore of one, the other router runs alongside
+            site = asyncio.Semaphore(1)
+            routers = [
+                AsyncDrayTekWebAdmin(hostname="site1a", semaphore=site),
+                AsyncDrayTekWebAdmin(hostname="site1b", semaphore=site),
+                AsyncDrayTekWebAdmin(hostname="site2"),
+            ]
+            await reboot_all(routers)
+            # Operations on one router run one at a time
+            await asyncio.gather(routers[2].reboot(), routers[2].reboot())
+
+        with patch.object(DrayTekWebAdmin, "reboot", autospec=True, side_effect=reboot):
+            self.run_async(main())
+        self.assertEqual(2, max(peak[:3]))
+        self.assertEqual(1, max(peak[3:]))
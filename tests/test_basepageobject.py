@@ -0,0 +1,211 @@
+import unittest
+from unittest.mock import MagicMock
+
+from selenium.webdriver.common.by import By
+from toolium.pageelements import Checkbox, InputRadio, InputText, Link, Select
+
+from draytekwebadmin.pages.basepageobject import BasePageObject
+
+
+def field(
+    name="", id="", type="text", enabled=True, value="", checked=False, option=None
+):
+    return {
+        "name": name,
+        "id": id,
+        "type": type,
+        "enabled": enabled,
+        "value": value,
+        "checked": checked,
+        "option": option,
+    }
+
+
+class TestBasePageObject(unittest.TestCase):
+    def setUp(self):
+        self.driver_wrapper = MagicMock()
+        self.page = BasePageObject(driver_wrapper=self.driver_wrapper)
+        self.driver_wrapper.driver.execute_script.return_value = [
+            field(name="sRouterName", value=" router1 "),
+            field(name="sRouterName", value="ignored duplicate"),
+            field(name="sRMC", type="checkbox", checked=True),
+            field(name="sRMCFtp", type="checkbox", enabled=False),
+            field(name="SNMPMngHostMask0", type="select-one", option="255.255.255.0"),
+            field(name="ConfigPort", type="radio", value="Default"),
+            field(name="ConfigPort", type="radio", value="UserDefine", checked=True),
+            field(id="tab1", type="button"),
+        ]
+
+    def test_form_key(self):
+        self.assertEqual("sRMC", self.page.form_key(Checkbox(By.NAME, "sRMC")))
+        self.assertEqual("#tab1", self.page.form_key(Link(By.ID, "tab1")))
+        self.assertEqual(
+            "ConfigPort=Default",
+            self.page.form_key(
+                InputRadio(
+                    By.XPATH,
+                    "//input[@name='ConfigPort' and @type='radio' and @value='Default']",
+                )
+            ),
+        )
+        self.assertIsNone(self.page.form_key(Link(By.LINK_TEXT, "SNMP")))
+
+    def test_snapshot_form(self):
+        form = self.page.snapshot_form()
+        self.assertEqual(1, self.driver_wrapper.driver.execute_script.call_count)
+        self.assertEqual(" router1 ", form["sRouterName"]["value"])
+        self.assertIn("ConfigPort=UserDefine", form)
+        self.assertNotIn("ConfigPort", form)
+        self.assertIn("#tab1", form)
+
+    def test_read_form_cached(self):
+        self.assertIs(self.page.read_form(), self.page.read_form())
+        self.assertEqual(1, self.driver_wrapper.driver.execute_script.call_count)
+        self.page.navigation.form = None
+        self.page.read_form()
+        self.assertEqual(2, self.driver_wrapper.driver.execute_script.call_count)
+
+    def test_form_value(self):
+        form = self.page.snapshot_form()
+        self.assertEqual(
+            "router1", self.page.form_value(form, InputText(By.NAME, "sRouterName"))
+        )
+        self.assertTrue(self.page.form_value(form, Checkbox(By.NAME, "sRMC")))
+        self.assertIsNone(self.page.form_value(form, Checkbox(By.NAME, "sRMCFtp")))
+        self.assertIsNone(self.page.form_value(form, Checkbox(By.NAME, "missing")))
+        self.assertEqual(
+            "255.255.255.0",
+            self.page.form_value(form, Select(By.NAME, "SNMPMngHostMask0")),
+        )
+        self.assertTrue(
+            self.page.form_value(
+                form,
+                InputRadio(
+                    By.XPATH,
+                    "//input[@name='ConfigPort' and @type='radio' and @value='UserDefine']",
+                ),
+            )
+        )
+        with self.assertRaises(TypeError):
+            self.page.form_value(form, Link(By.ID, "tab1"))
+
+    def test_fill_form(self):
+        self.driver_wrapper.driver.execute_script.return_value = {
+            "applied": ["sRouterName", "sRMC", "ConfigPort=UserDefine"],
+            "disabled": ["sRMCFtp"],
+            "missing": ["SNMPMngHostMask0"],
+        }
+        self.page.navigation.form = {}
+        radio = InputRadio(
+            By.XPATH,
+            "//input[@name='ConfigPort' and @type='radio' and @value='UserDefine']",
+        )
+        filled = self.page.fill_form(
+            {
+                InputText(By.NAME, "sRouterName"): "router1",
+                Checkbox(By.NAME, "sRMC"): True,
+                Checkbox(By.NAME, "sRMCFtp"): False,
+                Checkbox(By.NAME, "sWPing"): None,
+                InputText(By.NAME, "index1"): 12,
+                Select(By.NAME, "SNMPMngHostMask0"): "255.255.255.0",
+                radio: True,
+                InputRadio(By.NAME, "sReboot"): False,
+            }
+        )
+        # One round trip, skipping unset values
+        self.assertEqual(1, self.driver_wrapper.driver.execute_script.call_count)
+        _, payload = self.driver_wrapper.driver.execute_script.call_args[0]
+        self.assertEqual(
+            [
+                {"key": "sRouterName", "kind": "text", "value": "router1"},
+                {"key": "sRMC", "kind": "checkbox", "value": True},
+                {"key": "sRMCFtp", "kind": "checkbox", "value": False},
+                {"key": "index1", "kind": "text", "value": "12"},
+                {"key": "SNMPMngHostMask0", "kind": "select", "value": "255.255.255.0"},
+                {"key": "ConfigPort=UserDefine", "kind": "radio", "value": True},
+            ],
+            payload,
+        )
+        self.assertEqual(["sRMCFtp"], filled.disabled)
+        self.assertEqual(["SNMPMngHostMask0"], filled.missing)
+        self.assertIn("ConfigPort=UserDefine", filled.applied)
+        # Snapshot discarded, since the form has changed
+        self.assertIsNone(self.page.navigation.form)
+        self.assertTrue(self.page.changed)
+
+    def test_changed_fields(self):
+        form = self.page.read_form()
+        name = InputText(By.NAME, "sRouterName")
+        rmc = Checkbox(By.NAME, "sRMC")
+        ftp = Checkbox(By.NAME, "sRMCFtp")
+        mask = Select(By.NAME, "SNMPMngHostMask0")
+        radio = InputRadio(
+            By.XPATH,
+            "//input[@name='ConfigPort' and @type='radio' and @value='UserDefine']",
+        )
+        missing = InputText(By.NAME, "index1")
+        unchanged = {name: "router1", rmc: True, mask: "255.255.255.0", radio: True}
+        self.assertEqual({}, self.page.changed_fields(form, unchanged))
+        # Disabled and missing fields are kept, so they are reported
+        changes = {name: "router2", rmc: False, ftp: True, missing: 1, mask: None}
+        self.assertEqual(
+            [name, rmc, ftp, missing],
+            list(self.page.changed_fields(form, changes)),
+        )
+
+    def test_fill_form_unchanged(self):
+        filled = self.page.fill_form({InputText(By.NAME, "sRouterName"): "router1"})
+        # Only the snapshot is taken, nothing to fill
+        self.assertEqual(1, self.driver_wrapper.driver.execute_script.call_count)
+        self.assertEqual([], filled.applied)
+        self.assertFalse(self.page.changed)
+
+    def test_fill_form_unhandled(self):
+        with self.assertRaises(TypeError):
+            self.page.fill_form({Link(By.ID, "tab1"): True})
+        with self.assertRaises(TypeError):
+            self.page.fill_form({Checkbox(By.LINK_TEXT, "SNMP"): True})
+
+
+class TestBasePageObjectWaits(unittest.TestCase):
+    def setUp(self):
+        self.driver_wrapper = MagicMock()
+        self.page = BasePageObject(driver_wrapper=self.driver_wrapper)
+        self.page.poll_frequency = 0.001
+        self.execute_script = self.driver_wrapper.driver.execute_script
+
+    def test_is_displayed_no_wait(self):
+        self.execute_script.return_value = -1
+        self.assertFalse(self.page.is_displayed(Link(By.LINK_TEXT, "SNMP")))
+        self.assertEqual(1, self.execute_script.call_count)
+        self.assertEqual([["link text", "SNMP"]], self.execute_script.call_args[0][1])
+        self.execute_script.return_value = 0
+        self.assertTrue(self.page.is_displayed(Link(By.LINK_TEXT, "SNMP")))
+
+    def test_wait_until_displayed(self):
+        error = Link(By.ID, "errmsg")
+        menu = Link(By.NAME, "menu")
+        self.execute_script.side_effect = [-1, -1, 1]
+        self.assertIs(menu, self.page.wait_until_displayed([error, menu], timeout=5))
+        self.assertEqual(3, self.execute_script.call_count)
+
+    def test_wait_until_displayed_timeout(self):
+        self.page.wait_timeout = 0.01
+        self.execute_script.return_value = -1
+        self.assertIsNone(self.page.wait_until_displayed([Link(By.ID, "errmsg")]))
+        self.assertGreater(self.execute_script.call_count, 1)
+
+    def test_expected_timeout(self):
+        self.driver_wrapper.config.getfloat.return_value = 5.0
+        self.assertEqual(5.0, self.page.expected_timeout())
+        self.page.wait_timeout = 2
+        self.assertEqual(2, self.page.expected_timeout())
+
+    def test_click_and_wait(self):
+        button = MagicMock()
+        self.execute_script.side_effect = [None, False, True]
+        self.assertTrue(self.page.click_and_wait(button, timeout=5))
+        self.assertTrue(button.click.called)
+        # Marked, then waited for a new document
+        self.assertEqual((True,), self.execute_script.call_args[0][1:])
+        self.assertEqual(3, self.execute_script.call_count)
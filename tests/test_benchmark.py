@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from draytekwebadmin.benchmark import (
+    Benchmark,
+    CommandCounter,
+    Measurement,
+    Regression,
+    compare,
+    load_results,
+    percentile,
+    save_results,
+)
+from draytekwebadmin.simulator import RouterSimulator
+from draytekwebadmin.snmp import SNMPIPv4
+
+
+class TestStatistics(unittest.TestCase):
+    def test_percentile(self):
+        samples = [5, 1, 4, 2, 3]
+        self.assertEqual(3, percentile(samples, 50))
+        self.assertEqual(5, percentile(samples, 95))
+        self.assertEqual(1, percentile(samples, 0))
+        self.assertIsNone(percentile([], 50))
+
+    def test_compare(self):
+        baseline = {
+            "reboot": Measurement(1.0, 1.2, 10, 4, [1.0]),
+            "start_session": Measurement(0.001, 0.001, 20, 6, [0.001]),
+            "upgrade_preview": Measurement(2.0, 2.0, 8, 3, [2.0]),
+        }
+        results = {
+            "reboot": Measurement(1.1, 1.5, 13, 4, [1.1]),
+            # Over the threshold, but within timer noise
+            "start_session": Measurement(0.002, 0.002, 20, 6, [0.002]),
+            "read_settings.SNMPIPv4": Measurement(9.0, 9.0, 99, 9, [9.0]),
+        }
+        self.assertEqual(
+            [
+                Regression("reboot", "p95", 1.2, 1.5),
+                Regression("reboot", "commands", 10, 13),
+            ],
+            compare(baseline, results, threshold=0.2),
+        )
+        self.assertEqual([], compare(baseline, results, threshold=0.5))
+
+    def test_save_load(self):
+        results = {"reboot": Measurement(1.0, 1.2, 10, 4, [1.0, 1.2])}
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "benchmark.json")
+            save_results(path, results, backend="http")
+            self.assertEqual(results, load_results(path))
+
+
+class TestCommandCounter(unittest.TestCase):
+    def test_restores_execute(self):
+        execute = WebDriver.execute
+        with CommandCounter() as counter:
+            self.assertIsNot(execute, WebDriver.execute)
+        self.assertIs(execute, WebDriver.execute)
+        self.assertEqual(0, counter.total)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            Benchmark(None, iterations=0)
+        with self.assertRaises(ValueError):
+            Benchmark(None, operations=["upgrade"])
+
+    def test_run_http(self):
+        with RouterSimulator() as simulator:
+            benchmark = Benchmark(
+                simulator,
+                iterations=3,
+                operations=["read_settings", "write_settings"],
+                settings=[SNMPIPv4],
+                backend="http",
+            )
+            results = benchmark.run()
+        self.assertEqual(
+            ["read_settings.SNMPIPv4", "write_settings.SNMPIPv4"], list(results)
+        )
+        read = results["read_settings.SNMPIPv4"]
+        self.assertEqual(3, len(read.samples))
+        self.assertLessEqual(read.p50, read.p95)
+        self.assertEqual(0, read.commands)
+        self.assertGreater(read.requests, 0)
@@ -0,0 +1,60 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from draytekwebadmin.cache import SettingsCache
+from draytekwebadmin.management import AccessList
+from draytekwebadmin.snmp import SNMPIPv4
+
+
+class TestSettingsCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.cache = SettingsCache(Path(self.directory.name, "cache.sqlite"), ttl=60)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            SettingsCache(Path(self.directory.name, "cache.sqlite"), ttl=-1)
+
+    def test_put_get(self):
+        self.assertIsNone(self.cache.get("router", "4.0.1", SNMPIPv4))
+        self.cache.put(
+            "router", "4.0.1", SNMPIPv4(enable_agent=True, get_community="public")
+        )
+        cached = self.cache.get("router", "4.0.1", SNMPIPv4)
+        self.assertIsInstance(cached, SNMPIPv4)
+        self.assertTrue(cached.enable_agent)
+        self.assertEqual("public", cached.get_community)
+        self.assertIsNone(cached.set_community)
+        # Different router, firmware or type
+        self.assertIsNone(self.cache.get("other", "4.0.1", SNMPIPv4))
+        self.assertIsNone(self.cache.get("router", "4.0.2", SNMPIPv4))
+        self.assertIsNone(self.cache.get("router", "4.0.1", AccessList))
+
+    def test_shared_file(self):
+        self.cache.put("router", "4.0.1", SNMPIPv4(get_community="public"))
+        other = SettingsCache(self.cache.path)
+        self.assertEqual("public", other.get("router", "4.0.1", SNMPIPv4).get_community)
+
+    def test_expiry(self):
+        with patch("draytekwebadmin.cache.time", return_value=1000):
+            self.cache.put("router", "4.0.1", SNMPIPv4(get_community="public"))
+        with patch("draytekwebadmin.cache.time", return_value=1060):
+            self.assertIsNotNone(self.cache.get("router", "4.0.1", SNMPIPv4))
+        with patch("draytekwebadmin.cache.time", return_value=1061):
+            self.assertIsNone(self.cache.get("router", "4.0.1", SNMPIPv4))
+
+    def test_invalidate(self):
+        for hostname in ["router", "other"]:
+            self.cache.put(hostname, "4.0.1", SNMPIPv4(get_community="public"))
+            self.cache.put(hostname, "4.0.1", AccessList(list_1_ip_object_index=1))
+        self.cache.invalidate("router", [SNMPIPv4])
+        self.assertIsNone(self.cache.get("router", "4.0.1", SNMPIPv4))
+        self.assertIsNotNone(self.cache.get("router", "4.0.1", AccessList))
+        self.cache.invalidate("router")
+        self.assertIsNone(self.cache.get("router", "4.0.1", AccessList))
+        self.assertIsNotNone(self.cache.get("other", "4.0.1", SNMPIPv4))
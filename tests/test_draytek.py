@@ -1,6 +1,21 @@
 import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
 
 from draytekwebadmin import DrayTekWebAdmin
+from draytekwebadmin.draytek import SETTINGS_PAGES, SettingsPage
+from draytekwebadmin.firmware import Firmware
+from draytekwebadmin.management import (
+    AccessList,
+    Encryption,
+    IPv6Management,
+    LAN_Access,
+    Management,
+)
+from draytekwebadmin.pages import FirmwareUpgradePage
+from draytekwebadmin.reachability import Preflight
+from draytekwebadmin.routerinfo import RouterInfo
+from draytekwebadmin.sessionstore import StoredSession
+from draytekwebadmin.snmp import SNMPIPv4
 
 
 class TestDraytek(unittest.TestCase):
@@ -130,6 +145,213 @@ class TestDraytek(unittest.TestCase):
     def test_write_settings(self):
         pass
 
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_read_all_settings(self, mock_start_session):
+        management_page = MagicMock()
+        snmp_page = MagicMock()
+        pages = {
+            "LAN_Access": SettingsPage(
+                management_page,
+                "lan_access_setup_tab",
+                "read_lan",
+                None,
+                None,
+                None,
+                None,
+            ),
+            "AccessList": SettingsPage(
+                management_page,
+                "ipv4_management_setup_tab",
+                "read_acl",
+                None,
+                None,
+                None,
+                None,
+            ),
+            "IPv6Management": SettingsPage(
+                management_page,
+                "ipv6_management_setup_tab",
+                "read_ipv6",
+                None,
+                None,
+                None,
+                None,
+            ),
+            "SNMPIPv4": SettingsPage(
+                snmp_page, None, "read_snmp", None, None, None, None
+            ),
+        }
+        connection = DrayTekWebAdmin(hostname="myhost", password="secret")
+        connection._session = MagicMock()
+        with patch.dict(SETTINGS_PAGES, pages, clear=True):
+            results = connection.read_all_settings(
+                [LAN_Access, AccessList, IPv6Management, SNMPIPv4]
+            )
+        self.assertTrue(mock_start_session.called)
+        # One page object per page, with tabs read in order
+        self.assertEqual(1, management_page.call_count)
+        self.assertEqual(1, snmp_page.call_count)
+        page = management_page.return_value
+        self.assertEqual(
+            ["read_acl", "read_ipv6", "read_lan"],
+            [name for name, _, _ in page.method_calls],
+        )
+        self.assertEqual(page.read_lan.return_value, results[LAN_Access])
+        self.assertEqual(
+            snmp_page.return_value.read_snmp.return_value, results[SNMPIPv4]
+        )
+
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_write_settings_batch(self, mock_start_session):
+        management_page = MagicMock()
+        management_page.return_value.submit.side_effect = [False, True]
+        pages = {
+            "AccessList": SettingsPage(
+                management_page,
+                "ipv4_management_setup_tab",
+                None,
+                None,
+                "fill_acl",
+                None,
+                None,
+            ),
+            "Encryption": SettingsPage(
+                management_page,
+                "ipv4_management_setup_tab",
+                None,
+                None,
+                "fill_enc",
+                None,
+                None,
+            ),
+            "LAN_Access": SettingsPage(
+                management_page,
+                "lan_access_setup_tab",
+                None,
+                None,
+                "fill_lan",
+                None,
+                None,
+            ),
+        }
+        connection = DrayTekWebAdmin(hostname="myhost", password="secret")
+        connection._session = MagicMock()
+        access_list = AccessList()
+        encryption = Encryption()
+        lan_access = LAN_Access()
+        with patch.dict(SETTINGS_PAGES, pages, clear=True):
+            reboot = connection.write_settings_batch(
+                [access_list, lan_access, encryption]
+            )
+        self.assertTrue(mock_start_session.called)
+        # One submit per page and tab, with reboot flags combined
+        self.assertTrue(reboot)
+        self.assertTrue(connection.reboot_required)
+        page = management_page.return_value
+        self.assertEqual(2, page.submit.call_count)
+        self.assertEqual(
+            [
+                ("fill_acl", (access_list,)),
+                ("fill_enc", (encryption,)),
+                ("submit", ()),
+                ("fill_lan", (lan_access,)),
+                ("submit", ()),
+            ],
+            [(name, args) for name, args, _ in page.method_calls],
+        )
+
+    def test_write_settings_batch_type_error(self):
+        with self.assertRaises(TypeError):
+            DrayTekWebAdmin(hostname="myhost").write_settings_batch([{}])
+
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_settings_cache(self, mock_start_session):
+        snmp_page = MagicMock()
+        snmp_page.return_value.read_snmp.return_value = SNMPIPv4(get_community="new")
+        pages = {
+            "SNMPIPv4": SettingsPage(
+                snmp_page, None, "read_snmp", "write_snmp", None, None, None
+            ),
+            "AccessList": SettingsPage(
+                snmp_page, None, "read_acl", None, None, None, None
+            ),
+        }
+        cache = MagicMock()
+        cache.get.side_effect = lambda hostname, firmware, settings: (
+            AccessList(list_1_ip_object_index=1) if settings is AccessList else None
+        )
+        connection = DrayTekWebAdmin(hostname="myhost", settings_cache=cache)
+        connection._session = MagicMock()
+        connection.routerinfo = RouterInfo(firmware="4.0.1")
+        with patch.dict(SETTINGS_PAGES, pages, clear=True):
+            results = connection.read_all_settings([SNMPIPv4, AccessList])
+            # Only the settings not cached are read, and then cached
+            self.assertEqual(1, results[AccessList].list_1_ip_object_index)
+            self.assertFalse(snmp_page.return_value.read_acl.called)
+            cache.put.assert_called_once_with("myhost", "4.0.1", results[SNMPIPv4])
+
+            connection.write_settings(SNMPIPv4(get_community="new"))
+            cache.invalidate.assert_called_with("myhost", [SNMPIPv4])
+        with patch("draytekwebadmin.draytek.RebootSystemPage"):
+            connection.reboot()
+        cache.invalidate.assert_called_with("myhost")
+
+    @patch("draytekwebadmin.draytek.DashboardPage")
+    @patch("draytekwebadmin.draytek.LoginPage")
+    def test_session_store(self, mock_login_page, mock_dashboard_page):
+        store = MagicMock()
+        store.get.return_value = StoredSession(
+            [{"name": "SESSION", "value": "1"}], RouterInfo(firmware="4.0.1")
+        )
+        connection = DrayTekWebAdmin(hostname="myhost", session_store=store)
+        connection._session = MagicMock()
+        mock_login_page.return_value.logged_in.return_value = True
+        connection.start_session()
+        # Logged in with the stored cookies, without the login page or dashboard
+        connection._session.driver.add_cookie.assert_called_with(
+            {"name": "SESSION", "value": "1"}
+        )
+        self.assertTrue(connection.loggedin)
+        self.assertEqual("4.0.1", connection.routerinfo.firmware)
+        self.assertFalse(mock_login_page.return_value.login.called)
+        self.assertFalse(mock_dashboard_page.called)
+
+        # Management settings show whether the session will be logged out when idle
+        connection._note_auto_logout([Management(disable_auto_logout=True)])
+        session = connection._session
+        connection.close_session()
+        store.put.assert_called_with(
+            "https://myhost:443",
+            "admin",
+            session.driver.get_cookies.return_value,
+            connection.routerinfo,
+            False,
+        )
+
+    @patch("draytekwebadmin.draytek.DashboardPage")
+    @patch("draytekwebadmin.draytek.LoginPage")
+    def test_session_store_logged_out(self, mock_login_page, mock_dashboard_page):
+        store = MagicMock()
+        store.get.return_value = StoredSession([], RouterInfo(firmware="4.0.1"))
+        connection = DrayTekWebAdmin(hostname="myhost", session_store=store)
+        connection._session = MagicMock()
+        mock_login_page.return_value.logged_in.return_value = False
+        mock_login_page.return_value.wait_until_loaded.return_value.login_error.return_value = (
+            False
+        )
+        mock_dashboard_page.return_value.routerinfo.return_value = RouterInfo(
+            firmware="4.0.2"
+        )
+        connection.start_session()
+        # Stored session no longer valid, so logged in again and stored
+        store.invalidate.assert_called_with("https://myhost:443", "admin")
+        self.assertEqual("4.0.2", connection.routerinfo.firmware)
+        self.assertTrue(store.put.called)
+
+    def test_read_all_settings_type_error(self):
+        with self.assertRaises(TypeError):
+            DrayTekWebAdmin(hostname="myhost").read_all_settings([dict])
+
     # TODO: Fix up mocking with Toolium tests
     # @patch(
     #     "draytekwebadmin.draytek.LoginPage.login_error",
@@ -149,5 +371,147 @@ class TestDraytek(unittest.TestCase):
     def test_upgrade_preview(self):
         pass
 
-    def test_upgrade(self):
-        pass
+    @patch("draytekwebadmin.draytek.TooliumSession")
+    @patch("draytekwebadmin.draytek.preflight")
+    def test_session_unreachable(self, mock_preflight, mock_session):
+        mock_preflight.return_value = Preflight("myhost", 443, False, None, "timed out")
+        connection = DrayTekWebAdmin(hostname="myhost")
+        with self.assertRaises(RuntimeError) as cm:
+            connection.session
+        self.assertIn("timed out", str(cm.exception))
+        # No browser started
+        self.assertFalse(mock_session.called)
+        mock_preflight.assert_called_with("myhost", 443, True, timeout=3)
+
+    @patch("draytekwebadmin.draytek.http_ok", return_value=True)
+    @patch("draytekwebadmin.draytek.tcp_reachable")
+    @patch("draytekwebadmin.draytek.monotonic")
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_wait_until_available(
+        self, mock_start_session, mock_monotonic, mock_tcp_reachable, mock_http_ok
+    ):
+        def start_session(connection):
+            connection.routerinfo = RouterInfo(firmware="4.0.2")
+
+        mock_start_session.side_effect = start_session
+        mock_monotonic.return_value = 100
+        # Still up, then down, then back
+        mock_tcp_reachable.side_effect = [True, False, True]
+        connection = DrayTekWebAdmin(hostname="myhost")
+        connection._restarted = 40
+        connection._expected_firmware = "4.0.2"
+        with patch("draytekwebadmin.reachability.sleep"), patch(
+            "draytekwebadmin.reachability.monotonic", return_value=50
+        ):
+            recovery = connection.wait_until_available(timeout=300)
+        self.assertEqual(60, recovery.downtime)
+        self.assertEqual("4.0.2", recovery.firmware)
+        self.assertTrue(recovery.firmware_confirmed)
+        self.assertTrue(mock_start_session.called)
+        self.assertIsNone(connection._restarted)
+
+    @patch("draytekwebadmin.draytek.tcp_reachable", return_value=False)
+    def test_wait_until_available_timeout(self, mock_tcp_reachable):
+        connection = DrayTekWebAdmin(hostname="myhost")
+        with patch("draytekwebadmin.reachability.sleep"), self.assertRaises(
+            TimeoutError
+        ) as cm:
+            connection.wait_until_available(timeout=0)
+        self.assertIn("waiting for connection", str(cm.exception))
+
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_upgrade_without_filepath(self, mock_start_session):
+        connection = DrayTekWebAdmin(hostname="myhost")
+        with self.assertRaises(ValueError):
+            connection.upgrade(Firmware())
+        with self.assertRaises(ValueError):
+            connection.upgrade_preview(Firmware())
+        self.assertFalse(mock_start_session.called)
+
+    @patch.object(FirmwareUpgradePage, "preview_selected_firmware", autospec=True)
+    @patch.object(FirmwareUpgradePage, "open_page", autospec=True)
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    @patch("pathlib.Path.exists", return_value=True)
+    def test_upgrade_preview_different_files(
+        self, mock_path_exists, mock_start_session, mock_open_page, mock_preview
+    ):
+        class FileInput:
+            def __init__(self):
+                self.value = ""
+                self.sent = []
+
+            def get_attribute(self, name):
+                return self.value
+
+            def clear(self):
+                self.value = ""
+
+            def send_keys(self, path):
+                self.sent.append(path)
+                self.value = "C:\\fakepath\\" + path.rsplit("/", 1)[-1]
+
+        file_input = FileInput()
+        mock_preview.side_effect = lambda page, file: Firmware(filepath=file.filepath)
+        connection = DrayTekWebAdmin(hostname="myhost")
+        connection._session = MagicMock()
+        connection.routerinfo = RouterInfo(firmware="4.0.1")
+        first = Firmware(filepath="firmware/v2860_3962.all")
+        second = Firmware(filepath="firmware/v2860_4002.all")
+        with patch.object(
+            type(FirmwareUpgradePage.choose_firmware_button),
+            "web_element",
+            new_callable=PropertyMock,
+            return_value=file_input,
+        ):
+            # The page is reused, so it still holds the first file when the second is previewed
+            for firmware in [first, second, second]:
+                preview = connection.upgrade_preview(firmware)
+                self.assertEqual(firmware.filepath, preview.filepath)
+        self.assertEqual([str(first.filepath), str(second.filepath)], file_input.sent)
+        self.assertEqual("C:\\fakepath\\v2860_4002.all", file_input.value)
+
+    @patch.object(
+        FirmwareUpgradePage,
+        "install_selected_firmware",
+        autospec=True,
+        return_value=3.0,
+    )
+    @patch.object(FirmwareUpgradePage, "preview_selected_firmware", autospec=True)
+    @patch.object(FirmwareUpgradePage, "choose_firmware", autospec=True)
+    @patch.object(FirmwareUpgradePage, "open_page", autospec=True)
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    @patch.object(Firmware, "size", new_callable=PropertyMock, return_value=1000)
+    @patch("pathlib.Path.exists", return_value=True)
+    def test_upgrade(
+        self,
+        mock_path_exists,
+        mock_size,
+        mock_start_session,
+        mock_open_page,
+        mock_choose_firmware,
+        mock_preview,
+        mock_install,
+    ):
+        connection = DrayTekWebAdmin(hostname="myhost")
+        connection._session = MagicMock()
+        connection.routerinfo = RouterInfo(firmware="4.0.1")
+        firmware = Firmware(filepath="v2860.all")
+        for target, upgraded in [("4.0.1", False), ("4.0.2", True)]:
+            mock_preview.return_value = Firmware(
+                firmware_target=target,
+                modem_firmware_current="A",
+                modem_firmware_target="A",
+                transfer_bytes=1000,
+                transfer_seconds=2.0,
+            )
+            self.assertEqual(upgraded, connection.upgrade(firmware))
+        # Page opened once per upgrade, and the preview upload reused for the install
+        self.assertEqual(2, mock_open_page.call_count)
+        self.assertEqual(1, mock_install.call_count)
+        self.assertEqual("4.0.1", connection.firmware.firmware_current)
+        self.assertEqual(2000, connection.firmware.transfer_bytes)
+        self.assertEqual(5.0, connection.firmware.transfer_seconds)
+
+        # Approval function overrides the version comparison
+        self.assertFalse(connection.upgrade(firmware, approve=lambda preview: False))
+        self.assertEqual(1, mock_install.call_count)
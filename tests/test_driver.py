@@ -1,3 +1,18 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from toolium.config_files import ConfigFiles
+from toolium.driver_wrappers_pool import DriverWrappersPool
+
+from draytekwebadmin.driver import (
+    SessionDriverWrapper,
+    TooliumSession,
+    TooliumSessionPool,
+)
+
 # import unittest
 # from unittest.mock import patch
 # from selenium.common.exceptions import WebDriverException
@@ -76,3 +91,135 @@
 #     def test_Unload_Driver(self, mock_firefox):
 #         unload_driver(mock_firefox())
 #         self.assertTrue(mock_firefox().quit.called)
+
+
+class TestTooliumSession(unittest.TestCase):
+    def test_override_browser_type(self):
+        self.assertEqual(
+            {("Driver", "type"): "chrome"},
+            TooliumSession._override_browser_type("Chrome"),
+        )
+        self.assertEqual({}, TooliumSession._override_browser_type("netscape"))
+
+    def test_override_headless(self):
+        self.assertEqual(
+            {("Driver", "headless"): "True"}, TooliumSession._override_headless("yes")
+        )
+        self.assertEqual({}, TooliumSession._override_headless(False))
+
+    def test_override_waits(self):
+        self.assertEqual(
+            {("Driver", "implicitly_wait"): "3"},
+            TooliumSession._override_implicit_wait(3),
+        )
+        self.assertEqual(
+            {("Driver", "explicitly_wait"): "7"},
+            TooliumSession._override_explcit_wait("7"),
+        )
+        self.assertEqual({}, TooliumSession._override_implicit_wait(None))
+
+    @patch("pathlib.Path.exists", return_value=False)
+    def test_locate_browser_driver_not_found(self, mock_path_exists):
+        self.assertEqual({}, TooliumSession._locate_browser_driver())
+        self.assertTrue(mock_path_exists.called)
+
+
+class TestSessionDriverWrapper(unittest.TestCase):
+    def setUp(self):
+        self.config_files = ConfigFiles()
+        self.config_files.set_config_directory(
+            str(Path(__file__).parent.parent / "examples" / "conf")
+        )
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.config_files.set_output_directory(self.output_dir.name)
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+        for wrapper in list(DriverWrappersPool.driver_wrappers):
+            if isinstance(wrapper, SessionDriverWrapper):
+                DriverWrappersPool.driver_wrappers.remove(wrapper)
+
+    def test_overrides_are_per_session(self):
+        chrome = SessionDriverWrapper({("Driver", "type"): "chrome"})
+        chrome.configure(self.config_files)
+        default = SessionDriverWrapper({("Driver", "implicitly_wait"): "0"})
+        default.configure(self.config_files)
+        self.assertEqual("chrome", chrome.config.get("Driver", "type"))
+        self.assertEqual("1", chrome.config.get("Driver", "implicitly_wait"))
+        self.assertEqual("firefox", default.config.get("Driver", "type"))
+        self.assertEqual("0", default.config.get("Driver", "implicitly_wait"))
+
+
+class TestTooliumSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.sessions = []
+
+        def factory():
+            session = MagicMock()
+            self.sessions.append(session)
+            return session
+
+        self.factory = factory
+
+    def test_reuse(self):
+        pool = TooliumSessionPool(max_size=2, session_factory=self.factory)
+        first = pool.checkout()
+        pool.checkin(first)
+        second = pool.checkout()
+        self.assertIs(first, second)
+        self.assertEqual(1, len(self.sessions))
+        self.assertTrue(first.driver.delete_all_cookies.called)
+        first.driver.get.assert_called_with("about:blank")
+
+    def test_recycle_after_max_uses(self):
+        pool = TooliumSessionPool(max_size=1, max_uses=2, session_factory=self.factory)
+        for _ in range(3):
+            pool.checkin(pool.checkout())
+        self.assertEqual(2, len(self.sessions))
+        self.assertTrue(self.sessions[0].tearDown.called)
+        self.assertEqual(1, pool.metrics()["recycled"])
+
+    def test_recycle_on_error(self):
+        pool = TooliumSessionPool(session_factory=self.factory)
+        session = pool.checkout()
+        pool.checkin(session, failed=True)
+        self.assertTrue(session.tearDown.called)
+        self.assertEqual(0, pool.size)
+        self.assertIsNot(session, pool.checkout())
+
+    def test_recycle_on_reset_error(self):
+        pool = TooliumSessionPool(session_factory=self.factory)
+        session = pool.checkout()
+        session.driver.delete_all_cookies.side_effect = Exception("Browser crashed")
+        pool.checkin(session)
+        self.assertTrue(session.tearDown.called)
+        self.assertEqual(0, pool.metrics()["idle"])
+
+    def test_max_size(self):
+        pool = TooliumSessionPool(max_size=1, session_factory=self.factory)
+        session = pool.checkout()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.01)
+        threading.Timer(0.05, pool.checkin, args=[session]).start()
+        self.assertIs(session, pool.checkout(timeout=5))
+
+    def test_metrics(self):
+        pool = TooliumSessionPool(max_size=3, session_factory=self.factory)
+        first = pool.checkout()
+        pool.checkout()
+        pool.checkin(first)
+        metrics = pool.metrics()
+        self.assertEqual(2, metrics["size"])
+        self.assertEqual(1, metrics["idle"])
+        self.assertEqual(1, metrics["in_use"])
+        self.assertEqual(2, metrics["created"])
+        self.assertEqual(2, metrics["checkouts"])
+        self.assertGreaterEqual(metrics["checkout_latency_max"], 0)
+
+    def test_close(self):
+        pool = TooliumSessionPool(session_factory=self.factory)
+        session = pool.checkout()
+        pool.checkin(session)
+        pool.close()
+        self.assertTrue(session.tearDown.called)
+        self.assertEqual(0, pool.size)
@@ -1,8 +1,9 @@
 import unittest
 from unittest.mock import patch
 from pathlib import Path
+from tempfile import TemporaryDirectory
 
-from draytekwebadmin.firmware import Firmware
+from draytekwebadmin.firmware import Firmware, parse_firmware_header
 
 
 class TestFirmware(unittest.TestCase):
@@ -75,3 +76,48 @@ class TestFirmware(unittest.TestCase):
                 )
             )
         )
+
+    def test_up_to_date(self):
+        header = Firmware(firmware_current="3.9.6.2", firmware_target="3.9.6.2")
+        self.assertTrue(header.up_to_date(modem=False))
+        # Modem version not known from the header
+        self.assertFalse(header.up_to_date())
+        header.modem_firmware_current = header.modem_firmware_target = "773F01"
+        self.assertTrue(header.up_to_date())
+        header.modem_firmware_target = "7B0A01"
+        self.assertFalse(header.up_to_date())
+        header.firmware_target = "4.0.0"
+        self.assertFalse(header.up_to_date(modem=False))
+
+    def test_size(self):
+        self.assertIsNone(Firmware().size)
+        with TemporaryDirectory() as directory:
+            path = Path(directory, "v2860.all")
+            path.write_bytes(b"\0" * 1024)
+            self.assertEqual(1024, Firmware(filepath=str(path)).size)
+
+    def test_parse_firmware_header(self):
+        self.assertEqual(
+            ("Vigor2860", "3.9.1.2_BT"),
+            parse_firmware_header(b"\x00\x10DRAY\x00Vigor2860\x00\x00v3.9.1.2_BT\x00"),
+        )
+        self.assertEqual(
+            (None, "4.2.1"), parse_firmware_header(b"\x01\x02.1.2\x004.2.1\x00")
+        )
+        self.assertEqual((None, None), parse_firmware_header(b"\x00" * 64))
+
+    def test_from_header(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory, "v2860.all")
+            path.write_bytes(b"\x00Vigor2860Ac\x003.9.2\x00" + b"\xff" * 1024)
+            with patch(
+                "draytekwebadmin.firmware.parse_firmware_header",
+                wraps=parse_firmware_header,
+            ) as mock_parse:
+                first = Firmware.from_header(str(path))
+                second = Firmware.from_header(str(path))
+            self.assertEqual("Vigor2860Ac", first.model)
+            self.assertEqual("3.9.2", second.firmware_target)
+            self.assertEqual(path, second.filepath)
+            # Header parsed once per file content
+            self.assertEqual(1, mock_parse.call_count)
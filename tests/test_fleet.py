@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+
+from draytekwebadmin.fleet import FleetExecutor
+
+
+class TestFleetExecutor(unittest.TestCase):
+    def test_default(self):
+        self.assertEqual(4, FleetExecutor().concurrency)
+        self.assertEqual(8, FleetExecutor(concurrency="8").concurrency)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            FleetExecutor(concurrency=0)
+
+    def test_empty(self):
+        self.assertEqual([], FleetExecutor().run([], lambda router: router))
+
+    def test_results_in_input_order(self):
+        def task(router, offset=0):
+            # Earlier routers take longer, so complete out of order
+            time.sleep(0.01 * (5 - router))
+            return router + offset
+
+        results = FleetExecutor(concurrency=5).run(range(5), task, offset=10)
+        self.assertEqual([10, 11, 12, 13, 14], results)
+
+    def test_concurrency_limit(self):
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def task(router):
+            with lock:
+                active.append(router)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(router)
+            return router
+
+        FleetExecutor(concurrency=2).run(range(10), task)
+        self.assertEqual(2, max(peak))
+
+    def test_task_exception(self):
+        def task(router):
+            if router == 1:
+                raise RuntimeError("Unreachable")
+            return router
+
+        results = FleetExecutor(concurrency=2).run([0, 1, 2], task)
+        self.assertEqual(0, results[0])
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(2, results[2])
@@ -0,0 +1,222 @@
+import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from draytekwebadmin import DrayTekWebAdmin
+from draytekwebadmin.httpsession import HTMLPage, HTTPBackendError, HTTPSession
+from draytekwebadmin.pages import SNMPpage
+from draytekwebadmin.snmp import SNMPIPv4
+
+LOGIN = """
+<html><body><div id="errmsg">{error}</div>
+<form method="post" action="/cgi-bin/wlogin.cgi">
+<input type="text" name="sUserName"><input type="password" name="sSysPass">
+<input type="submit" name="btnOk" value="Login">
+</form></body></html>
+"""
+FRAMESET = """
+<frameset cols="180,*"><frame name="menu" src="/menu.htm"><frame name="main" src="/main.htm"></frameset>
+"""
+MENU = """
+<a href="javascript:void(0)">System Maintenance</a>
+<a href="/doc/snmp.htm" target="main"> SNMP </a>
+<a href="/doc/mng.htm" target="main">Management</a>
+"""
+SNMP = """
+<form method="post" action="/cgi-bin/v2x00.cgi">
+<input type="hidden" name="sFormAuthStr" value="token">
+<input type="checkbox" name="SNMPAgentEn" checked>
+<input type="text" name="SNMPGetCom" value=" public ">
+<input type="text" name="SNMPSetCom" value="private">
+<input type="text" name="SNMPMngHostIP0" value="192.168.1.10">
+<input type="text" name="SNMPMngHostIP1" value="">
+<input type="text" name="SNMPMngHostIP2" value="" disabled>
+<select name="SNMPMngHostMask0"><option value="24">255.255.255.0 / 24</option><option value="32" selected>255.255.255.255 / 32</option></select>
+<select name="SNMPMngHostMask1"><option value="24">255.255.255.0 / 24</option><option value="32">255.255.255.255 / 32</option></select>
+<select name="SNMPMngHostMask2" disabled><option value="24">255.255.255.0 / 24</option></select>
+<input type="submit" name="snmp_btnOk" value="OK">
+<input type="reset" name="snmp_btnCancel" value="Cancel">
+</form>
+"""
+REBOOT = '<form><input type="radio" name="sReboot" value="1"></form>'
+
+
+class FakeRouter:
+    """Minimal stand in for the router web server, serving pages by method and path."""
+
+    def __init__(self, error="", after_submit=""):
+        self.error = error
+        self.after_submit = after_submit
+        self.loggedin = False
+        self.posts = []
+
+    def request(self, method, url, **kwargs):
+        path = url.split(":443", 1)[1]
+        if method == "post":
+            self.posts.append((path, kwargs["data"]))
+            if path == "/cgi-bin/wlogin.cgi":
+                self.loggedin = not self.error
+                body = LOGIN.format(error=self.error) if self.error else FRAMESET
+            else:
+                body = self.after_submit
+        elif path == "/":
+            body = FRAMESET if self.loggedin else LOGIN.format(error="")
+        else:
+            body = {"/menu.htm": MENU, "/doc/snmp.htm": SNMP}[path]
+        response = MagicMock(url=url, text=body)
+        return response
+
+
+class TestHTMLPage(unittest.TestCase):
+    def test_parse(self):
+        page = HTMLPage("https://router:443/doc/snmp.htm", SNMP + MENU)
+        form = page.form()
+        self.assertTrue(form["SNMPAgentEn"]["checked"])
+        self.assertEqual(" public ", form["SNMPGetCom"]["value"])
+        self.assertFalse(form["SNMPMngHostIP2"]["enabled"])
+        self.assertEqual("255.255.255.255 / 32", form["SNMPMngHostMask0"]["option"])
+        # First option selected by default
+        self.assertEqual("255.255.255.0 / 24", form["SNMPMngHostMask1"]["option"])
+        self.assertEqual("24", form["SNMPMngHostMask1"]["value"])
+        self.assertEqual("https://router:443/doc/snmp.htm", page.link(text="SNMP"))
+        self.assertIsNone(page.link(text="System Maintenance"))
+        self.assertIsNone(page.link(text="Not a link"))
+
+    def test_frames_and_text(self):
+        page = HTMLPage(
+            "https://router:443/", FRAMESET + LOGIN.format(error="Bad login")
+        )
+        self.assertEqual("https://router:443/menu.htm", page.frames["menu"])
+        self.assertEqual("Bad login", page.texts["errmsg"])
+
+
+class TestHTTPSession(unittest.TestCase):
+    def session(self, router):
+        session = HTTPSession("https://router:443", "admin", "secret")
+        session.http.request = router.request
+        return session
+
+    def test_read(self):
+        router = FakeRouter()
+        form = self.session(router).read_form(SNMPpage.menu_item)
+        settings = SNMPpage.snmp_ipv4_settings_from_form(form)
+        self.assertEqual(
+            (
+                "/cgi-bin/wlogin.cgi",
+                [("sUserName", "admin"), ("sSysPass", "secret"), ("btnOk", "Login")],
+            ),
+            router.posts[0],
+        )
+        self.assertTrue(settings.enable_agent)
+        self.assertEqual("public", settings.get_community)
+        self.assertEqual("192.168.1.10", settings.manager_host_1)
+        self.assertEqual("255.255.255.255 / 32", settings.manager_host_subnet_1)
+        self.assertIsNone(settings.manager_host_3)
+        self.assertEqual([], form.missing)
+        SNMPpage.snmp_ipv6_settings_from_form(form)
+        self.assertIn("SNMPMngHostIP_V60", form.missing)
+
+    def test_write(self):
+        router = FakeRouter()
+        fields = SNMPpage.snmp_ipv4_settings_fields(
+            SNMPIPv4(
+                enable_agent=False,
+                get_community="secret",
+                manager_host_2="10.0.0.1",
+                manager_host_subnet_2="255.255.255.255 / 32",
+            )
+        )
+        self.assertFalse(
+            self.session(router).write(SNMPpage.menu_item, fields, SNMPpage.ok_button)
+        )
+        path, data = router.posts[-1]
+        self.assertEqual("/cgi-bin/v2x00.cgi", path)
+        self.assertEqual(
+            [
+                ("sFormAuthStr", "token"),
+                ("SNMPGetCom", "secret"),
+                ("SNMPSetCom", "private"),
+                ("SNMPMngHostIP0", "192.168.1.10"),
+                ("SNMPMngHostIP1", "10.0.0.1"),
+                ("SNMPMngHostMask0", "32"),
+                ("SNMPMngHostMask1", "32"),
+                ("snmp_btnOk", "OK"),
+            ],
+            data,
+        )
+
+    def test_write_unchanged(self):
+        router = FakeRouter()
+        fields = SNMPpage.snmp_ipv4_settings_fields(
+            SNMPIPv4(enable_agent=True, get_community="public", manager_host_3=None)
+        )
+        self.assertFalse(
+            self.session(router).write(SNMPpage.menu_item, fields, SNMPpage.ok_button)
+        )
+        self.assertEqual(1, len(router.posts))  # Only the login
+
+    def test_write_reboot(self):
+        router = FakeRouter(after_submit=REBOOT)
+        fields = SNMPpage.snmp_ipv4_settings_fields(SNMPIPv4(get_community="secret"))
+        self.assertTrue(
+            self.session(router).write(SNMPpage.menu_item, fields, SNMPpage.ok_button)
+        )
+
+    def test_write_disabled(self):
+        router = FakeRouter()
+        fields = SNMPpage.snmp_ipv4_settings_fields(SNMPIPv4(manager_host_3="10.0.0.1"))
+        with self.assertRaises(HTTPBackendError):
+            self.session(router).write(SNMPpage.menu_item, fields, SNMPpage.ok_button)
+        self.assertEqual(1, len(router.posts))  # Only the login
+
+    def test_login_error(self):
+        router = FakeRouter(error="Invalid username or password")
+        with self.assertRaises(RuntimeError) as cm:
+            self.session(router).login()
+        self.assertNotIsInstance(cm.exception, HTTPBackendError)
+        self.assertEqual("Invalid username or password", str(cm.exception))
+
+    def test_menu_item_not_found(self):
+        with self.assertRaises(HTTPBackendError):
+            self.session(FakeRouter()).open_page("Firmware Upgrade")
+
+
+class TestHTTPBackend(unittest.TestCase):
+    def test_backend_validation(self):
+        self.assertEqual("selenium", DrayTekWebAdmin().backend)
+        self.assertEqual("http", DrayTekWebAdmin(backend="http").backend)
+        with self.assertRaises(ValueError):
+            DrayTekWebAdmin(backend="telnet")
+
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_read_settings_http(self, mock_start_session):
+        connection = DrayTekWebAdmin(
+            hostname="router", password="secret", backend="http"
+        )
+        connection._http_session = HTTPSession(connection.url, "admin", "secret")
+        connection._http_session.http.request = FakeRouter().request
+        settings = connection.read_settings(SNMPIPv4)
+        self.assertEqual("public", settings.get_community)
+        self.assertFalse(mock_start_session.called)
+
+    @patch.object(DrayTekWebAdmin, "start_session", autospec=True)
+    def test_write_settings_fallback(self, mock_start_session):
+        connection = DrayTekWebAdmin(
+            hostname="router", password="secret", backend="http"
+        )
+        connection._http_session = HTTPSession(connection.url, "admin", "secret")
+        connection._http_session.http.request = FakeRouter().request
+        connection._session = MagicMock()
+        with patch.object(
+            SNMPpage, "fill_snmp_ipv4_settings", autospec=True
+        ) as mock_fill, patch.object(
+            SNMPpage, "changed", new_callable=PropertyMock, return_value=True
+        ), patch.object(
+            SNMPpage, "submit", autospec=True, return_value=True
+        ):
+            # Disabled field, so the browser is used instead
+            self.assertTrue(
+                connection.write_settings_batch([SNMPIPv4(manager_host_3="10.0.0.1")])
+            )
+        self.assertTrue(mock_start_session.called)
+        self.assertTrue(mock_fill.called)
+        self.assertTrue(connection.reboot_required)
@@ -0,0 +1,57 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from draytekwebadmin.journal import JobJournal
+
+ROUTERS = ["192.168.1.1:443", "192.168.2.1:443", "192.168.3.1:8443"]
+
+
+class TestJobJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name, "journal.sqlite")
+        self.journal = JobJournal(self.path, job="job1")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.journal.record(ROUTERS[0], "unknown")
+
+    def test_start(self):
+        self.assertEqual(ROUTERS, self.journal.start(ROUTERS))
+        self.assertEqual("pending", self.journal.state(ROUTERS[0]).state)
+        self.assertIsNone(self.journal.state("192.168.4.1:443"))
+        # Starting again doesn't record the routers as pending again
+        self.journal.start(ROUTERS)
+        self.assertEqual(1, len(self.journal.history(ROUTERS[0])))
+
+    def test_resume(self):
+        self.journal.start(ROUTERS)
+        for state in ["connected", "read", "written", "rebooted"]:
+            self.journal.record(ROUTERS[0], state)
+        self.journal.record(ROUTERS[0], "done", "Updated & router restarted")
+        self.journal.record(ROUTERS[1], "connected")
+        self.journal.record(ROUTERS[1], "failed", "Login failed")
+
+        # Reopened after the run was interrupted
+        journal = JobJournal(self.path, job="job1")
+        self.assertEqual(ROUTERS[1:], journal.start(ROUTERS))
+        self.assertEqual(
+            ["pending", "connected", "read", "written", "rebooted", "done"],
+            [entry.state for entry in journal.history(ROUTERS[0])],
+        )
+        done = journal.done()
+        self.assertEqual([ROUTERS[0]], list(done))
+        self.assertEqual("Updated & router restarted", done[ROUTERS[0]].status)
+        failed = journal.state(ROUTERS[1])
+        self.assertEqual(("failed", "Login failed"), (failed.state, failed.status))
+
+    def test_jobs(self):
+        self.journal.start(ROUTERS)
+        self.journal.record(ROUTERS[0], "done")
+        other = JobJournal(self.path, job="job2")
+        self.assertEqual(ROUTERS, other.start(ROUTERS))
+        self.assertEqual({}, other.done())
@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from toolium.pageelements import Link
+
+from draytekwebadmin.pages import ManagementPage
+from draytekwebadmin.pages.menu_navigator import MenuNavigator
+
+
+class TestMenuNavigator(unittest.TestCase):
+    def setUp(self):
+        self.driver_wrapper = MagicMock()
+        self.driver_wrapper.config.getfloat.return_value = 0
+        self.navigator = MenuNavigator(driver_wrapper=self.driver_wrapper)
+
+    @patch.object(MenuNavigator, "is_displayed", return_value=True)
+    @patch.object(Link, "click", autospec=True)
+    def test_page_reused(self, mock_click, mock_visible):
+        self.assertTrue(self.navigator.open_sysmain_snmp())
+        self.assertEqual(1, mock_click.call_count)
+        # A new page object on the same browser shares the navigation state
+        navigator = MenuNavigator(driver_wrapper=self.driver_wrapper)
+        self.assertFalse(navigator.open_sysmain_snmp())
+        self.assertEqual(1, mock_click.call_count)
+        # Main frame to mark the page, menu frame, then main frame again for the new page
+        self.assertEqual(3, self.driver_wrapper.driver.switch_to.frame.call_count)
+
+    @patch.object(
+        MenuNavigator, "wait_until_displayed", side_effect=lambda elements: elements[0]
+    )
+    @patch.object(MenuNavigator, "is_displayed", return_value=True)
+    @patch.object(Link, "click", autospec=True)
+    def test_tab_change(self, mock_click, mock_visible, mock_wait):
+        self.navigator.open_sysmain_management(ManagementPage.ipv4_management_setup_tab)
+        self.assertEqual(2, mock_click.call_count)
+        self.navigator.navigation.form = {"sRMC": {}}
+        self.assertFalse(
+            self.navigator.open_sysmain_management(
+                ManagementPage.ipv4_management_setup_tab
+            )
+        )
+        self.assertEqual(2, mock_click.call_count)
+        self.assertIsNotNone(self.navigator.navigation.form)
+        # Only the tab is clicked, and the form read again
+        self.assertFalse(
+            self.navigator.open_sysmain_management(
+                ManagementPage.ipv6_management_setup_tab
+            )
+        )
+        self.assertEqual(3, mock_click.call_count)
+        self.assertEqual(
+            ManagementPage.ipv6_management_setup_tab.locator,
+            mock_click.call_args[0][0].locator,
+        )
+        self.assertIsNone(self.navigator.navigation.form)
+
+    @patch.object(MenuNavigator, "is_displayed", return_value=True)
+    @patch.object(Link, "click", autospec=True)
+    def test_invalidate(self, mock_click, mock_visible):
+        self.navigator.open_sysmain_snmp()
+        self.navigator.navigation.invalidate()
+        self.assertTrue(self.navigator.open_sysmain_snmp())
+        self.assertEqual(2, mock_click.call_count)
+        self.assertTrue(self.navigator.open_sysmain_reboot_system())
+        self.assertEqual(3, mock_click.call_count)
@@ -0,0 +1,90 @@
+import socket
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import requests
+
+from draytekwebadmin.reachability import (
+    Preflight,
+    backoff,
+    http_ok,
+    poll,
+    preflight,
+    preflight_fleet,
+    tcp_reachable,
+)
+
+
+class TestReachability(unittest.TestCase):
+    def test_backoff(self):
+        delays = backoff(initial=1, maximum=5)
+        self.assertEqual([1, 2, 4, 5, 5], [next(delays) for _ in range(5)])
+
+    @patch("draytekwebadmin.reachability.sleep")
+    @patch("draytekwebadmin.reachability.monotonic")
+    def test_poll(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 0
+        results = iter([False, False, True])
+        self.assertTrue(poll(lambda: next(results), deadline=100, initial=2))
+        self.assertEqual([2, 4], [args[0] for args, _ in mock_sleep.call_args_list])
+
+        # Final sleep cut short at the deadline, then gives up after one last check
+        mock_sleep.reset_mock()
+        mock_monotonic.side_effect = [0, 8, 10]
+        self.assertFalse(poll(lambda: False, deadline=10, initial=2, maximum=30))
+        self.assertEqual([2, 2], [args[0] for args, _ in mock_sleep.call_args_list])
+
+    def test_tcp_reachable(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            port = server.getsockname()[1]
+            self.assertTrue(tcp_reachable("127.0.0.1", port))
+        self.assertFalse(tcp_reachable("127.0.0.1", port, timeout=1))
+
+    def test_preflight(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            port = server.getsockname()[1]
+            result = preflight("127.0.0.1", port, use_https=False)
+            self.assertTrue(result.reachable)
+            self.assertGreaterEqual(result.latency, 0)
+            self.assertIsNone(result.error)
+            # Nothing answers the TLS handshake
+            result = preflight("127.0.0.1", port, use_https=True, timeout=0.1)
+            self.assertFalse(result.reachable)
+            self.assertIsNone(result.latency)
+            self.assertTrue(result.error)
+        result = preflight("127.0.0.1", port, use_https=False, timeout=1)
+        self.assertEqual(("127.0.0.1", port, False), result[:3])
+
+    @patch("draytekwebadmin.reachability.preflight")
+    def test_preflight_fleet(self, mock_preflight):
+        mock_preflight.side_effect = lambda hostname, port, use_https, timeout: (
+            Preflight(hostname, port, hostname == "router1", 0.01, None)
+        )
+        routers = [
+            SimpleNamespace(hostname="router1", port=443, use_https=True),
+            SimpleNamespace(hostname="router2", port=8443, use_https=True),
+            SimpleNamespace(hostname=None, port=443, use_https=True),
+        ]
+        results = preflight_fleet(routers, timeout=1)
+        self.assertEqual(["router1", "router2"], [r.hostname for r in results[:2]])
+        self.assertEqual([True, False], [r.reachable for r in results[:2]])
+        self.assertEqual(8443, results[1].port)
+
+        mock_preflight.side_effect = TypeError("no hostname")
+        results = preflight_fleet(routers[2:])
+        self.assertFalse(results[0].reachable)
+        self.assertEqual("no hostname", results[0].error)
+
+    @patch("draytekwebadmin.reachability.requests.get")
+    def test_http_ok(self, mock_get):
+        mock_get.return_value.status_code = 200
+        self.assertTrue(http_ok("https://router:443"))
+        mock_get.return_value.status_code = 503
+        self.assertFalse(http_ok("https://router:443"))
+        mock_get.side_effect = requests.ConnectionError
+        self.assertFalse(http_ok("https://router:443"))
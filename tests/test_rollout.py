@@ -0,0 +1,73 @@
+import unittest
+
+from draytekwebadmin.rollout import RolloutScheduler
+
+
+class TestRolloutScheduler(unittest.TestCase):
+    def test_default(self):
+        scheduler = RolloutScheduler()
+        self.assertEqual(1, scheduler.canary)
+        self.assertEqual([10, 50, 100], scheduler.waves)
+        self.assertEqual(0, scheduler.failure_budget)
+        self.assertEqual(4, scheduler.concurrency)
+
+    def test_validation(self):
+        for settings in [
+            {"canary": -1},
+            {"waves": [0, 100]},
+            {"waves": [50, 10]},
+            {"failure_budget": 1.5},
+            {"concurrency": 0},
+        ]:
+            with self.assertRaises(ValueError):
+                RolloutScheduler(**settings)
+
+    def test_plan(self):
+        scheduler = RolloutScheduler(canary=2, waves=[10, 50])
+        waves = scheduler.plan(range(20))
+        # Canary, 10% already covered by the canary, up to 50%, then the rest
+        self.assertEqual([2, 8, 10], [len(wave) for wave in waves])
+        self.assertEqual(list(range(20)), [router for wave in waves for router in wave])
+        self.assertEqual([[0]], RolloutScheduler(waves=[100]).plan([0]))
+        self.assertEqual([], RolloutScheduler().plan([]))
+
+    def test_run(self):
+        result = RolloutScheduler(concurrency=2).run(
+            range(10), lambda router: router * 2
+        )
+        self.assertEqual([router * 2 for router in range(10)], result.results)
+        self.assertEqual(3, result.waves)
+        self.assertFalse(result.halted)
+        self.assertEqual(0, result.failures)
+
+    def test_halt(self):
+        def task(router):
+            if router in [3, 4]:
+                raise RuntimeError("Upgrade failed")
+            return True
+
+        # 1 failure in 5 is within the budget, 2 in 10 is not
+        scheduler = RolloutScheduler(canary=1, waves=[50, 100], failure_budget=0.15)
+        result = scheduler.run(range(20), task)
+        self.assertTrue(result.halted)
+        self.assertEqual(2, result.waves)
+        self.assertEqual(2, result.failures)
+        self.assertEqual([None] * 10, result.results[10:])
+        self.assertIsInstance(result.results[3], RuntimeError)
+
+    def test_canary_failure(self):
+        calls = []
+
+        def task(router):
+            calls.append(router)
+            return False
+
+        result = RolloutScheduler().run(range(10), task)
+        self.assertTrue(result.halted)
+        self.assertEqual([0], calls)
+
+    def test_custom_failure(self):
+        scheduler = RolloutScheduler(failed=lambda result: result.startswith("ERROR"))
+        result = scheduler.run(["ok", "ERROR"], lambda router: router)
+        self.assertTrue(result.halted)
+        self.assertEqual(1, result.failures)
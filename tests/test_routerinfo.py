@@ -1,5 +1,7 @@
 import unittest
+from unittest.mock import MagicMock
 
+from draytekwebadmin.pages.dashboard_page import DashboardPage
 from draytekwebadmin.routerinfo import RouterInfo
 
 
@@ -10,9 +12,80 @@ class TestRouterInfo(unittest.TestCase):
         self.assertIsNone(empty.router_name)
         self.assertIsNone(empty.firmware)
         self.assertIsNone(empty.dsl_version)
+        self.assertIsNone(empty.uptime)
+        self.assertIsNone(empty.serial)
+        self.assertIsNone(empty.lan_mac)
+        self.assertIsNone(empty.lan_ip)
+        self.assertIsNone(empty.wan_ip)
 
     def test_valid(self):
         self.assertEqual("DrayTek V1234", RouterInfo(model="DrayTek V1234").model)
         self.assertEqual("My Router", RouterInfo(router_name="My Router").router_name)
         self.assertEqual("1.2.3.4ABC", RouterInfo(firmware="1.2.3.4ABC").firmware)
         self.assertEqual("ABC1234", RouterInfo(dsl_version="ABC1234").dsl_version)
+        self.assertEqual("1d 02:03:04", RouterInfo(uptime="1d 02:03:04").uptime)
+        self.assertEqual("2011A1B2C3", RouterInfo(serial="2011A1B2C3").serial)
+        self.assertEqual(
+            "00-1D-AA-01-02-03", RouterInfo(lan_mac="00-1D-AA-01-02-03").lan_mac
+        )
+        self.assertEqual("192.168.1.1", RouterInfo(lan_ip="192.168.1.1").lan_ip)
+        self.assertEqual("203.0.113.1", RouterInfo(wan_ip="203.0.113.1").wan_ip)
+
+
+class TestDashboardRouterInfo(unittest.TestCase):
+    header = {"sSysName": "header name", "sSysVer": "4.0.1", "sFwNameLeading": None}
+    dashboard = {
+        "cells": {
+            "model_name": "Vigor2862",
+            "router_name": "router1",
+            "fw_version": None,
+            "dsl_version": "",
+        },
+        "rows": [
+            ["Model Name", "Vigor2862"],
+            ["System Up Time:", "1d 02:03:04"],
+            ["LAN MAC Address", "00-1D-AA-01-02-03"],
+            ["WAN IP Address", "203.0.113.1"],
+            ["WAN IP Address", "203.0.113.2"],
+            [None, None],
+        ],
+    }
+
+    def test_routerinfo_from_dashboard(self):
+        info = DashboardPage.routerinfo_from_dashboard(self.header, self.dashboard)
+        # Table cells replace header variables, where displayed
+        self.assertEqual("Vigor2862", info.model)
+        self.assertEqual("router1", info.router_name)
+        self.assertEqual("4.0.1", info.firmware)
+        self.assertIsNone(info.dsl_version)
+        self.assertEqual("1d 02:03:04", info.uptime)
+        self.assertEqual("00-1D-AA-01-02-03", info.lan_mac)
+        self.assertEqual("203.0.113.1", info.wan_ip)
+        self.assertIsNone(info.serial)
+        self.assertIsNone(info.lan_ip)
+
+    def test_routerinfo_one_script_per_frame(self):
+        driver_wrapper = MagicMock()
+        driver_wrapper.driver.execute_script.side_effect = [
+            self.header,
+            True,  # Main frame loaded
+            self.dashboard,
+        ]
+        page = DashboardPage(driver_wrapper=driver_wrapper)
+        page.wait_timeout = 1
+        info = page.routerinfo()
+        self.assertEqual("router1", info.router_name)
+        self.assertEqual(3, driver_wrapper.driver.execute_script.call_count)
+
+    def test_routerinfo_header_error(self):
+        driver_wrapper = MagicMock()
+        driver_wrapper.driver.execute_script.side_effect = [
+            Exception("header not found"),
+            True,
+            {"cells": {"fw_version": "4.0.2"}, "rows": []},
+        ]
+        page = DashboardPage(driver_wrapper=driver_wrapper)
+        page.wait_timeout = 1
+        info = page.routerinfo()
+        self.assertEqual("4.0.2", info.firmware)
+        self.assertIsNone(info.router_name)
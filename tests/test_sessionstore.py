@@ -0,0 +1,67 @@
+import os
+import stat
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from draytekwebadmin.routerinfo import RouterInfo
+from draytekwebadmin.sessionstore import SessionStore
+
+URL = "https://router:443"
+COOKIES = [{"name": "SESSION_ID_VIGOR", "value": "1234", "path": "/"}]
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.store = SessionStore(
+            Path(self.directory.name, "sessions.sqlite"), lifetime=3600, auto_logout=300
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            SessionStore(Path(self.directory.name, "sessions.sqlite"), lifetime=-1)
+
+    @unittest.skipIf(os.name != "posix", "File permissions")
+    def test_file_mode(self):
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.store.path).st_mode))
+
+    def test_put_get(self):
+        self.assertIsNone(self.store.get(URL, "admin"))
+        self.store.put(URL, "admin", COOKIES, RouterInfo(model="Vigor2862"))
+        stored = self.store.get(URL, "admin")
+        self.assertEqual(COOKIES, stored.cookies)
+        self.assertIsInstance(stored.routerinfo, RouterInfo)
+        self.assertEqual("Vigor2862", stored.routerinfo.model)
+        self.assertIsNone(self.store.get(URL, "other"))
+        self.assertIsNone(self.store.get("https://router:8443", "admin"))
+
+    def test_expiry(self):
+        # Auto-logout not known, so assumed to be enabled
+        with patch("draytekwebadmin.sessionstore.time", return_value=1000):
+            self.store.put(URL, "admin", COOKIES, RouterInfo())
+        with patch("draytekwebadmin.sessionstore.time", return_value=1300):
+            self.assertIsNotNone(self.store.get(URL, "admin"))
+        with patch("draytekwebadmin.sessionstore.time", return_value=1301):
+            self.assertIsNone(self.store.get(URL, "admin"))
+
+        # Auto-logout disabled on the router
+        with patch("draytekwebadmin.sessionstore.time", return_value=1000):
+            self.store.put(URL, "admin", COOKIES, RouterInfo(), auto_logout=False)
+        with patch("draytekwebadmin.sessionstore.time", return_value=4600):
+            self.assertIsNotNone(self.store.get(URL, "admin"))
+        with patch("draytekwebadmin.sessionstore.time", return_value=4601):
+            self.assertIsNone(self.store.get(URL, "admin"))
+
+    def test_invalidate(self):
+        for username in ["admin", "other"]:
+            self.store.put(URL, username, COOKIES, RouterInfo())
+        self.store.invalidate(URL, "admin")
+        self.assertIsNone(self.store.get(URL, "admin"))
+        self.assertIsNotNone(self.store.get(URL, "other"))
+        self.store.invalidate(URL)
+        self.assertIsNone(self.store.get(URL, "other"))
@@ -0,0 +1,115 @@
+import unittest
+from time import monotonic
+
+import requests
+
+from draytekwebadmin import DrayTekWebAdmin
+from draytekwebadmin.httpsession import HTMLPage, HTTPBackendError, HTTPSession
+from draytekwebadmin.management import ManagementPort
+from draytekwebadmin.pages import ManagementPage, SNMPpage
+from draytekwebadmin.simulator import LOGIN_ERROR, RouterSimulator
+from draytekwebadmin.snmp import SNMPIPv4
+
+
+class TestRouterSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = RouterSimulator(reboot_seconds=0, seed=1)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+
+    def session(self, password="admin"):
+        session = HTTPSession(self.simulator.url, "admin", password)
+        self.addCleanup(session.close)
+        return session
+
+    def test_read(self):
+        form = self.session().read_form(SNMPpage.menu_item)
+        settings = SNMPpage.snmp_ipv4_settings_from_form(form)
+        self.assertEqual("public", settings.get_community)
+        self.assertEqual("255.255.255.255 / 32", settings.manager_host_subnet_1)
+        self.assertFalse(settings.enable_agent)
+        self.assertEqual([], form.missing)
+
+    def test_write(self):
+        session = self.session()
+        fields = SNMPpage.snmp_ipv4_settings_fields(
+            SNMPIPv4(
+                enable_agent=True,
+                get_community="secret",
+                manager_host_2="10.0.0.1",
+                manager_host_subnet_2="255.255.255.0 / 24",
+            )
+        )
+        self.assertFalse(session.write(SNMPpage.menu_item, fields, SNMPpage.ok_button))
+        self.assertEqual("secret", self.simulator.settings["SNMPGetCom"])
+        self.assertTrue(self.simulator.settings["SNMPAgentEn"])
+        settings = SNMPpage.snmp_ipv4_settings_from_form(
+            session.read_form(SNMPpage.menu_item)
+        )
+        self.assertEqual("10.0.0.1", settings.manager_host_2)
+        self.assertEqual("255.255.255.0 / 24", settings.manager_host_subnet_2)
+
+    def test_write_reboot(self):
+        fields = ManagementPage.management_port_settings_fields(
+            ManagementPort(telnet_port=2323)
+        )
+        self.assertTrue(
+            self.session().write(
+                ManagementPage.menu_item, fields, ManagementPage.ok_button
+            )
+        )
+        self.assertEqual("2323", self.simulator.settings["TelnetPort"])
+
+    def test_disabled(self):
+        self.simulator.disabled = {"SNMPMngHostIP2"}
+        fields = SNMPpage.snmp_ipv4_settings_fields(SNMPIPv4(manager_host_3="10.0.0.1"))
+        with self.assertRaises(HTTPBackendError):
+            self.session().write(SNMPpage.menu_item, fields, SNMPpage.ok_button)
+
+    def test_login_error(self):
+        with self.assertRaises(RuntimeError) as cm:
+            self.session(password="wrong").login()
+        self.assertEqual(LOGIN_ERROR, str(cm.exception))
+
+    def test_dashboard(self):
+        session = self.session()
+        session.login()
+        page = session._request("get", f"{self.simulator.url}/doc/dashboard.htm")
+        self.assertIn("Vigor2862", page.texts.get("blksysinfo"))
+
+    def test_reboot(self):
+        session = self.session()
+        session.login()
+        self.simulator.upgrade_firmware(b"Vigor2862\x00v4.4.2\x00")
+        self.simulator.reboot()
+        self.assertTrue(self.simulator.wait_until_serving(timeout=5))
+        self.assertEqual("4.4.2", self.simulator.firmware)
+        self.assertEqual(1, self.simulator.reboots)
+        # Logged out by the reboot
+        response = requests.get(self.simulator.url, cookies=session.http.cookies)
+        self.assertIn("sSysPass", HTMLPage(response.url, response.text).form())
+
+    def test_failure_injection(self):
+        self.simulator.failure_rate = 1
+        with self.assertRaises(HTTPBackendError):
+            self.session().login()
+        with self.assertRaises(ValueError):
+            self.simulator.failure_rate = 2
+
+    def test_latency(self):
+        self.simulator.latency = 0.05
+        started = monotonic()
+        self.session().login()
+        self.assertGreaterEqual(monotonic() - started, 0.1)  # Login page then post
+        self.assertEqual(2, sum(self.simulator.requests.values()))
+
+    def test_http_backend(self):
+        connection = DrayTekWebAdmin(
+            hostname="127.0.0.1",
+            port=self.simulator.port,
+            password="admin",
+            use_https=False,
+            backend="http",
+        )
+        self.addCleanup(connection.close_session)
+        self.assertEqual("public", connection.read_settings(SNMPIPv4).get_community)
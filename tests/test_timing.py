@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from draytekwebadmin import DrayTekWebAdmin, SNMPIPv4, SNMPv3, TimingRecorder
+from draytekwebadmin.simulator import RouterSimulator
+
+
+class TestTimingRecorder(unittest.TestCase):
+    def setUp(self):
+        self.recorder = TimingRecorder()
+        with self.recorder.time("router1", "login"):
+            pass
+        with self.recorder.time("router1", "read", "Management"):
+            with self.recorder.time("router1", "navigation", "Management"):
+                pass
+        with self.assertRaises(RuntimeError):
+            with self.recorder.time("router2", "write", "SNMPIPv4"):
+                raise RuntimeError("Failed")
+        self.recorder.record("router2", "upgrade_transfer", 2.0, nested=True)
+        self.recorder.annotate("router1", model="Vigor2862", firmware="3.9.6.2")
+
+    def test_events(self):
+        events = self.recorder.events()
+        self.assertEqual(
+            ["login", "navigation", "read", "write", "upgrade_transfer"],
+            [event.phase for event in events],
+        )
+        self.assertEqual(
+            [False, True, False, False, True], [event.nested for event in events]
+        )
+        self.assertEqual(
+            [True, True, True, False, True], [event.ok for event in events]
+        )
+        self.assertEqual(2.0, events[-1].seconds)
+
+    def test_report(self):
+        report = self.recorder.report()
+        router1, router2 = report["routers"]
+        self.assertEqual("Vigor2862", router1["model"])
+        self.assertIsNone(router1["router_name"])
+        self.assertEqual(0, router1["failures"])
+        self.assertEqual(
+            router1["phases"]["login"] + router1["phases"]["read"], router1["seconds"]
+        )
+        self.assertEqual(1, router2["failures"])
+        self.assertLess(router2["seconds"], 2.0)  # Nested upload not added
+        self.assertEqual(
+            ["login", "navigation", "read", "write", "upgrade_transfer"],
+            list(report["phases"]),
+        )
+        self.assertEqual(2.0, report["phases"]["upgrade_transfer"]["max"])
+        self.assertAlmostEqual(
+            router1["seconds"] + router2["seconds"], report["seconds"]
+        )
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file = os.path.join(directory, "timing.csv")
+            self.recorder.write(csv_file)
+            with open(csv_file, newline="") as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual(
+                ["router1", "router2", "TOTAL"], [row["hostname"] for row in rows]
+            )
+            self.assertEqual("2.000", rows[1]["upgrade_transfer"])
+            self.assertEqual("1", rows[2]["failures"])
+
+            json_file = os.path.join(directory, "timing.json")
+            self.recorder.write(json_file)
+            with open(json_file) as file:
+                report = json.load(file)
+            self.assertEqual(2, len(report["routers"]))
+            self.assertEqual(5, len(report["events"]))
+
+
+class TestDrayTekWebAdminTiming(unittest.TestCase):
+    def test_http_backend(self):
+        simulator = RouterSimulator(reboot_seconds=0, seed=1)
+        simulator.start()
+        self.addCleanup(simulator.stop)
+        recorder = TimingRecorder()
+        connection = DrayTekWebAdmin(
+            hostname="127.0.0.1",
+            port=simulator.port,
+            password="admin",
+            use_https=False,
+            backend="http",
+            timing=recorder,
+        )
+        self.addCleanup(connection.close_session)
+        connection.read_all_settings([SNMPIPv4, SNMPv3])
+        connection.write_settings(SNMPIPv4(get_community="private"))
+        events = recorder.events()
+        self.assertEqual(
+            [("read", "SNMPIPv4,SNMPv3"), ("write", "SNMPIPv4")],
+            [(event.phase, event.detail) for event in events],
+        )
+        self.assertTrue(all(event.hostname == "127.0.0.1" for event in events))
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from draytekwebadmin import DrayTekWebAdmin
+from draytekwebadmin.pages import BasePageObject
+from draytekwebadmin.reachability import Preflight
+from draytekwebadmin.tracing import UNATTRIBUTED, CommandTrace, WebDriverTracer
+
+
+class FakeDriver:
+    title = "Vigor"
+
+    def __init__(self):
+        self.sent = []
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    def execute(self, driver_command, params=None):
+        self.sent.append(driver_command)
+        return {"value": None}
+
+
+class FakePage(BasePageObject):
+    @classmethod
+    def read_settings(cls, driver):
+        cls.find(driver)
+        driver.execute("executeScript")
+
+    @classmethod
+    def find(cls, driver):
+        driver.execute("findElement")
+
+
+class TestWebDriverTracer(unittest.TestCase):
+    def test_attribution(self):
+        driver = FakeDriver()
+        tracer = WebDriverTracer()
+        tracer.attach(driver)
+        tracer.attach(driver)  # No effect
+        FakePage.read_settings(driver)
+        FakePage.read_settings(driver)
+        driver.execute("getTitle")
+        self.assertEqual(
+            ["findElement", "executeScript", "findElement"], driver.sent[:3]
+        )
+        self.assertEqual(5, tracer.count)
+        commands = {
+            (trace.operation, trace.command): trace.count for trace in tracer.commands()
+        }
+        self.assertEqual(
+            {
+                ("FakePage.read_settings", "findElement"): 2,
+                ("FakePage.read_settings", "executeScript"): 2,
+                (UNATTRIBUTED, "getTitle"): 1,
+            },
+            commands,
+        )
+        operations = {trace.operation: trace for trace in tracer.operations()}
+        self.assertEqual(4, operations["FakePage.read_settings"].count)
+        self.assertIsNone(operations["FakePage.read_settings"].command)
+
+    def test_detach_reset(self):
+        driver = FakeDriver()
+        tracer = WebDriverTracer()
+        tracer.attach(driver)
+        driver.execute("getTitle")
+        tracer.detach(driver)
+        driver.execute("getTitle")
+        self.assertEqual(
+            [CommandTrace(UNATTRIBUTED, "getTitle", 1, tracer.commands()[0].seconds)],
+            tracer.commands(),
+        )
+        tracer.reset()
+        self.assertEqual(0, tracer.count)
+
+    @patch("draytekwebadmin.draytek.TooliumSession")
+    @patch("draytekwebadmin.draytek.preflight")
+    def test_session(self, mock_preflight, mock_session):
+        mock_preflight.return_value = Preflight("myhost", 443, True, 0.01, None)
+        driver = FakeDriver()
+        mock_session.return_value = MagicMock(driver=driver)
+        tracer = WebDriverTracer()
+        connection = DrayTekWebAdmin(hostname="myhost", tracer=tracer)
+        connection.session
+        self.assertEqual(
+            [("DrayTekWebAdmin.session", "get")],
+            [(trace.operation, trace.command) for trace in tracer.commands()],
+        )
+        connection.close_session()
+        self.assertNotIn("execute", vars(driver))
@@ -0,0 +1,106 @@
+import importlib.util
+from copy import copy
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from draytekwebadmin import DrayTekWebAdmin, SNMPIPv4, SNMPv3
+from draytekwebadmin.journal import JobJournal
+
+EXAMPLE = Path(__file__).parent.parent / "examples" / "write_settings.py"
+ROUTER = {
+    "DrayTekWebAdmin|hostname": "192.168.1.1",
+    "DrayTekWebAdmin|port": "443",
+    "SNMPIPv4|get_community": "private",
+}
+
+
+def load_example():
+    spec = importlib.util.spec_from_file_location("write_settings", EXAMPLE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestConfigureRouter(unittest.TestCase):
+    def setUp(self):
+        self.write_settings = load_example()
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.journal = JobJournal(
+            Path(self.directory.name, "journal.sqlite"), job="job1"
+        )
+        self.test_settings = self.write_settings.TestSettings(journal=self.journal)
+        # Settings held by the router
+        self.router = {SNMPIPv4: SNMPIPv4(get_community="public")}
+        self.applied = False
+        for name, method in [
+            ("start_session", lambda session: None),
+            ("close_session", lambda session, failed=False: None),
+            ("read_all_settings", self.read_all_settings),
+            ("write_settings_batch", self.write_settings_batch),
+        ]:
+            patcher = patch.object(DrayTekWebAdmin, name, autospec=True)
+            patcher.start().side_effect = method
+            self.addCleanup(patcher.stop)
+
+    def read_all_settings(self, session, settings=None):
+        return {
+            setting: copy(self.router.get(setting, setting())) for setting in settings
+        }
+
+    def write_settings_batch(self, session, settings):
+        # Fields disabled on the page aren't written until the router applies them
+        if self.applied:
+            for setting in settings:
+                self.router[type(setting)] = setting
+        return False
+
+    def test_resume_after_unapplied_write(self):
+        key = "192.168.1.1:443"
+        self.journal.start([key])
+        session, status, failed = self.write_settings.configure_router(
+            dict(ROUTER), False, self.test_settings
+        )
+        self.assertFalse(failed)
+        self.assertEqual(
+            "ERROR: Settings not applied: "
+            "SNMPIPv4 get_community: CURRENT = public | NEW = private",
+            status,
+        )
+        self.assertEqual("failed", self.journal.state(key).state)
+        # The router is configured again when the job is resumed
+        self.assertEqual([key], self.journal.start([key]))
+
+        self.applied = True
+        session, status, failed = self.write_settings.configure_router(
+            dict(ROUTER), False, self.test_settings
+        )
+        self.assertEqual("Updated", status)
+        self.assertEqual(
+            ["written", "verified", "done"],
+            [entry.state for entry in self.journal.history(key)][-3:],
+        )
+        self.assertEqual([], self.journal.start([key]))
+
+    def test_masked_password(self):
+        # Passwords read back masked, so only the other fields are compared
+        self.router[SNMPv3] = SNMPv3(usm_user="admin", auth_password=None)
+        session = DrayTekWebAdmin(hostname="192.168.1.1")
+        self.assertEqual(
+            [],
+            self.write_settings.unapplied_settings(
+                session, [SNMPv3(usm_user="admin", auth_password="secret")]
+            ),
+        )
+        self.assertEqual(
+            ["SNMPv3 usm_user: CURRENT = admin | NEW = other"],
+            self.write_settings.unapplied_settings(
+                session, [SNMPv3(usm_user="other", auth_password="secret")]
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()